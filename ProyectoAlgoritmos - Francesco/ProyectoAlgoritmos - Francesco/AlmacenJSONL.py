@@ -0,0 +1,224 @@
+from ArchivoJSONL import ArchivoJSONL
+
+
+class AlmacenJSONL:
+    """
+    Clase que guarda las entradas y las facturas en archivos JSON Lines con índices en disco, en lugar de los arreglos
+    de entradas.json y facturas.json, que había que leer enteros antes de mostrar el menú.
+
+    Al abrirlos no se lee ningún registro: cada entrada o factura se lee cuando se consulta, por su id, por la cédula del
+    cliente o por el partido. Las ventas, asistencias y facturas se guardan en cuanto ocurren, con los mismos eventos
+    que el diario: una venta o factura añade una línea y una asistencia reescribe la línea de su entrada en el mismo lugar.
+
+    Atributos:
+        entradas (ArchivoJSONL): Las entradas, indexadas por id, por cédula del cliente y por partido.
+        facturas (ArchivoJSONL): Las facturas, indexadas por número de línea y por cédula del cliente.
+    """
+    # Eventos de App.persistir que se guardan en estos archivos en lugar del diario
+    EVENTOS = ("entrada", "entradas", "asistencia", "factura")
+
+    def __init__(self, ruta_entradas="entradas.jsonl", ruta_facturas="facturas.jsonl"):
+        """
+        Inicializa una instancia de la clase AlmacenJSONL sin abrir los archivos.
+
+        Args:
+            ruta_entradas (str): La ruta del archivo de entradas.
+            ruta_facturas (str): La ruta del archivo de facturas.
+        """
+        self.entradas = ArchivoJSONL(ruta_entradas, "id", ("cliente", "partido"))
+        self.facturas = ArchivoJSONL(ruta_facturas, None, ("cliente",))
+
+    def existe(self):
+        """
+        Indica si los archivos de entradas y facturas ya existen.
+
+        Returns:
+            bool: True si existen los dos archivos.
+        """
+        return self.entradas.existe() and self.facturas.existe()
+
+    def abrir(self):
+        """
+        Abre los archivos de entradas y facturas, creándolos si no existen.
+        """
+        self.entradas.abrir()
+        self.facturas.abrir()
+
+    def registrar(self, evento, datos):
+        """
+        Guarda un cambio de App.persistir en el archivo que le corresponde.
+
+        Args:
+            evento (str): El tipo de cambio: "entrada", "entradas", "asistencia" o "factura".
+            datos (dict): Los datos del cambio, con el mismo formato que el diario.
+        """
+        if evento == "entrada":
+            self.entradas.agregar(datos)
+        elif evento == "entradas":
+            self.entradas.agregar_lote(datos)
+        elif evento == "asistencia":
+            self.entradas.actualizar(datos["id"], {"asistencia": True})
+        elif evento == "factura":
+            self.facturas.agregar(datos)
+
+    def largo(self, nombre):
+        """
+        Devuelve el largo del archivo de entradas o de facturas, que sirve de marca de hasta dónde incluye sus registros
+        otro archivo.
+
+        Args:
+            nombre (str): "entradas" o "facturas".
+
+        Returns:
+            int: El largo del archivo en bytes, o 0 si no existe.
+        """
+        return getattr(self, nombre).tamano()
+
+    def escribir_temporales(self, nombre, registros):
+        """
+        Escribe el archivo de entradas o de facturas completo con sus índices, con la extensión .tmp.
+
+        Args:
+            nombre (str): "entradas" o "facturas".
+            registros (list): Los datos de cada registro.
+
+        Returns:
+            tuple: Las rutas definitivas de los archivos escritos y el largo del archivo de datos, en bytes.
+        """
+        return getattr(self, nombre).escribir_temporales(registros)
+
+    def buscar_entrada(self, id):
+        """
+        Busca una entrada por su identificador con el índice por id.
+
+        Args:
+            id (int): El identificador de la entrada.
+
+        Returns:
+            dict: Los datos de la entrada, o None si no existe.
+        """
+        return self.entradas.buscar(id)
+
+    def existe_entrada(self, id):
+        """
+        Indica si hay una entrada con un identificador, sin leerla.
+
+        Args:
+            id (int): El identificador de la entrada.
+
+        Returns:
+            bool: True si la entrada existe.
+        """
+        return self.entradas.existe_id(id)
+
+    def ultimo_id(self):
+        """
+        Devuelve el mayor identificador de las entradas guardadas.
+
+        Returns:
+            int: El mayor identificador, o 0 si no hay entradas.
+        """
+        return self.entradas.ultimo_id()
+
+    def existe_factura(self, id):
+        """
+        Indica si hay una factura con un número, sin leerla. El número de una factura es su línea en el archivo.
+
+        Args:
+            id (int): El número de la factura.
+
+        Returns:
+            bool: True si la factura existe.
+        """
+        return self.facturas.existe_id(id)
+
+    def ultima_factura(self):
+        """
+        Devuelve el número de la última factura guardada.
+
+        Returns:
+            int: El mayor número, o 0 si no hay facturas.
+        """
+        return self.facturas.ultimo_id()
+
+    def entradas_cliente(self, cedula):
+        """
+        Busca las entradas de un cliente con el índice por cédula.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            list: Los datos de cada entrada del cliente.
+        """
+        return self.entradas.buscar_por("cliente", cedula)
+
+    def entradas_partido(self, partido_id):
+        """
+        Busca las entradas de un partido con el índice por partido.
+
+        Args:
+            partido_id (str): El identificador del partido.
+
+        Returns:
+            list: Los datos de cada entrada del partido.
+        """
+        return self.entradas.buscar_por("partido", f"{partido_id}")
+
+    def contar_entradas_cliente(self, cedula):
+        """
+        Cuenta las entradas de un cliente con el índice por cédula, sin leerlas.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            int: La cantidad de entradas del cliente.
+        """
+        return self.entradas.contar_por("cliente", cedula)
+
+    def contar_entradas_partido(self, partido_id):
+        """
+        Cuenta las entradas de un partido con el índice por partido, sin leerlas.
+
+        Args:
+            partido_id (str): El identificador del partido.
+
+        Returns:
+            int: La cantidad de entradas del partido.
+        """
+        return self.entradas.contar_por("partido", f"{partido_id}")
+
+    def recorrer_entradas(self, desde=0):
+        """
+        Recorre las entradas guardadas en el orden en que se vendieron.
+
+        Args:
+            desde (int): El byte del archivo desde el que se empieza a leer.
+
+        Yields:
+            dict: Los datos de cada entrada, como los devuelve Entrada.diccionario.
+        """
+        return self.entradas.recorrer(desde)
+
+    def recorrer_facturas(self, cedula=None, desde=0):
+        """
+        Recorre las facturas guardadas, todas o solo las de un cliente usando el índice por cédula.
+
+        Args:
+            cedula (str): La cédula del cliente, o None para recorrer todas las facturas.
+            desde (int): El byte del archivo desde el que se empieza a leer, si se recorren todas.
+
+        Yields:
+            dict: Los datos de cada factura, como los devuelve Factura.diccionario.
+        """
+        if cedula is None:
+            return self.facturas.recorrer(desde)
+        return iter(self.facturas.buscar_por("cliente", cedula))
+
+    def cerrar(self):
+        """
+        Cierra los archivos de entradas y facturas.
+        """
+        self.entradas.cerrar()
+        self.facturas.cerrar()
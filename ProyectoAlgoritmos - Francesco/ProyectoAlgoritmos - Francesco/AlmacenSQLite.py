@@ -0,0 +1,482 @@
+import json
+import sqlite3
+import threading
+
+
+class AlmacenSQLite:
+    """
+    Clase que guarda los datos de la aplicación en una base de datos SQLite en lugar de los seis archivos JSON.
+
+    Cada tabla sigue la forma del diccionario de su clase, y las entradas y facturas tienen índices por cédula y por
+    partido para consultarlas sin cargar todo. Los ids y montos no declaran tipo para que SQLite los devuelva tal como
+    se guardaron (un entero no vuelve como decimal). Las ventas, asistencias, facturas y clientes nuevos se guardan fila por fila
+    en cuanto ocurren, con los mismos eventos que el diario, así que al salir no hace falta reescribir nada.
+
+    Las entradas y facturas no se cargan al abrir la base: se consultan con los mismos métodos que AlmacenJSONL. La
+    ocupación de los partidos se guarda al salir junto con la marca "ocupacion", el id de la última entrada que incluye.
+
+    Atributos:
+        ruta (str): La ruta del archivo de la base de datos.
+        conexion (Connection): La conexión abierta con la base de datos, en modo WAL.
+        candado (Lock): El candado que evita que dos hilos usen la conexión a la vez.
+    """
+    TABLAS = """
+        CREATE TABLE IF NOT EXISTS equipos (
+            id PRIMARY KEY, codigo TEXT, nombre TEXT, grupo TEXT
+        );
+        CREATE TABLE IF NOT EXISTS estadios (
+            id PRIMARY KEY, nombre TEXT, ciudad TEXT, capacidad_general INTEGER, capacidad_vip INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS restaurantes (
+            estadio, nombre TEXT
+        );
+        CREATE TABLE IF NOT EXISTS productos (
+            estadio, restaurante TEXT, nombre TEXT, cantidad, precio, stock, adicional TEXT
+        );
+        CREATE TABLE IF NOT EXISTS partidos (
+            id PRIMARY KEY, numero, equipo_local, equipo_visitante, fecha TEXT, grupo TEXT, estadio, ocupacion TEXT
+        );
+        CREATE TABLE IF NOT EXISTS clientes (
+            cedula TEXT PRIMARY KEY, nombre TEXT, edad INTEGER, vampiro INTEGER, perfecto INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS entradas (
+            id INTEGER PRIMARY KEY, cliente TEXT, partido TEXT, asiento TEXT, tipo_entrada TEXT,
+            subtotal, descuento, total_descuento, iva, total, asistencia INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS facturas (
+            id INTEGER PRIMARY KEY, cliente TEXT, partido, restaurant TEXT, detalles_productos TEXT,
+            subtotal, descuento, total
+        );
+        CREATE TABLE IF NOT EXISTS marcas (
+            nombre TEXT PRIMARY KEY, valor
+        );
+        CREATE INDEX IF NOT EXISTS productos_nombre ON productos (nombre);
+        CREATE INDEX IF NOT EXISTS entradas_cliente ON entradas (cliente);
+        CREATE INDEX IF NOT EXISTS entradas_partido ON entradas (partido);
+        CREATE INDEX IF NOT EXISTS facturas_cliente ON facturas (cliente);
+        CREATE INDEX IF NOT EXISTS facturas_partido ON facturas (partido);
+    """
+
+    # Las consultas se escriben una sola vez para que sqlite3 reutilice las sentencias preparadas
+    INSERTAR_EQUIPO = "INSERT INTO equipos VALUES (:id, :codigo, :nombre, :grupo)"
+    INSERTAR_ESTADIO = "INSERT INTO estadios VALUES (?, ?, ?, ?, ?)"
+    INSERTAR_RESTAURANTE = "INSERT INTO restaurantes VALUES (?, ?)"
+    INSERTAR_PRODUCTO = "INSERT INTO productos VALUES (?, ?, ?, ?, ?, ?, ?)"
+    INSERTAR_PARTIDO = "INSERT INTO partidos VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    INSERTAR_CLIENTE = "INSERT OR IGNORE INTO clientes VALUES (:cedula, :nombre, :edad, :vampiro, :perfecto)"
+    INSERTAR_ENTRADA = ("INSERT OR REPLACE INTO entradas VALUES (:id, :cliente, :partido, :asiento, :tipo_entrada, "
+                        ":subtotal, :descuento, :total_descuento, :iva, :total, :asistencia)")
+    INSERTAR_FACTURA = "INSERT INTO facturas VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    GUARDAR_MARCA = "INSERT OR REPLACE INTO marcas VALUES (?, ?)"
+    CONFIRMAR_ASISTENCIA = "UPDATE entradas SET asistencia = 1 WHERE id = ?"
+    RESTAR_STOCK = "UPDATE productos SET stock = stock - ? WHERE nombre = ?"
+    ACTUALIZAR_OCUPACION = "UPDATE partidos SET ocupacion = ? WHERE id = ?"
+    COLUMNAS_ENTRADA = "id, cliente, partido, asiento, tipo_entrada, subtotal, descuento, total_descuento, iva, total, asistencia"
+    COLUMNAS_FACTURA = "id, cliente, partido, restaurant, detalles_productos, subtotal, descuento, total"
+
+    def __init__(self, ruta="eurocopa.db"):
+        """
+        Inicializa una instancia de la clase AlmacenSQLite, creando las tablas y los índices si no existen.
+
+        Args:
+            ruta (str): La ruta del archivo de la base de datos.
+        """
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self.candado = threading.Lock()
+
+        # WAL deja leer mientras se escribe y convierte cada venta en un añadido al final del registro de la base.
+        # synchronous=FULL fuerza ese registro al disco en cada confirmación, igual que el diario.
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=FULL")
+        self.conexion.executescript(self.TABLAS)
+
+    def vacio(self):
+        """
+        Verifica si la base de datos todavía no tiene datos guardados.
+
+        Returns:
+            bool: True si no hay ningún partido guardado, False de lo contrario.
+        """
+        with self.candado:
+            return self.conexion.execute("SELECT 1 FROM partidos LIMIT 1").fetchone() is None
+
+    def guardar(self, app):
+        """
+        Reemplaza todo el contenido de la base de datos por los datos de la aplicación, en una sola transacción.
+
+        Se usa para importar los archivos JSON o los datos de la API; después, los cambios se guardan fila por fila.
+
+        Args:
+            app (App): La aplicación cuyos datos se guardan.
+        """
+        with self.candado, self.conexion:
+            for tabla in ["equipos", "estadios", "restaurantes", "productos", "partidos", "clientes", "entradas", "facturas"]:
+                self.conexion.execute(f"DELETE FROM {tabla}")
+
+            self.conexion.executemany(self.INSERTAR_EQUIPO, (equipo.diccionario() for equipo in app.equipos))
+
+            for estadio in app.estadios:
+                estadio_data = estadio.diccionario()
+                capacidad = estadio_data["capacidad"]
+                self.conexion.execute(self.INSERTAR_ESTADIO, (estadio_data["id"], estadio_data["nombre"], estadio_data["ciudad"], capacidad[0], capacidad[1]))
+                for rest_data in estadio_data["restaurantes"]:
+                    self.conexion.execute(self.INSERTAR_RESTAURANTE, (estadio_data["id"], rest_data["nombre"]))
+                    self.conexion.executemany(self.INSERTAR_PRODUCTO, (
+                        (estadio_data["id"], rest_data["nombre"], prod_data["nombre"], prod_data["cantidad"], prod_data["precio"], prod_data["stock"], prod_data["adicional"])
+                        for prod_data in rest_data["productos"]
+                    ))
+
+            for partido in app.partidos:
+                partido_data = partido.diccionario()
+                self.conexion.execute(self.INSERTAR_PARTIDO, (
+                    partido_data["id"], partido_data["numero"], partido_data["equipo_local"], partido_data["equipo_visitante"],
+                    partido_data["fecha"], partido_data["grupo"], partido_data["estadio"], json.dumps(partido_data["ocupacion"])
+                ))
+
+            self.conexion.executemany(self.INSERTAR_CLIENTE, (cliente.diccionario() for cliente in app.clientes))
+            self.conexion.executemany(self.INSERTAR_ENTRADA, (entrada.diccionario() for entrada in app.entradas))
+            self.conexion.executemany(self.INSERTAR_FACTURA, (self.fila_factura(factura.diccionario()) for factura in app.facturas))
+
+    def guardar_ocupacion(self, partidos, ultima_entrada):
+        """
+        Actualiza la ocupación guardada de los partidos, para que al volver a abrir no haya que marcar cada asiento vendido.
+
+        Args:
+            partidos (list): Los partidos cuya ocupación se guarda.
+            ultima_entrada (int): El id de la última entrada cuyo asiento incluye la ocupación.
+        """
+        with self.candado, self.conexion:
+            self.conexion.executemany(self.ACTUALIZAR_OCUPACION, ((json.dumps(partido.ocupacion()), partido.id) for partido in partidos))
+            self.conexion.execute(self.GUARDAR_MARCA, ("ocupacion", ultima_entrada))
+
+    def marca(self, nombre):
+        """
+        Lee una marca guardada, por ejemplo hasta qué entrada incluye la ocupación guardada.
+
+        Args:
+            nombre (str): El nombre de la marca.
+
+        Returns:
+            int: El valor de la marca, o 0 si no está guardada.
+        """
+        for valor, in self.consultar("SELECT valor FROM marcas WHERE nombre = ?", (nombre,)):
+            return valor
+        return 0
+
+    def valor(self, consulta, parametros=()):
+        """
+        Devuelve el primer valor de una consulta de una sola fila, como un conteo o un máximo.
+
+        Args:
+            consulta (str): La consulta SQL.
+            parametros (tuple): Los parámetros de la consulta.
+
+        Returns:
+            El valor, o None si la consulta no devuelve filas.
+        """
+        with self.candado:
+            fila = self.conexion.execute(consulta, parametros).fetchone()
+        return None if fila is None else fila[0]
+
+    def fila_factura(self, factura_data):
+        """
+        Convierte el diccionario de una factura en los valores de su fila.
+
+        Args:
+            factura_data (dict): Los datos de la factura, como los devuelve Factura.diccionario.
+
+        Returns:
+            tuple: Los valores de la fila, con los detalles de productos como texto JSON.
+        """
+        return (factura_data.get("id"), factura_data["cliente"], factura_data["partido"], factura_data["restaurant"],
+                json.dumps(factura_data["detalles_productos"], ensure_ascii=False), factura_data["subtotal"], factura_data["descuento"], factura_data["total"])
+
+    def registrar(self, evento, datos):
+        """
+        Guarda un cambio con una sola transacción de pocas filas.
+
+        Args:
+            evento (str): El tipo de cambio: "cliente", "clientes", "entrada", "entradas", "asistencia" o "factura".
+            datos (dict): Los datos del cambio, con el mismo formato que los archivos JSON.
+        """
+        with self.candado, self.conexion:
+            if evento == "cliente":
+                self.conexion.execute(self.INSERTAR_CLIENTE, datos)
+            elif evento == "clientes":
+                self.conexion.executemany(self.INSERTAR_CLIENTE, datos)
+            elif evento == "entrada":
+                self.conexion.execute(self.INSERTAR_ENTRADA, datos)
+            elif evento == "entradas":
+                self.conexion.executemany(self.INSERTAR_ENTRADA, datos)
+            elif evento == "asistencia":
+                self.conexion.execute(self.CONFIRMAR_ASISTENCIA, (datos["id"],))
+            elif evento == "factura":
+                self.conexion.execute(self.INSERTAR_FACTURA, self.fila_factura(datos))
+                self.conexion.executemany(self.RESTAR_STOCK, ((detalle[1], detalle[0]) for detalle in datos["detalles_productos"]))
+
+    def consultar(self, consulta, parametros=()):
+        """
+        Recorre las filas de una consulta de a una, sin traerlas todas a memoria.
+
+        Args:
+            consulta (str): La consulta SQL.
+            parametros (tuple): Los parámetros de la consulta.
+
+        Yields:
+            tuple: Cada fila del resultado.
+        """
+        with self.candado:
+            cursor = self.conexion.execute(consulta, parametros)
+        while True:
+            with self.candado:
+                filas = cursor.fetchmany(1000)
+            if not filas:
+                return
+            yield from filas
+
+    def equipos(self):
+        """
+        Recorre los equipos guardados.
+
+        Yields:
+            dict: Los datos de cada equipo, como los devuelve Equipo.diccionario.
+        """
+        for id, codigo, nombre, grupo in self.consultar("SELECT id, codigo, nombre, grupo FROM equipos ORDER BY rowid"):
+            yield {"id": id, "codigo": codigo, "nombre": nombre, "grupo": grupo}
+
+    def estadios(self):
+        """
+        Recorre los estadios guardados, con sus restaurantes y el stock actual de sus productos.
+
+        Yields:
+            dict: Los datos de cada estadio, como los devuelve Estadio.diccionario.
+        """
+        restaurantes = {}
+        for estadio, nombre in self.consultar("SELECT estadio, nombre FROM restaurantes ORDER BY rowid"):
+            restaurantes.setdefault(estadio, {})[nombre] = []
+        for estadio, restaurante, nombre, cantidad, precio, stock, adicional in self.consultar(
+                "SELECT estadio, restaurante, nombre, cantidad, precio, stock, adicional FROM productos ORDER BY rowid"):
+            restaurantes[estadio][restaurante].append({"nombre": nombre, "cantidad": cantidad, "precio": precio, "stock": stock, "adicional": adicional})
+
+        for id, nombre, ciudad, capacidad_general, capacidad_vip in self.consultar(
+                "SELECT id, nombre, ciudad, capacidad_general, capacidad_vip FROM estadios ORDER BY rowid"):
+            yield {
+                "id": id,
+                "nombre": nombre,
+                "ciudad": ciudad,
+                "capacidad": [capacidad_general, capacidad_vip],
+                "restaurantes": [{"nombre": nombre_rest, "productos": productos} for nombre_rest, productos in restaurantes.get(id, {}).items()]
+            }
+
+    def partidos(self):
+        """
+        Recorre los partidos guardados.
+
+        Yields:
+            dict: Los datos de cada partido, como los devuelve Partido.diccionario.
+        """
+        for fila in self.consultar("SELECT id, numero, equipo_local, equipo_visitante, fecha, grupo, estadio, ocupacion FROM partidos ORDER BY rowid"):
+            id, numero, equipo_local, equipo_visitante, fecha, grupo, estadio, ocupacion = fila
+            yield {
+                'id': id,
+                'numero': numero,
+                'equipo_local': equipo_local,
+                'equipo_visitante': equipo_visitante,
+                'fecha': fecha,
+                'grupo': grupo,
+                'estadio': estadio,
+                'ocupacion': json.loads(ocupacion) if ocupacion else {}
+            }
+
+    def clientes(self):
+        """
+        Recorre los clientes guardados.
+
+        Yields:
+            dict: Los datos de cada cliente, como los devuelve Cliente.diccionario.
+        """
+        for cedula, nombre, edad, vampiro, perfecto in self.consultar("SELECT cedula, nombre, edad, vampiro, perfecto FROM clientes ORDER BY rowid"):
+            yield {
+                "nombre": nombre,
+                "cedula": cedula,
+                "edad": edad,
+                "vampiro": None if vampiro is None else bool(vampiro),
+                "perfecto": None if perfecto is None else bool(perfecto)
+            }
+
+    def dato_entrada(self, fila):
+        """
+        Convierte una fila de la tabla de entradas en el diccionario de la entrada.
+
+        Args:
+            fila (tuple): Los valores de la fila, en el orden de COLUMNAS_ENTRADA.
+
+        Returns:
+            dict: Los datos de la entrada, como los devuelve Entrada.diccionario.
+        """
+        id, cliente, partido, asiento, tipo_entrada, subtotal, descuento, total_descuento, iva, total, asistencia = fila
+        return {
+            'id': id,
+            'cliente': cliente,
+            'partido': partido,
+            'asiento': asiento,
+            'tipo_entrada': tipo_entrada,
+            'subtotal': subtotal,
+            'descuento': descuento,
+            'total_descuento': total_descuento,
+            'iva': iva,
+            'total': total,
+            'asistencia': bool(asistencia)
+        }
+
+    def recorrer_entradas(self, desde=0):
+        """
+        Recorre las entradas guardadas por orden de identificador.
+
+        Args:
+            desde (int): El id de la última entrada que se salta; 0 para recorrerlas todas.
+
+        Yields:
+            dict: Los datos de cada entrada, como los devuelve Entrada.diccionario.
+        """
+        for fila in self.consultar(f"SELECT {self.COLUMNAS_ENTRADA} FROM entradas WHERE id > ? ORDER BY id", (desde,)):
+            yield self.dato_entrada(fila)
+
+    def buscar_entrada(self, id):
+        """
+        Busca una entrada por su identificador.
+
+        Args:
+            id (int): El identificador de la entrada.
+
+        Returns:
+            dict: Los datos de la entrada, o None si no existe.
+        """
+        for fila in self.consultar(f"SELECT {self.COLUMNAS_ENTRADA} FROM entradas WHERE id = ?", (id,)):
+            return self.dato_entrada(fila)
+        return None
+
+    def existe_entrada(self, id):
+        """
+        Indica si hay una entrada con un identificador, sin leerla.
+
+        Args:
+            id (int): El identificador de la entrada.
+
+        Returns:
+            bool: True si la entrada existe.
+        """
+        return self.valor("SELECT 1 FROM entradas WHERE id = ?", (id,)) is not None
+
+    def ultimo_id(self):
+        """
+        Devuelve el mayor identificador de las entradas guardadas.
+
+        Returns:
+            int: El mayor identificador, o 0 si no hay entradas.
+        """
+        return self.valor("SELECT max(id) FROM entradas") or 0
+
+    def entradas_cliente(self, cedula):
+        """
+        Busca las entradas de un cliente usando el índice por cédula.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            list: Los datos de cada entrada del cliente.
+        """
+        return [self.dato_entrada(fila) for fila in self.consultar(f"SELECT {self.COLUMNAS_ENTRADA} FROM entradas WHERE cliente = ? ORDER BY id", (cedula,))]
+
+    def entradas_partido(self, partido_id):
+        """
+        Busca las entradas de un partido usando el índice por partido.
+
+        Args:
+            partido_id (str): El identificador del partido.
+
+        Returns:
+            list: Los datos de cada entrada del partido.
+        """
+        return [self.dato_entrada(fila) for fila in self.consultar(f"SELECT {self.COLUMNAS_ENTRADA} FROM entradas WHERE partido = ? ORDER BY id", (f"{partido_id}",))]
+
+    def contar_entradas_cliente(self, cedula):
+        """
+        Cuenta las entradas de un cliente con el índice por cédula, sin leerlas.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            int: La cantidad de entradas del cliente.
+        """
+        return self.valor("SELECT count(*) FROM entradas WHERE cliente = ?", (cedula,))
+
+    def contar_entradas_partido(self, partido_id):
+        """
+        Cuenta las entradas de un partido con el índice por partido, sin leerlas.
+
+        Args:
+            partido_id (str): El identificador del partido.
+
+        Returns:
+            int: La cantidad de entradas del partido.
+        """
+        return self.valor("SELECT count(*) FROM entradas WHERE partido = ?", (f"{partido_id}",))
+
+    def existe_factura(self, id):
+        """
+        Indica si hay una factura con un número, sin leerla.
+
+        Args:
+            id (int): El número de la factura.
+
+        Returns:
+            bool: True si la factura existe.
+        """
+        return self.valor("SELECT 1 FROM facturas WHERE id = ?", (id,)) is not None
+
+    def ultima_factura(self):
+        """
+        Devuelve el número de la última factura guardada.
+
+        Returns:
+            int: El mayor número, o 0 si no hay facturas.
+        """
+        return self.valor("SELECT max(id) FROM facturas") or 0
+
+    def recorrer_facturas(self, cedula=None):
+        """
+        Recorre las facturas guardadas, todas o solo las de un cliente usando el índice por cédula.
+
+        Args:
+            cedula (str): La cédula del cliente, o None para recorrer todas las facturas.
+
+        Yields:
+            dict: Los datos de cada factura, como los devuelve Factura.diccionario.
+        """
+        if cedula is None:
+            filas = self.consultar(f"SELECT {self.COLUMNAS_FACTURA} FROM facturas ORDER BY id")
+        else:
+            filas = self.consultar(f"SELECT {self.COLUMNAS_FACTURA} FROM facturas WHERE cliente = ? ORDER BY id", (cedula,))
+
+        for id, cliente, partido, restaurant, detalles_productos, subtotal, descuento, total in filas:
+            yield {
+                'id': id,
+                'cliente': cliente,
+                'partido': partido,
+                'restaurant': restaurant,
+                'detalles_productos': json.loads(detalles_productos),
+                'subtotal': subtotal,
+                'descuento': descuento,
+                'total': total,
+            }
+
+    def cerrar(self):
+        """
+        Cierra la conexión con la base de datos.
+        """
+        with self.candado:
+            self.conexion.close()
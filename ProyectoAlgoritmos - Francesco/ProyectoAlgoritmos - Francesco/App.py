@@ -1,16 +1,34 @@
 from Alimento import Alimento
+from AlmacenJSONL import AlmacenJSONL
+from AlmacenSQLite import AlmacenSQLite
 from Bebida import Bebida
+from CacheApi import CacheApi
 from Cliente import Cliente
+from Diario import Diario
 from Entrada import Entrada
 from Equipo import Equipo
 from Estadio import Estadio
 from Factura import Factura
+from GestorReservas import GestorReservas
+from GuardadoPeriodico import GuardadoPeriodico
+from Instantanea import Instantanea
+from MapaAsientos import MapaAsientos
+from MotorVentas import MotorVentas
 from Partido import Partido
 from Producto import Producto
+from RegistroEntidades import RegistroEntidades
+from RegistroEntradas import RegistroEntradas
+from RegistroEntradasJSONL import RegistroEntradasJSONL
 from Restaurante import Restaurante
+from TablaVampiros import abrir_tabla
 import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import csv
 import json
+import math
 import os
+import threading
+import time
 
 class App:
     """
@@ -22,10 +40,81 @@ class App:
         restaurantes (list): Lista de restaurantes.
         productos (list): Lista de productos.
         partidos (list): Lista de partidos.
-        entradas (list): Lista de entradas.
-        facturas (list): Lista de facturas.
+        entidades (RegistroEntidades): Índices de equipos, estadios y partidos por id, y de restaurantes y productos por nombre.
+        entradas (list): Lista de entradas, vacía mientras se leen de los archivos JSON Lines.
+        registro_entradas (RegistroEntradas): Índices de las entradas por id, cliente, partido y asistencia, o un
+            RegistroEntradasJSONL que las lee de los archivos JSON Lines.
+        motor_ventas (MotorVentas): Coordina la ocupación de asientos y los identificadores de las entradas vendidas.
+        gestor_reservas (GestorReservas): Reservas con vencimiento de los asientos elegidos mientras se completa el pago.
+        facturas (list): Lista de facturas, vacía mientras se leen de los archivos JSON Lines.
         clientes (list): Lista de clientes.
+        clientes_ci (dict): Índice de clientes por cédula.
+        memo_vampiros (dict): Resultados de es_vampiro memorizados por cédula.
+        tabla_vampiros (TablaVampiros): Tabla precalculada de números vampiro, o None si no se ha generado vampiros.bin.
+        url_api (str): La URL base de la que se descargan los documentos de la API.
+        cache_api (CacheApi): La copia en disco de los documentos de la API, revalidada con solicitudes condicionales.
+        diario (Diario): El diario de ventas, asistencias, facturas y clientes desde el último guardado, o None si no está activo.
+        almacen (AlmacenSQLite): La base de datos donde se guarda cada cambio y de donde se leen las entradas y facturas, o
+            None si los datos se guardan en archivos JSON.
+        almacen_jsonl (AlmacenJSONL): Los archivos JSON Lines de donde se leen las entradas y facturas y donde se guarda
+            cada venta, asistencia y factura, o None si están en memoria.
+        marcas (dict): Hasta qué byte de entradas.jsonl y facturas.jsonl incluyen partidos.json y estadios.json.
+        cambios (set): Los nombres de las colecciones que cambiaron desde que se leyeron o guardaron sus archivos JSON.
+        candado_cambios (RLock): El candado que hace que un cambio y su registro no queden partidos por un guardado en segundo plano.
+        candado_guardado (Lock): El candado que evita que dos guardados escriban los archivos a la vez.
+        guardado_periodico (GuardadoPeriodico): El guardado en segundo plano de los archivos JSON, o None si no está activo.
+        instantanea (Instantanea): La instantánea binaria de los archivos JSON que se guarda al salir, para arrancar más rápido.
     """
+    # Números perfectos pares 2^(p-1) * (2^p - 1) para los primos de Mersenne 2^p - 1 con p <= 127
+    NUMEROS_PERFECTOS = tuple(2**(p - 1) * (2**p - 1) for p in (2, 3, 5, 7, 13, 17, 19, 31, 61, 89, 107, 127))
+
+    # Cantidad mínima de clientes sin evaluar para repartir el cálculo de descuentos entre procesos
+    UMBRAL_PROCESOS = 20000
+
+    # Cantidad máxima de filas que se muestran de una vez al elegir un asiento
+    FILAS_POR_PAGINA = 20
+
+    # Precio de la entrada de cada zona, antes de descuento e IVA
+    PRECIOS_ENTRADA = {"General": 35, "VIP": 75}
+
+    # URL base de la API y tiempos máximos de conexión y de lectura (en segundos) de cada descarga
+    URL_API = "https://raw.githubusercontent.com/Algoritmos-y-Programacion/api-proyecto/main/"
+    TIMEOUT_API = (5, 30)
+
+    # Archivo de la base de datos SQLite
+    RUTA_BASE_DATOS = "eurocopa.db"
+
+    # Colecciones que se guardan en archivos JSON, y las que modifica cada evento que se registra con persistir
+    COLECCIONES = ("equipos", "estadios", "partidos", "clientes", "entradas", "facturas")
+    CAMBIOS_EVENTO = {
+        "cliente": ("clientes",),
+        "clientes": ("clientes",),
+        "entrada": ("entradas", "partidos"),
+        "entradas": ("entradas", "partidos"),
+        "asistencia": ("entradas",),
+        "factura": ("facturas", "estadios"),
+    }
+
+    # Colecciones que se guardan en archivos JSON Lines en lugar de archivos JSON
+    COLECCIONES_JSONL = ("entradas", "facturas")
+
+    # Archivo con las marcas de hasta qué byte de cada archivo JSON Lines incluye cada archivo JSON: la ocupación de
+    # partidos.json incluye las entradas de entradas.jsonl hasta su marca, y el stock de estadios.json las facturas
+    ARCHIVO_MARCAS = "marcas.json"
+    MARCAS_JSONL = {"partidos": "entradas", "estadios": "facturas"}
+
+    # Atributos que se guardan en la instantánea binaria, con los índices ya construidos; las entradas y facturas se
+    # leen de sus archivos JSON Lines
+    ATRIBUTOS_INSTANTANEA = ("equipos", "estadios", "restaurantes", "productos", "partidos", "entidades",
+                             "clientes", "clientes_ci")
+
+    # Archivo donde se anota un guardado cuyos archivos temporales ya están escritos pero todavía no se renombraron
+    ARCHIVO_GUARDADO_PENDIENTE = "guardado.pendiente"
+
+    # Segundos máximos y cantidad de cambios entre dos guardados en segundo plano
+    INTERVALO_GUARDADO = 60
+    CAMBIOS_GUARDADO = 500
+
     def __init__(self):
         """
         Inicializa una instancia de la clase App con listas vacías para cada tipo de entidad.
@@ -35,23 +124,107 @@ class App:
         self.restaurantes = []
         self.productos = []
         self.partidos = []
+        self.entidades = RegistroEntidades()
         self.entradas = []
+        self.registro_entradas = RegistroEntradas()
+        self.motor_ventas = MotorVentas(self)
+        self.gestor_reservas = GestorReservas(self.motor_ventas)
         self.facturas = []
         self.clientes = []
+        self.clientes_ci = {}
+        self.memo_vampiros = {}
+        self.tabla_vampiros = abrir_tabla('vampiros.bin')
+        self.url_api = os.environ.get("EURO_API_URL", self.URL_API)
+        self.cache_api = CacheApi('cache_api')
+        self.diario = None
+        self.almacen = None
+        self.almacen_jsonl = None
+        self.marcas = dict.fromkeys(self.MARCAS_JSONL, 0)
+        self.cambios = set(self.COLECCIONES)
+        self.candado_cambios = threading.RLock()
+        self.candado_guardado = threading.Lock()
+        self.guardado_periodico = None
+        self.instantanea = Instantanea('instantanea.bin', tuple(f"{nombre}.json" for nombre in self.COLECCIONES if nombre not in self.COLECCIONES_JSONL) + (self.ARCHIVO_MARCAS,))
 
     
-    def cargar_Equipos(self):
+    def descargar_api(self, documento, sesion=None):
+        """
+        Descarga un documento JSON de la API, pasando por la caché en disco.
+
+        Si la copia guardada está vigente, o el servidor responde que no cambió, o no hay conexión, se usa la copia guardada.
+        Si la copia guardada no es JSON válido, se descarta y el documento se descarga de nuevo.
+
+        Args:
+            documento (str): El nombre del documento, por ejemplo "teams.json".
+            sesion (requests.Session): La sesión con la que se reutilizan las conexiones, o None para una solicitud suelta.
+
+        Returns:
+            list: Los datos del documento.
+
+        Raises:
+            requests.RequestException: Si la descarga falla, tarda más que TIMEOUT_API o responde con un error HTTP,
+                y el documento no está en la caché.
+            ValueError: Si el documento descargado de la API no es JSON válido.
+        """
+        if sesion is None:
+            sesion = requests
+
+        cuerpo = self.cache_api.obtener(sesion, self.url_api, documento, self.TIMEOUT_API)
+        try:
+            return json.loads(cuerpo)
+        except ValueError:
+            if self.cache_api.origen.get(documento) == "red":
+                raise
+            self.cache_api.descartar(documento)
+
+        return json.loads(self.cache_api.obtener(sesion, self.url_api, documento, self.TIMEOUT_API))
+
+    def cargar_api(self):
+        """
+        Descarga a la vez los equipos, estadios y partidos de la API y luego construye los objetos en orden de dependencia.
+
+        Las tres descargas comparten una sesión de requests y corren en un grupo de hilos. Los partidos se construyen
+        al final porque buscan sus equipos y su estadio.
+
+        Returns:
+            dict: Los segundos que tardaron la descarga, la construcción de los objetos y la carga completa.
+
+        Raises:
+            requests.RequestException: Si alguna de las descargas falla.
+            ValueError: Si algún documento descargado no es JSON válido.
+        """
+        inicio = time.perf_counter()
+
+        with requests.Session() as sesion, ThreadPoolExecutor(max_workers=3) as pool:
+            equipos = pool.submit(self.descargar_api, "teams.json", sesion)
+            estadios = pool.submit(self.descargar_api, "stadiums.json", sesion)
+            partidos = pool.submit(self.descargar_api, "matches.json", sesion)
+            datos_equipos = equipos.result()
+            datos_estadios = estadios.result()
+            datos_partidos = partidos.result()
+
+        descarga = time.perf_counter()
+
+        self.cargar_Equipos(datos_equipos)
+        self.cargar_Estadios(datos_estadios)
+        self.cargar_Partidos(datos_partidos)
+
+        fin = time.perf_counter()
+        return {"descarga": descarga - inicio, "construccion": fin - descarga, "total": fin - inicio}
+
+    def cargar_Equipos(self, datos=None):
         """
         Carga los equipos desde una API y los añade a la lista de equipos de la aplicación.
         
         Obtiene los datos de los equipos desde una API, crea instancias de la clase Equipo con los datos recibidos
         y las añade a la lista de equipos de la aplicación.
+
+        Args:
+            datos (list): Los datos ya descargados de teams.json, o None para descargarlos.
         """
-        # Realiza una solicitud GET a la URL de la API que contiene los datos de los equipos
-        api = requests.get("https://raw.githubusercontent.com/Algoritmos-y-Programacion/api-proyecto/main/teams.json")
-        
-        # Convierte la respuesta de la API a formato JSON
-        datos = api.json()
+        # Realiza una solicitud GET a la API si los datos no se descargaron antes
+        if datos is None:
+            datos = self.descargar_api("teams.json")
 
         # Itera sobre la lista de datos obtenidos de la API
         for info in datos:
@@ -65,49 +238,34 @@ class App:
             equipo = Equipo(id, codigo, nombre, grupo)
             
             # Añade el equipo a la lista de equipos de la aplicación
-            self.equipos.append(equipo)
+            self.agregar_equipo(equipo)
 
 
     def llenar_mapa(self, capacidad):
         """
-        Llena un mapa de asientos para un estadio basado en la capacidad dada.
+        Crea un mapa de asientos para un estadio basado en la capacidad dada.
 
         Args:
             capacidad (int): La capacidad del mapa de asientos.
 
         Returns:
-            list: Una lista de listas que representa el mapa de asientos.
+            MapaAsientos: Un mapa con todos los asientos libres, en filas de 10 asientos.
         """
-        mapa = []
-        count = 1
-
-        # Rellena el mapa de asientos hasta alcanzar la capacidad dada
-        while count <= capacidad:
-            lista = []
-            sub_count = 0
-            
-            # Añade hasta 10 asientos por fila, o hasta que se alcance la capacidad
-            while sub_count < 10 and count <= capacidad:
-                lista.append(str(sub_count + 1))
-                count += 1
-                sub_count += 1
-            
-            mapa.append(lista)
-        
-        return mapa
+        return MapaAsientos(capacidad, 10)
 
-    def cargar_Estadios(self):
+    def cargar_Estadios(self, datos=None):
         """
         Carga los estadios desde una API y los añade a la lista de estadios de la aplicación.
         
         Obtiene los datos de los estadios desde una API, crea instancias de la clase Estadio con los datos recibidos
         y las añade a la lista de estadios de la aplicación.
+
+        Args:
+            datos (list): Los datos ya descargados de stadiums.json, o None para descargarlos.
         """
-        # Realiza una solicitud GET a la URL de la API que contiene los datos de los estadios
-        api = requests.get("https://raw.githubusercontent.com/Algoritmos-y-Programacion/api-proyecto/main/stadiums.json")
-        
-        # Convierte la respuesta de la API a formato JSON
-        datos = api.json()
+        # Realiza una solicitud GET a la API si los datos no se descargaron antes
+        if datos is None:
+            datos = self.descargar_api("stadiums.json")
 
         # Itera sobre la lista de datos obtenidos de la API
         for info in datos:
@@ -159,12 +317,42 @@ class App:
             
             # Crear una instancia de Estadio con los datos obtenidos y añadirla a la lista
             estadio = Estadio(id, nombre, ciudad, mapaGnral, mapaVip, lista_restaurantes)
-            self.estadios.append(estadio)
+            self.agregar_estadio(estadio)
 
     
+    def agregar_equipo(self, equipo):
+        """
+        Añade un equipo a la lista de equipos y al índice por id.
+
+        Args:
+            equipo (Equipo): El equipo a añadir.
+        """
+        self.equipos.append(equipo)
+        self.entidades.agregar_equipo(equipo)
+
+    def agregar_estadio(self, estadio):
+        """
+        Añade un estadio a la lista de estadios y lo indexa junto con sus restaurantes y productos.
+
+        Args:
+            estadio (Estadio): El estadio a añadir.
+        """
+        self.estadios.append(estadio)
+        self.entidades.agregar_estadio(estadio)
+
+    def agregar_partido(self, partido):
+        """
+        Añade un partido a la lista de partidos y al índice por id.
+
+        Args:
+            partido (Partido): El partido a añadir.
+        """
+        self.partidos.append(partido)
+        self.entidades.agregar_partido(partido)
+
     def buscar_equipo_id(self, id):
         """
-        Busca un equipo por su ID en la lista de equipos.
+        Busca un equipo por su ID en el índice de equipos.
 
         Args:
             id (str): El identificador del equipo a buscar.
@@ -172,15 +360,11 @@ class App:
         Returns:
             Equipo: El equipo con el ID especificado, o None si no se encuentra.
         """
-        # Itera sobre la lista de equipos para encontrar el equipo con el ID dado
-        for equipo in self.equipos:
-            if equipo.id == id:
-                return equipo
-        return None
+        return self.entidades.equipos.get(id)
 
     def buscar_estadio_id(self, id):
         """
-        Busca un estadio por su ID en la lista de estadios.
+        Busca un estadio por su ID en el índice de estadios.
 
         Args:
             id (int): El identificador del estadio a buscar.
@@ -188,24 +372,21 @@ class App:
         Returns:
             Estadio: El estadio con el ID especificado, o None si no se encuentra.
         """
-        # Itera sobre la lista de estadios para encontrar el estadio con el ID dado
-        for estadio in self.estadios:
-            if estadio.id == id:
-                return estadio
-        return None
+        return self.entidades.estadios.get(id)
 
-    def cargar_Partidos(self):
+    def cargar_Partidos(self, datos=None):
         """
         Carga los partidos desde una API y los añade a la lista de partidos de la aplicación.
         
         Obtiene los datos de los partidos desde una API, crea instancias de la clase Partido con los datos recibidos
         y las añade a la lista de partidos de la aplicación.
+
+        Args:
+            datos (list): Los datos ya descargados de matches.json, o None para descargarlos.
         """
-        # Realiza una solicitud GET a la URL de la API que contiene los datos de los partidos
-        api = requests.get("https://raw.githubusercontent.com/Algoritmos-y-Programacion/api-proyecto/main/matches.json")
-        
-        # Convierte la respuesta de la API a formato JSON
-        datos = api.json()
+        # Realiza una solicitud GET a la API si los datos no se descargaron antes
+        if datos is None:
+            datos = self.descargar_api("matches.json")
 
         # Itera sobre la lista de datos obtenidos de la API
         for info in datos:
@@ -226,7 +407,7 @@ class App:
             partido = Partido(id, numero, equipo_local, equipo_visitante, fecha, grupo, estadio)
             
             # Añade el partido a la lista de partidos de la aplicación
-            self.partidos.append(partido)
+            self.agregar_partido(partido)
 
     def ver_equipos(self):
         """
@@ -430,80 +611,90 @@ class App:
                 break
 
 
-    def seleccionar_asiento(self, tipo_entrada, estadio):
+    def seleccionar_asiento(self, tipo_entrada, partido):
         """
         Permite al usuario seleccionar un asiento en el estadio para un tipo de entrada específico.
         
         Args:
             tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
-            estadio (Estadio): El estadio en el que se desea seleccionar el asiento.
+            partido (Partido): El partido para el que se desea seleccionar el asiento.
 
         Returns:
-            list: Una lista con el número de fila y el número de asiento seleccionados.
+            tuple: Una lista con el número de fila y el número de asiento seleccionados y el número de su reserva, o None si la zona se agotó.
         """
-        if tipo_entrada == "General":
-            # Muestra el mapa de asientos de la zona general
-            print(estadio.mostrar_mapa_gnral())
+        print("1. Elegir el asiento\n2. Asignar el mejor asiento disponible")
 
-            # Solicita al usuario que ingrese la fila deseada
-            opcion_fila = input("Ingrese la fila en la que desea sentarse: ")
-            
-            # Valida que la fila ingresada sea un número y esté dentro del rango permitido, y que la fila no esté llena
-            while (not opcion_fila.isnumeric()) or (not int(opcion_fila) in range(1, len(estadio.mapaGnral)+1)) or(estadio.verificar_fila_llena(int(opcion_fila)-1, tipo_entrada)):
-                print("\nDato invalida")
-                opcion_fila = input("Ingrese la fila en la que desea sentarse: ")
+        # Solicita al usuario que elija cómo seleccionar el asiento
+        opcion_modo = input("Ingrese la opcion deseada: ")
+        
+        # Valida que la opción ingresada sea "1" o "2"
+        while opcion_modo not in ["1", "2"]:
+            print("\nError. Opcion Invalida.")
+            opcion_modo = input("Ingrese la opcion deseada: ")
 
-            index_fila = int(opcion_fila) - 1
+        if opcion_modo == "2":
+            # Asigna y ocupa el primer asiento libre desde las filas delanteras
+            asiento_elegido = self.motor_ventas.reclamar_mejor_asiento(partido, tipo_entrada)
+            if asiento_elegido is None:
+                print("\nYa no quedan asientos libres en esta zona.")
+                return None
 
-            # Solicita al usuario que ingrese el número del asiento deseado
-            opcion_asiento = input("Ingrese el numero del asiento donde desea sentarse: ")
-            
-            # Valida que el número del asiento ingresado sea un número y esté dentro del rango permitido, y que el asiento no esté ocupado
-            while (not opcion_asiento.isnumeric()) or (not int(opcion_asiento) in range(1, len(estadio.mapaGnral[index_fila])+1)) or (estadio.asiento_ocupado(index_fila, int(opcion_asiento)-1, tipo_entrada)):
-                print("\nDato invalida")
-                opcion_asiento = input("Ingrese el numero del asiento donde desea sentarse: ")
+            # Reserva el asiento hasta que se confirme o abandone el pago
+            reserva = self.gestor_reservas.reservar(partido, asiento_elegido[0] - 1, asiento_elegido[1] - 1, tipo_entrada)
+            print(f"\nAsiento asignado: Fila {asiento_elegido[0]}, Asiento {asiento_elegido[1]}")
+            return asiento_elegido, reserva
 
-            index_asiento = int(opcion_asiento) -  1
+        mapa = partido.obtener_mapa(tipo_entrada)
 
-            # Marca el asiento como ocupado
-            estadio.ocupar_asiento(index_fila, index_asiento, tipo_entrada)
+        # Muestra el mapa de asientos de la zona para este partido, por rango de filas si es muy grande
+        if mapa.cantidad_filas() <= self.FILAS_POR_PAGINA:
+            print(partido.mostrar_mapa(tipo_entrada))
+        else:
+            print(f"\nLa zona {tipo_entrada} tiene {mapa.cantidad_filas()} filas.")
 
-            # Devuelve la fila y el asiento seleccionados
-            asiento_elegido = [int(opcion_fila), int(opcion_asiento)]
+            # Solicita al usuario la primera fila del rango a mostrar
+            fila_desde = input("Ingrese la primera fila que desea ver: ")
 
-            return asiento_elegido
+            # Valida que la fila ingresada sea un número y esté dentro del rango permitido
+            while (not fila_desde.isnumeric()) or (not int(fila_desde) in range(1, mapa.cantidad_filas()+1)):
+                print("\nDato invalida")
+                fila_desde = input("Ingrese la primera fila que desea ver: ")
 
-        else:
-            # Muestra el mapa de asientos de la zona VIP
-            print(estadio.mostrar_mapa_vip())
-            
-            # Solicita al usuario que ingrese la fila deseada
+            # Solicita al usuario la última fila del rango a mostrar
+            fila_hasta = input("Ingrese la ultima fila que desea ver: ")
+
+            # Valida que la fila ingresada sea un número, no sea menor que la primera y no se pase del máximo por página
+            while (not fila_hasta.isnumeric()) or (not int(fila_hasta) in range(int(fila_desde), min(int(fila_desde) + self.FILAS_POR_PAGINA, mapa.cantidad_filas()+1))):
+                print(f"\nDato invalida. Se pueden ver hasta {self.FILAS_POR_PAGINA} filas a la vez.")
+                fila_hasta = input("Ingrese la ultima fila que desea ver: ")
+
+            print(partido.mostrar_mapa(tipo_entrada, int(fila_desde) - 1, int(fila_hasta)))
+
+        # Solicita al usuario que ingrese la fila deseada
+        opcion_fila = input("Ingrese la fila en la que desea sentarse: ")
+        
+        # Valida que la fila ingresada sea un número y esté dentro del rango permitido, y que la fila no esté llena
+        while (not opcion_fila.isnumeric()) or (not int(opcion_fila) in range(1, mapa.cantidad_filas()+1)) or(partido.verificar_fila_llena(int(opcion_fila)-1, tipo_entrada)):
+            print("\nDato invalida")
             opcion_fila = input("Ingrese la fila en la que desea sentarse: ")
-            
-            # Valida que la fila ingresada sea un número y esté dentro del rango permitido, y que la fila no esté llena
-            while (not opcion_fila.isnumeric()) or (not int(opcion_fila) in range(1, len(estadio.mapaVip)+1)) or(estadio.verificar_fila_llena(int(opcion_fila)-1, tipo_entrada)):
-                print("\nDato invalida")
-                opcion_fila = input("Ingrese la fila en la que desea sentarse: ")
 
-            index_fila = int(opcion_fila) - 1
+        index_fila = int(opcion_fila) - 1
 
-            # Solicita al usuario que ingrese el número del asiento deseado
+        # Solicita al usuario que ingrese el número del asiento deseado
+        opcion_asiento = input("Ingrese el numero del asiento donde desea sentarse: ")
+        
+        # Valida que el número del asiento ingresado sea un número y esté dentro del rango permitido, y lo ocupa solo si sigue libre
+        while (not opcion_asiento.isnumeric()) or (not int(opcion_asiento) in range(1, mapa.largo_fila(index_fila)+1)) or (not self.motor_ventas.reclamar_asiento(partido, index_fila, int(opcion_asiento)-1, tipo_entrada)):
+            print("\nDato invalida")
             opcion_asiento = input("Ingrese el numero del asiento donde desea sentarse: ")
-            
-            # Valida que el número del asiento ingresado sea un número y esté dentro del rango permitido, y que el asiento no esté ocupado
-            while (not opcion_asiento.isnumeric()) or (not int(opcion_asiento) in range(1, len(estadio.mapaVip[index_fila])+1)) or (estadio.asiento_ocupado(index_fila, int(opcion_asiento)-1, tipo_entrada)):
-                print("\nDato invalida")
-                opcion_asiento = input("Ingrese el numero del asiento donde desea sentarse: ")
-
-            index_asiento = int(opcion_asiento) -  1
 
-            # Marca el asiento como ocupado
-            estadio.ocupar_asiento(index_fila, index_asiento, tipo_entrada)
+        # Reserva el asiento hasta que se confirme o abandone el pago
+        reserva = self.gestor_reservas.reservar(partido, index_fila, int(opcion_asiento) - 1, tipo_entrada)
 
-            # Devuelve la fila y el asiento seleccionados
-            asiento_elegido = [int(opcion_fila), int(opcion_asiento)]
+        # Devuelve la fila y el asiento seleccionados, con el número de la reserva
+        asiento_elegido = [int(opcion_fila), int(opcion_asiento)]
 
-            return asiento_elegido
+        return asiento_elegido, reserva
 
         
     def es_vampiro(self, numero_str):
@@ -514,40 +705,72 @@ class App:
         los mismos dígitos que el número original y, al multiplicarse, producen el número original.
         Los colmillos no deben tener ceros finales a menos que el número original también los tenga.
 
+        En lugar de probar todos los pares de colmillos, solo se prueban los divisores reales del número
+        que caen en la banda de magnitud correcta (desde numero / max_colmillo hasta la raíz cuadrada).
+        Si existe la tabla precalculada (vampiros.bin) y cubre la cédula, se resuelve con una búsqueda binaria.
+        El resultado se memoriza por cédula.
+
         Args:
         numero_str (str): El número en formato de cadena.
 
         Returns:
         bool: True si el número es vampiro, False en caso contrario.
         """
+        # Devuelve el resultado memorizado si la cédula ya fue evaluada
+        if numero_str in self.memo_vampiros:
+            return self.memo_vampiros[numero_str]
+
+        # Busca la cédula en la tabla precalculada si está disponible
+        if self.tabla_vampiros is not None:
+            resultado = self.tabla_vampiros.contiene(numero_str)
+            if resultado is not None:
+                self.memo_vampiros[numero_str] = resultado
+                return resultado
+
+        resultado = False
+
         # Verifica que el número tenga una longitud par
-        if len(numero_str) % 2 != 0:
-            return False
+        if len(numero_str) % 2 == 0:
+            # Convierte el número de cadena a entero
+            numero = int(numero_str)
+            digitos = sorted(numero_str)
 
-        # Convierte el número de cadena a entero
-        numero = int(numero_str)
-        
-        # Calcula la longitud de los colmillos
-        len_colmillos = len(numero_str) // 2
+            # Calcula la longitud de los colmillos
+            len_colmillos = len(numero_str) // 2
+
+            # Genera los límites para los colmillos
+            min_colmillo = 10**(len_colmillos - 1)
+            max_colmillo = 10**len_colmillos - 1
+
+            # Como colmillo1 <= colmillo2 <= max_colmillo, colmillo1 va desde numero / max_colmillo hasta la raíz
+            inicio = max(min_colmillo, -(-numero // max_colmillo))
+            fin = min(math.isqrt(numero), max_colmillo)
+
+            # La suma de los colmillos y el número deben coincidir módulo 9 (misma suma de dígitos)
+            resto_nueve = numero % 9
 
-        # Genera los límites para los colmillos
-        min_colmillo = 10**(len_colmillos - 1)
-        max_colmillo = 10**len_colmillos
+            # Itera solo sobre los divisores en la banda de magnitud de los colmillos
+            for colmillo1 in range(inicio, fin + 1):
+                if numero % colmillo1 != 0:
+                    continue
+
+                colmillo2 = numero // colmillo1
 
-        # Itera sobre los posibles colmillos
-        for colmillo1 in range(min_colmillo, max_colmillo):
-            for colmillo2 in range(colmillo1, max_colmillo):
                 # Evita colmillos con ceros finales
-                if (colmillo1 % 10 == 0 and colmillo2 % 10 == 0):
+                if colmillo1 % 10 == 0 and colmillo2 % 10 == 0:
+                    continue
+
+                # Descarta pares cuya suma de dígitos no puede coincidir con la del número
+                if (colmillo1 + colmillo2) % 9 != resto_nueve:
                     continue
 
-                # Verifica si el producto de los colmillos es igual al número original
-                if colmillo1 * colmillo2 == numero:
-                    # Verifica que los dígitos de los colmillos coincidan con los del número original
-                    if sorted(str(colmillo1) + str(colmillo2)) == sorted(numero_str):
-                        return True
+                # Verifica que los dígitos de los colmillos coincidan con los del número original
+                if sorted(str(colmillo1) + str(colmillo2)) == digitos:
+                    resultado = True
+                    break
 
-        return False
+        self.memo_vampiros[numero_str] = resultado
+        return resultado
     
 
     def descuento_entrada(self, cliente, subtotal):
@@ -561,8 +784,12 @@ class App:
         Returns:
             float: El monto del descuento aplicado. Si el cliente es un vampiro, el descuento es del 50% del subtotal.
         """
+        # Evalúa la cédula solo si no se calculó al registrar o cargar al cliente
+        if cliente.vampiro is None:
+            cliente.vampiro = self.es_vampiro(cliente.cedula)
+
         # Verifica si el cliente es un vampiro basado en su cédula
-        if self.es_vampiro(cliente.cedula):
+        if cliente.vampiro:
             # Calcula el 50% de descuento si el cliente es un vampiro
             descuento = 0.50 * subtotal
             return descuento
@@ -572,7 +799,7 @@ class App:
 
     def buscar_ci(self, cedula):
         """
-        Busca un cliente por su cédula en la lista de clientes.
+        Busca un cliente por su cédula en el índice de clientes.
 
         Args:
             cedula (str): La cédula del cliente a buscar.
@@ -580,14 +807,106 @@ class App:
         Returns:
             Cliente: El cliente con la cédula especificada, o None si no se encuentra.
         """
-        # Itera sobre la lista de clientes para encontrar el cliente con la cédula dada
-        for cliente in self.clientes:
-            if cliente.cedula == cedula:
-                return cliente
-        return None
+        return self.clientes_ci.get(cedula)
+
+    def agregar_cliente(self, cliente):
+        """
+        Añade un cliente a la lista de clientes y al índice por cédula.
+
+        Si la cédula ya estaba en el índice se conserva el primer cliente registrado con ella.
+
+        Args:
+            cliente (Cliente): El cliente a añadir.
+        """
+        self.clientes.append(cliente)
+        if cliente.cedula not in self.clientes_ci:
+            self.clientes_ci[cliente.cedula] = cliente
 
     
 
+    def evaluar_descuentos(self, cliente):
+        """
+        Calcula una sola vez si la cédula del cliente le da derecho a los descuentos de entrada y de restaurante.
+
+        Args:
+            cliente (Cliente): El cliente cuya cédula se va a evaluar.
+        """
+        if cliente.vampiro is None:
+            cliente.vampiro = self.es_vampiro(cliente.cedula)
+        if cliente.perfecto is None:
+            cliente.perfecto = self.es_perfecto(cliente.cedula)
+
+    def evaluar_descuentos_clientes(self, clientes):
+        """
+        Calcula los descuentos de una lista de clientes que aún no los tienen evaluados.
+
+        Si la cantidad de clientes pendientes supera UMBRAL_PROCESOS, las cédulas se reparten
+        en bloques entre un grupo de procesos.
+
+        Args:
+            clientes (list): Lista de clientes a evaluar.
+        """
+        pendientes = []
+        for cliente in clientes:
+            if cliente.vampiro is None or cliente.perfecto is None:
+                pendientes.append(cliente)
+
+        if len(pendientes) < self.UMBRAL_PROCESOS:
+            for cliente in pendientes:
+                self.evaluar_descuentos(cliente)
+            return
+
+        # Divide las cédulas en bloques para reducir la comunicación entre procesos
+        tamano_bloque = 2000
+        bloques = []
+        for i in range(0, len(pendientes), tamano_bloque):
+            bloques.append([cliente.cedula for cliente in pendientes[i:i + tamano_bloque]])
+
+        with ProcessPoolExecutor() as pool:
+            posicion = 0
+            for resultados in pool.map(evaluar_cedulas, bloques):
+                for vampiro, perfecto in resultados:
+                    pendientes[posicion].vampiro = vampiro
+                    pendientes[posicion].perfecto = perfecto
+                    posicion += 1
+
+    def nombre_valido(self, nombre):
+        """
+        Verifica que un nombre de cliente sea alfabético y tenga al menos 2 caracteres.
+
+        Args:
+            nombre (str): El nombre del cliente.
+
+        Returns:
+            bool: True si el nombre es válido, False de lo contrario.
+        """
+        return nombre.isalpha() and len(nombre) >= 2
+
+    def cedula_valida(self, cedula):
+        """
+        Verifica que una cédula tenga solo dígitos del 0 al 9 y al menos 6 de ellos. No basta con isnumeric, que
+        acepta caracteres como "²" o "½" con los que después falla int.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            bool: True si la cédula es válida, False de lo contrario.
+        """
+        return cedula.isascii() and cedula.isdecimal() and len(cedula) >= 6
+
+    def edad_valida(self, edad):
+        """
+        Verifica que una edad tenga solo dígitos del 0 al 9 y esté entre 1 y 119 años.
+
+        Args:
+            edad (str): La edad del cliente.
+
+        Returns:
+            bool: True si la edad es válida, False de lo contrario.
+        """
+        return edad.isascii() and edad.isdecimal() and int(edad) in range(1, 120)
+
     def registrar_cliente(self):
         """
         Registra un nuevo cliente en la lista de clientes de la aplicación.
@@ -602,7 +921,7 @@ class App:
         nombre = input("\nIngrese el nombre del cliente: ")
         
         # Valida que el nombre ingresado sea alfabético y tenga al menos 2 caracteres
-        while (not nombre.isalpha()) or (not len(nombre) >= 2):
+        while not self.nombre_valido(nombre):
             print("Ingrese un nombre valido")
             nombre = input("Ingrese el nombre del cliente: ")
             
@@ -610,7 +929,7 @@ class App:
         cedula = input("Ingrese la cedula del cliente: ")
         
         # Valida que la cédula ingresada sea numérica, tenga al menos 6 caracteres y que no esté ya registrada
-        while (not cedula.isnumeric()) or (not len(cedula) >= 6) or (self.buscar_ci(cedula) != None):
+        while (not self.cedula_valida(cedula)) or (self.buscar_ci(cedula) != None):
             print("Ingrese una cedula invalida")
             cedula = input("Ingrese la cedula del cliente: ")
 
@@ -618,19 +937,93 @@ class App:
         edad = input("Ingrese la edad del cliente: ")
         
         # Valida que la edad ingresada sea numérica y esté en el rango permitido (1 a 119 años)
-        while (not edad.isnumeric()) or (not int(edad) in range(1, 120)):
+        while not self.edad_valida(edad):
             print("Ingrese una edad valida (entre 1 y 119)")
             edad = input("Ingrese la edad del cliente: ")
         
         # Crea una instancia de la clase Cliente con los datos ingresados
         cliente = Cliente(nombre, cedula, int(edad))
+
+        # Calcula los descuentos del cliente una sola vez al registrarlo
+        self.evaluar_descuentos(cliente)
         
         # Añade el nuevo cliente a la lista de clientes de la aplicación
-        self.clientes.append(cliente)
+        self.agregar_cliente(cliente)
+        self.persistir("cliente", cliente.diccionario())
         
         # Devuelve la instancia del cliente registrado
         return cliente
 
+    def importar_clientes(self, ruta, ruta_rechazos=None):
+        """
+        Importa clientes desde un archivo CSV o JSONL con los campos nombre, cedula y edad.
+
+        El archivo se lee fila por fila y los rechazos se escriben a medida que aparecen, por lo que la memoria usada no
+        depende del tamaño del archivo (más allá de los clientes importados). Se aplican las mismas reglas que en
+        registrar_cliente y las cédulas repetidas, ya registradas o dentro del mismo archivo, se descartan con el
+        índice clientes_ci. Los descuentos se calculan por bloques de UMBRAL_PROCESOS clientes.
+
+        Args:
+            ruta (str): La ruta del archivo. Si termina en .csv debe tener encabezado; si no, se lee como JSONL.
+            ruta_rechazos (str): La ruta del archivo JSONL de rechazos, o None para usar <archivo>_rechazos.jsonl.
+
+        Returns:
+            tuple: La cantidad de clientes importados y la cantidad de filas rechazadas.
+        """
+        if ruta_rechazos is None:
+            ruta_rechazos = os.path.splitext(ruta)[0] + "_rechazos.jsonl"
+
+        importados = 0
+        rechazados = 0
+        bloque = []
+
+        with open(ruta, "r", encoding="utf-8", newline="") as archivo, open(ruta_rechazos, "w", encoding="utf-8") as rechazos:
+            if ruta.lower().endswith(".csv"):
+                filas = csv.DictReader(archivo)
+            else:
+                filas = (linea.strip() for linea in archivo if linea.strip())
+
+            for numero_fila, fila in enumerate(filas, start=1):
+                motivo = None
+                try:
+                    if isinstance(fila, str):
+                        fila = json.loads(fila)
+                    nombre = str(fila["nombre"]).strip()
+                    cedula = str(fila["cedula"]).strip()
+                    edad = str(fila["edad"]).strip()
+                except (ValueError, KeyError, TypeError) as error:
+                    motivo = f"Fila mal formada: {error}"
+
+                if motivo is None:
+                    if not self.nombre_valido(nombre):
+                        motivo = "Nombre invalido"
+                    elif not self.cedula_valida(cedula):
+                        motivo = "Cedula invalida"
+                    elif cedula in self.clientes_ci:
+                        motivo = "Cedula ya registrada"
+                    elif not self.edad_valida(edad):
+                        motivo = "Edad invalida"
+
+                if motivo is not None:
+                    rechazos.write(json.dumps({"fila": numero_fila, "motivo": motivo, "datos": fila}, default=str) + "\n")
+                    rechazados += 1
+                    continue
+
+                cliente = Cliente(nombre, cedula, int(edad))
+                self.agregar_cliente(cliente)
+                bloque.append(cliente)
+                importados += 1
+
+                if len(bloque) == self.UMBRAL_PROCESOS:
+                    self.evaluar_descuentos_clientes(bloque)
+                    self.persistir("clientes", [cliente.diccionario() for cliente in bloque])
+                    bloque = []
+
+        self.evaluar_descuentos_clientes(bloque)
+        if len(bloque) > 0:
+            self.persistir("clientes", [cliente.diccionario() for cliente in bloque])
+        return importados, rechazados
+
     def gestion_entradas(self):
         """
         Módulo de gestión de entradas que permite registrar clientes, verificar clientes registrados y comprar entradas para partidos.
@@ -641,13 +1034,13 @@ class App:
             print("==============================")
 
             # Muestra las opciones del menú de gestión de entradas
-            print("1. Registrar Cliente\n2. Cliente ya Registrado\n3. Salir")
+            print("1. Registrar Cliente\n2. Cliente ya Registrado\n3. Importar Clientes\n4. Salir")
             
             # Solicita al usuario que ingrese una opción del menú
             opcion_cliente = input("Ingrese la opcion que desea: ")
             
             # Valida que la opción ingresada sea un número y esté dentro del rango permitido
-            while (not opcion_cliente.isnumeric()) or (not int(opcion_cliente) in range(1, 4)):
+            while (not opcion_cliente.isnumeric()) or (not int(opcion_cliente) in range(1, 5)):
                 print("\nError. Opcion Invalida.")
                 opcion_cliente = input("Ingrese la opcion que desea: ")
 
@@ -665,7 +1058,8 @@ class App:
                     cedula = input("Ingrese la cedula del cliente: ")
                 
                 # Si el cliente no está registrado, ofrece la opción de registrarlo
-                if self.buscar_ci(cedula) == None:
+                cliente = self.buscar_ci(cedula)
+                if cliente == None:
                     print("\nCliente no registrado.")
                     print("\n1. Deseas registrar al cliente.\n2. Salir")
 
@@ -683,8 +1077,19 @@ class App:
                     else:
                         print("\nHaz Salido del Modulo Gestion de Entradas")
                         break
-                else:
-                    cliente = self.buscar_ci(cedula)
+            elif opcion_cliente == "3":
+                # Importa clientes desde un archivo CSV o JSONL
+                ruta = input("\nIngrese la ruta del archivo de clientes (.csv o .jsonl): ")
+
+                if not os.path.exists(ruta):
+                    print(f"\nError: El archivo {ruta} no se encontró.")
+                    continue
+
+                importados, rechazados = self.importar_clientes(ruta)
+                print(f"\n{importados} clientes importados, {rechazados} filas rechazadas.")
+                if rechazados > 0:
+                    print(f"Los rechazos se guardaron en {os.path.splitext(ruta)[0]}_rechazos.jsonl")
+                continue
             else:
                 print("\nHaz Salido del Modulo Gestion de Entradas")
                 break
@@ -692,37 +1097,50 @@ class App:
             print(f"\nDatos del Cliente:\n{cliente.mostrar_atributos()}")
 
             print("\n==========================================\n")
+            # Filtra los partidos agotados usando los contadores de asientos libres
+            partidos_disponibles = []
+            for partido in self.partidos:
+                if not partido.agotado():
+                    partidos_disponibles.append(partido)
+
+            if len(partidos_disponibles) == 0:
+                print("\nNo quedan entradas disponibles para ningun partido.\n")
+                break
+
             # Muestra la lista de partidos disponibles
-            for i in range(len(self.partidos)):
-                print(f"{i+1}.\n{self.partidos[i].mostrar()}")
+            for i in range(len(partidos_disponibles)):
+                print(f"{i+1}.\n{partidos_disponibles[i].mostrar()}")
             
             # Solicita al usuario que seleccione un partido
             opcion_partido = input("Ingresa el numero de partido al que quieres asistir: ")
             
             # Valida que la opción de partido ingresada sea un número y esté dentro del rango permitido
-            while (not opcion_partido.isnumeric()) or (not int(opcion_partido) in range(1, len(self.partidos)+1)):
+            while (not opcion_partido.isnumeric()) or (not int(opcion_partido) in range(1, len(partidos_disponibles)+1)):
                 print("\nError. Opcion Invalida.")
                 opcion_partido = input("Ingresa el numero de partido al que quieres asistir: ")
 
             index_partido = int(opcion_partido) - 1
-            partido_elegido = self.partidos[index_partido]
+            partido_elegido = partidos_disponibles[index_partido]
 
-            print("1. General\n2. Vip\n")
+            print(f"1. General ({partido_elegido.asientos_libres('General')} libres)\n2. Vip ({partido_elegido.asientos_libres('VIP')} libres)\n")
 
             # Solicita al usuario que seleccione el tipo de entrada
             opcion_tipo_entrada = input("Ingrese el tipo de entrada que desea comprar: ")
             
-            # Valida que la opción de tipo de entrada ingresada sea un número y esté dentro del rango permitido
-            while (not opcion_tipo_entrada.isnumeric()) or (not int(opcion_tipo_entrada) in range(1, 3)):
+            # Valida que la opción de tipo de entrada ingresada sea un número, esté dentro del rango permitido y que la zona no esté agotada
+            while (not opcion_tipo_entrada.isnumeric()) or (not int(opcion_tipo_entrada) in range(1, 3)) or (partido_elegido.zona_agotada(["General", "VIP"][int(opcion_tipo_entrada) - 1])):
                 print("\nError. Opcion Invalida.")
                 opcion_tipo_entrada = input("Ingrese el tipo de entrada que desea comprar: ")
             
             if opcion_tipo_entrada == "1":
                 tipo_entrada = "General"
-                subtotal = 35
+                subtotal = self.PRECIOS_ENTRADA[tipo_entrada]
                 
                 # Selecciona un asiento en la zona general
-                asiento_elegido = self.seleccionar_asiento(tipo_entrada, partido_elegido.estadio)
+                seleccion = self.seleccionar_asiento(tipo_entrada, partido_elegido)
+                if seleccion is None:
+                    continue
+                asiento_elegido, reserva = seleccion
                 
                 # Calcula el descuento para la entrada
                 descuento = self.descuento_entrada(cliente, subtotal)
@@ -758,24 +1176,33 @@ class App:
                     print("\nError. Opcion Invalida.")
                     opcion_pago = input("Ingrese el numero correspondiente a la accion que desea realizar: ")
                 
+                fila = asiento_elegido[0] - 1
+                asiento = asiento_elegido[1] - 1
+
                 if opcion_pago == "1":
+                    # La compra solo se completa si la reserva del asiento no ha vencido
+                    if not self.gestor_reservas.confirmar(partido_elegido, fila, asiento, tipo_entrada, reserva):
+                        print("\nLa reserva del asiento vencio. Vuelva a seleccionar el asiento.")
+                        continue
+
                     asistencia = False
-                    id = len(self.entradas) + 1
+                    id = self.motor_ventas.nuevo_id()
                     entrada = Entrada(id, cliente, partido_elegido, tipo_entrada, asiento_elegido, subtotal,descuento, total_descuento, iva, total_pagar, asistencia)
-                    self.entradas.append(entrada)
+                    self.motor_ventas.registrar_entrada(entrada)
                     print("\nEntrada Comprada con Exito.\n")
                     break
                 else:
-                    fila = asiento_elegido[0] - 1
-                    asiento = asiento_elegido[1] - 1
-                    partido_elegido.estadio.mapaGnral[fila][asiento] = str(asiento + 1)
+                    self.gestor_reservas.liberar(partido_elegido, fila, asiento, tipo_entrada, reserva)
                     print("\nUsted ha abandonado la compra de la entrada.")
             else:
                 tipo_entrada = "VIP"
-                subtotal = 75  
+                subtotal = self.PRECIOS_ENTRADA[tipo_entrada]
                 
                 # Selecciona un asiento en la zona VIP
-                asiento_elegido = self.seleccionar_asiento(tipo_entrada, partido_elegido.estadio)
+                seleccion = self.seleccionar_asiento(tipo_entrada, partido_elegido)
+                if seleccion is None:
+                    continue
+                asiento_elegido, reserva = seleccion
                 descuento = self.descuento_entrada(cliente, subtotal)
                 
                 if descuento == 0:
@@ -809,20 +1236,107 @@ class App:
                     print("\nError. Opcion Invalida.")
                     opcion_pago = input("Ingrese el numero correspondiente a la accion que desea realizar: ")
                 
+                fila = asiento_elegido[0] - 1
+                asiento = asiento_elegido[1] - 1
+
                 if opcion_pago == "1":
+                    # La compra solo se completa si la reserva del asiento no ha vencido
+                    if not self.gestor_reservas.confirmar(partido_elegido, fila, asiento, tipo_entrada, reserva):
+                        print("\nLa reserva del asiento vencio. Vuelva a seleccionar el asiento.")
+                        continue
+
                     asistencia = False
-                    id = len(self.entradas) + 1
+                    id = self.motor_ventas.nuevo_id()
                     entrada = Entrada(id, cliente, partido_elegido, tipo_entrada, asiento_elegido, subtotal, descuento, total_descuento, iva, total_pagar, asistencia)
-                    self.entradas.append(entrada)
+                    self.motor_ventas.registrar_entrada(entrada)
                     print("\nEntrada Comprada con Exito.\n")
                     break
                 else:
-                    fila = asiento_elegido[0] - 1
-                    asiento = asiento_elegido[1] - 1
-                    partido_elegido.estadio.mapaVip[fila][asiento] = str(asiento + 1)
+                    self.gestor_reservas.liberar(partido_elegido, fila, asiento, tipo_entrada, reserva)
                     print("\nUsted ha abandonado la compra de la entrada.") 
 
 
+    def agregar_entrada(self, entrada):
+        """
+        Añade una entrada a la lista de entradas y a sus índices.
+
+        Args:
+            entrada (Entrada): La entrada a añadir.
+        """
+        if self.almacen_ventas() is None:
+            self.entradas.append(entrada)
+        self.registro_entradas.agregar(entrada)
+
+    def agregar_entradas(self, entradas):
+        """
+        Añade un lote de entradas a la lista de entradas y a sus índices.
+
+        Args:
+            entradas (list): Las entradas a añadir.
+        """
+        if self.almacen_ventas() is None:
+            self.entradas.extend(entradas)
+        for entrada in entradas:
+            self.registro_entradas.agregar(entrada)
+
+    def comprar_entradas(self, cedula, partido_id, tipo_entrada, cantidad=None, asientos=None):
+        """
+        Compra un lote de entradas para un cliente sin pedir datos por consola.
+
+        Se indica la cantidad de entradas, y los asientos se asignan juntos en lo posible, o la lista exacta de asientos.
+        El descuento, el IVA y los identificadores se calculan una sola vez para todo el lote, y los asientos se ocupan
+        todos o ninguno.
+
+        Args:
+            cedula (str): La cédula del cliente registrado.
+            partido_id (str): El id del partido.
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+            cantidad (int): La cantidad de entradas, o None si se dan los asientos.
+            asientos (list): Los asientos como [fila, asiento] (ambos desde 1), o None si se da la cantidad.
+
+        Returns:
+            list: Las entradas compradas.
+
+        Raises:
+            ValueError: Si algún dato no es válido o no hay asientos disponibles para todo el lote.
+        """
+        cliente = self.buscar_ci(cedula)
+        if cliente is None:
+            raise ValueError(f"No hay ningun cliente registrado con la cedula {cedula}")
+
+        partido = self.buscar_partido_id(partido_id)
+        if partido is None:
+            raise ValueError(f"No existe el partido {partido_id}")
+
+        if tipo_entrada not in self.PRECIOS_ENTRADA:
+            raise ValueError(f"Tipo de entrada invalido: {tipo_entrada}")
+
+        if (cantidad is None) == (asientos is None):
+            raise ValueError("Se debe indicar la cantidad de entradas o la lista de asientos, no ambas")
+
+        if cantidad is not None and cantidad <= 0:
+            raise ValueError("La cantidad de entradas debe ser mayor que cero")
+
+        if asientos is not None and len(asientos) == 0:
+            raise ValueError("La lista de asientos esta vacia")
+
+        # Calcula el precio una sola vez, ya que es igual para todas las entradas del lote
+        subtotal = self.PRECIOS_ENTRADA[tipo_entrada]
+        descuento = self.descuento_entrada(cliente, subtotal)
+        total_descuento = subtotal - descuento
+        iva = total_descuento * 0.16
+        total_pagar = total_descuento + iva
+
+        asignados = self.motor_ventas.reclamar_lote(partido, tipo_entrada, cantidad, asientos)
+        ids = self.motor_ventas.nuevos_ids(len(asignados))
+
+        entradas = []
+        for id, asiento in zip(ids, asignados):
+            entradas.append(Entrada(id, cliente, partido, tipo_entrada, asiento, subtotal, descuento, total_descuento, iva, total_pagar, False))
+
+        self.motor_ventas.registrar_entradas(entradas)
+        return entradas
+
     def buscar_entradas_cliente(self, cliente):
         """
         Busca todas las entradas no usadas (sin asistencia) de un cliente específico.
@@ -833,14 +1347,7 @@ class App:
         Returns:
             list: Una lista de entradas no usadas del cliente.
         """
-        entradas_cliente = []
-        
-        # Itera sobre la lista de entradas para encontrar las entradas del cliente que no han sido usadas
-        for entrada in self.entradas:
-            if entrada.cliente.cedula == cliente.cedula and not entrada.asistencia:
-                entradas_cliente.append(entrada)
-        
-        return entradas_cliente
+        return self.registro_entradas.pendientes_cliente(cliente.cedula)
 
     def existe_entrada(self, id):
         """
@@ -852,12 +1359,7 @@ class App:
         Returns:
             bool: True si la entrada existe, False de lo contrario.
         """
-        # Itera sobre la lista de entradas para encontrar la entrada con el ID dado
-        for entrada in self.entradas:
-            if entrada.id == id:
-                return True
-        
-        return False
+        return self.registro_entradas.existe(id)
 
     def asistir_partido(self, id):
         """
@@ -866,11 +1368,10 @@ class App:
         Args:
             id (int): El identificador de la entrada a marcar como usada.
         """
-        # Itera sobre la lista de entradas para encontrar la entrada con el ID dado
-        for entrada in self.entradas:
-            if entrada.id == id:
-                entrada.asistencia = True
-                print("\nLa entrada ha sido confirmada.\n")
+        # Marca la entrada como usada y actualiza los índices de asistencia
+        if self.registro_entradas.confirmar_asistencia(id) != None:
+            self.persistir("asistencia", {"id": id})
+            print("\nLa entrada ha sido confirmada.\n")
 
     def confirmar_asistencia(self):
         """
@@ -887,8 +1388,8 @@ class App:
             cedula = input("Ingrese la cedula del cliente: ")
 
         # Verifica si el cliente está registrado en el sistema
-        if self.buscar_ci(cedula) != None:
-            cliente = self.buscar_ci(cedula)
+        cliente = self.buscar_ci(cedula)
+        if cliente != None:
 
             # Verifica si el cliente tiene entradas no usadas
             if len(self.buscar_entradas_cliente(cliente)) != 0:
@@ -902,7 +1403,7 @@ class App:
                 opcion_id = input("Ingresa el id de la entrada que quiere confirmar: ")
                 
                 # Valida que el ID ingresado sea numérico, esté dentro del rango permitido y exista en el sistema
-                while (not opcion_id.isnumeric()) or (not int(opcion_id) in range(1, len(self.entradas)+1)) or (not self.existe_entrada(int(opcion_id))):
+                while (not opcion_id.isnumeric()) or (not self.existe_entrada(int(opcion_id))):
                     print("\nError. Opcion Invalida.")
                     opcion_id = input("Ingresa el id de la entrada que quiere confirmar: ")
                 
@@ -1281,11 +1782,7 @@ class App:
         Returns:
             Entrada: La entrada con el ID especificado, o None si no se encuentra.
         """
-        # Itera sobre la lista de entradas para encontrar la entrada con el ID dado
-        for entrada in self.entradas:
-            if entrada.id == id:
-                return entrada
-        return None
+        return self.registro_entradas.buscar(id)
 
     def partidos_asistidos(self, cliente):
         """
@@ -1297,20 +1794,56 @@ class App:
         Returns:
             list: Una lista de entradas asistidas del cliente.
         """
-        entradas_asistidas = []
-        
-        # Itera sobre la lista de entradas para encontrar las entradas asistidas del cliente
-        for entrada in self.entradas:
-            if cliente.cedula == entrada.cliente.cedula and entrada.asistencia:
-                entradas_asistidas.append(entrada)
-        
-        return entradas_asistidas
+        return self.registro_entradas.asistidas_cliente(cliente.cedula)
+
+    def es_perfecto(self, numero_str):
+        """
+        Verifica si un número dado en formato de cadena es un número perfecto.
+
+        Todo número perfecto par tiene la forma de Euclides-Euler 2^(p-1) * (2^p - 1) con 2^p - 1 primo,
+        por lo que los pares se resuelven con la tabla NUMEROS_PERFECTOS y los impares con la cota conocida
+        de 10^1500. Solo fuera de esos rangos se suman los divisores hasta la raíz cuadrada del número.
+
+        Args:
+            numero_str (str): El número en formato de cadena.
+
+        Returns:
+            bool: True si el número es perfecto, False de lo contrario.
+        """
+        numero = int(numero_str)
+
+        # Verifica si el número está en la tabla de perfectos de Euclides-Euler
+        if numero in self.NUMEROS_PERFECTOS:
+            return True
+
+        # Ningún par dentro del rango de la tabla es perfecto si no está en ella
+        if numero % 2 == 0 and numero <= self.NUMEROS_PERFECTOS[-1]:
+            return False
+
+        # Está demostrado que no existen números perfectos impares menores que 10^1500
+        if numero % 2 != 0 and numero < 10**1500:
+            return False
+
+        if numero < 2:
+            return False
+
+        # Suma los divisores en parejas (i, numero // i) hasta la raíz cuadrada
+        suma_divisores = 1
+        paso = 1 if numero % 2 == 0 else 2
+        for i in range(2 if paso == 1 else 3, math.isqrt(numero) + 1, paso):
+            if numero % i == 0:
+                suma_divisores += i
+                if numero // i != i:
+                    suma_divisores += numero // i
+
+        return suma_divisores == numero
 
     def numero_perfecto(self, cliente):
         """
         Verifica si la cédula del cliente es un número perfecto.
 
         Un número perfecto es un número entero positivo que es igual a la suma de sus divisores propios positivos, excluyendo el propio número.
+        El resultado se guarda en el cliente para no volver a evaluarlo.
 
         Args:
             cliente (Cliente): El cliente cuya cédula se va a verificar.
@@ -1318,20 +1851,11 @@ class App:
         Returns:
             bool: True si la cédula del cliente es un número perfecto, False de lo contrario.
         """
-        divisores = []
-        
-        # Encuentra todos los divisores de la cédula del cliente
-        for i in range(1, int(cliente.cedula)):
-            if int(cliente.cedula) % i == 0:
-                divisores.append(i)
-        
-        suma_divisores = sum(divisores)
+        # Evalúa la cédula solo la primera vez
+        if cliente.perfecto is None:
+            cliente.perfecto = self.es_perfecto(cliente.cedula)
 
-        # Verifica si la suma de los divisores es igual a la cédula
-        if suma_divisores == int(cliente.cedula):
-            return True
-        else:
-            return False
+        return cliente.perfecto
 
     
     def descuento_compra_restaurant(self, cliente, subtotal):
@@ -1394,8 +1918,8 @@ class App:
             cedula = input("Ingrese la cedula del cliente: ")
 
         # Verifica si el cliente está registrado en el sistema
-        if self.buscar_ci(cedula) != None:
-            cliente = self.buscar_ci(cedula)
+        cliente = self.buscar_ci(cedula)
+        if cliente != None:
 
             # Verifica si el cliente tiene entradas asistidas
             if len(self.partidos_asistidos(cliente)) != 0:
@@ -1409,7 +1933,7 @@ class App:
                 opcion_id = input("Ingresa el id de una de sus entradas para realizar la compra: ")
                 
                 # Valida que el ID ingresado sea numérico, esté dentro del rango permitido y exista en el sistema
-                while (not opcion_id.isnumeric()) or (not int(opcion_id) in range(1, len(self.entradas)+1)) or (not self.existe_entrada(int(opcion_id))):
+                while (not opcion_id.isnumeric()) or (not self.existe_entrada(int(opcion_id))):
                     print("\nError. Opcion Invalida.")
                     opcion_id = input("Ingresa el id de una de sus entradas para realizar la compra: ")
                 
@@ -1531,12 +2055,17 @@ class App:
                     if int(opcion_pago) == 1:
                         # Crea una instancia de Factura con los detalles de la compra
                         factura = Factura(cliente, partido_elegido, restaurant_elegido, detalle_productos, subtotal, descuento, total)
-                        
-                        # Resta el stock de los productos comprados
-                        self.restar_stock(factura)
-                        
-                        # Añade la factura a la lista de facturas
-                        self.facturas.append(factura)
+
+                        # La factura no se puede reproducir dos veces, así que no debe quedar partida por un guardado
+                        with self.candado_cambios:
+                            # Resta el stock de los productos comprados
+                            self.restar_stock(factura)
+
+                            # Añade la factura a la lista de facturas
+                            self.agregar_factura(factura)
+
+                            # La factura se guarda en el diario junto con la resta de stock que la acompaña
+                            self.persistir("factura", factura.diccionario())
                         print("\nGracias por su compra.\n")
                     else:
                         print("\nLa compra ha sido cancelada.\n")
@@ -1601,15 +2130,14 @@ class App:
         """
         total_gastos = 0
 
-        # Itera sobre la lista de entradas para sumar los gastos en entradas VIP del cliente
-        for entrada in self.entradas:
-            if entrada.cliente.cedula == cliente.cedula and entrada.tipo_entrada == "VIP":
+        # Itera sobre las entradas del cliente para sumar los gastos en entradas VIP
+        for entrada in self.registro_entradas.entradas_cliente(cliente.cedula):
+            if entrada.tipo_entrada == "VIP":
                 total_gastos += entrada.total
         
-        # Itera sobre la lista de facturas para sumar los gastos en restaurantes del cliente
-        for factura in self.facturas:
-            if factura.cliente.cedula == cliente.cedula:
-                total_gastos += factura.total
+        # Itera sobre las facturas del cliente para sumar los gastos en restaurantes
+        for factura in self.facturas_cliente(cliente.cedula):
+            total_gastos += factura.total
         
         return total_gastos
 
@@ -1646,14 +2174,7 @@ class App:
         Returns:
             int: El número total de entradas vendidas para el partido.
         """
-        entradas_partido = 0
-
-        # Itera sobre la lista de entradas para contar las entradas vendidas para el partido especificado
-        for entrada in self.entradas:
-            if entrada.partido.id == partido.id:
-                entradas_partido += 1
-        
-        return entradas_partido
+        return self.registro_entradas.cantidad_partido(partido.id)
 
     def asistencia_partido(self, partido):
         """
@@ -1665,14 +2186,7 @@ class App:
         Returns:
             int: El número total de asistencias confirmadas para el partido.
         """
-        asistencia_partido = 0
-
-        # Itera sobre la lista de entradas para contar las asistencias confirmadas para el partido especificado
-        for entrada in self.entradas:
-            if entrada.partido.id == partido.id and entrada.asistencia:
-                asistencia_partido += 1
-        
-        return asistencia_partido
+        return self.registro_entradas.asistencias_partido(partido.id)
 
 
     def tabla_asistencia(self):
@@ -1756,17 +2270,31 @@ class App:
     
     def total_venta_producto(self, producto):
         resultado = 0
-        for factura in self.facturas:
+        for factura in self.recorrer_facturas():
             cantidad_producto = factura.producto_en_factura(producto)
             resultado += cantidad_producto
             
         return resultado
 
+    def ventas_productos(self):
+        """
+        Suma la cantidad vendida de cada producto recorriendo las facturas una sola vez.
+
+        Returns:
+            dict: La cantidad vendida de cada producto, por nombre.
+        """
+        ventas = {}
+        for factura in self.recorrer_facturas():
+            for detalle in factura.detalles_productos:
+                ventas[detalle[0].nombre] = ventas.get(detalle[0].nombre, 0) + detalle[1]
+        return ventas
+
 
     def top_productos_vendidos(self):
         resultado = []
+        ventas = self.ventas_productos()
         for producto in self.productos:
-            venta_total = self.total_venta_producto(producto)
+            venta_total = ventas.get(producto.nombre, 0)
             if venta_total > 0:
                 resultado.append([producto, venta_total])
         
@@ -1791,14 +2319,7 @@ class App:
         Returns:
             int: La cantidad total de entradas compradas por el cliente.
         """
-        count = 0
-
-        # Itera sobre la lista de entradas para contar las entradas compradas por el cliente especificado
-        for entrada in self.entradas:
-            if entrada.cliente.cedula == cliente.cedula:
-                count += 1
-
-        return count
+        return self.registro_entradas.cantidad_cliente(cliente.cedula)
 
     def top_clientes(self):
         """
@@ -1884,9 +2405,26 @@ class App:
         self.restaurantes = []    # Vacía la lista de restaurantes
         self.productos = []       # Vacía la lista de productos
         self.partidos = []        # Vacía la lista de partidos
+        self.entidades = RegistroEntidades()  # Vacía los índices de equipos, estadios y partidos
         self.entradas = []        # Vacía la lista de entradas
+        self.registro_entradas = RegistroEntradas()  # Vacía los índices de entradas
+        self.motor_ventas.reiniciar_ids()  # Vuelve a numerar las entradas desde 1
         self.facturas = []        # Vacía la lista de facturas
         self.clientes = []        # Vacía la lista de clientes
+        self.clientes_ci = {}     # Vacía el índice de clientes por cédula
+        self.cambios = set(self.COLECCIONES)  # Ninguna lista vacía coincide con sus archivos
+        if self.almacen_jsonl is not None:
+            self.almacen_jsonl.cerrar()  # Cierra los archivos de entradas y facturas, que ya tienen todos los cambios
+            self.almacen_jsonl = None
+        if self.guardado_periodico is not None:
+            self.guardado_periodico.detener()  # Detiene el guardado en segundo plano
+            self.guardado_periodico = None
+        if self.diario is not None:
+            self.diario.cerrar()  # Cierra el diario, que quedó vacío al guardar
+            self.diario = None
+        if self.almacen is not None:
+            self.almacen.cerrar()  # Cierra la base de datos, que ya tiene todos los cambios
+            self.almacen = None
 
     def menu_principal(self):
         """
@@ -1926,101 +2464,198 @@ class App:
             elif int(opcion) == 6:
                 self.indicadores()
             else:
-                self.guardar_json()  # Guarda los datos en un archivo de texto antes de salir
+                if self.almacen is not None:
+                    # Las ventas ya están en la base de datos; solo se guarda la ocupación para abrir más rápido
+                    self.almacen.guardar_ocupacion(self.partidos, self.registro_entradas.ultimo_id())
+                else:
+                    if self.guardado_periodico is not None:
+                        self.guardado_periodico.detener()  # Espera al guardado en curso antes del guardado final
+                        print("\n" + self.guardado_periodico.resumen())
+                    self.guardar_json()  # Guarda los datos en un archivo de texto antes de salir
+                    self.guardar_instantanea()  # Guarda la instantánea binaria para el próximo arranque
                 self.eliminar()  # Elimina todos los datos antes de salir
                 break
 
-    def guardar_equipos(self):
+    def escribir_temporal(self, ruta, datos):
         """
-        Guarda la lista de equipos en un archivo JSON.
+        Escribe un archivo JSON junto al definitivo, con la extensión .tmp, y lo fuerza al disco.
 
-        Convierte cada equipo en un diccionario y guarda la lista resultante en 'equipos.json'.
-        """
-        equipos = []
-        for equipo in self.equipos:
-            equipos.append(equipo.diccionario())
+        Args:
+            ruta (str): La ruta del archivo definitivo.
+            datos (list): Los datos a guardar.
 
-        with open('equipos.json', 'w', encoding="utf-8") as archivo:
-            json.dump(equipos, archivo, indent=4, ensure_ascii= False)
-
-    def guardar_estadios(self):
+        Returns:
+            int: El tamaño del archivo escrito, en bytes.
         """
-        Guarda la lista de estadios en un archivo JSON.
+        with open(ruta + ".tmp", 'w', encoding="utf-8") as archivo:
+            json.dump(datos, archivo, indent=4, ensure_ascii= False)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+            return archivo.tell()
 
-        Convierte cada estadio en un diccionario y guarda la lista resultante en 'estadios.json'.
+    def capturar_cambios(self, todo=False):
         """
-        estadios = []
-        for estadio in self.estadios:
-            estadios.append(estadio.diccionario())
-        
-        with open('estadios.json', 'w', encoding="utf-8") as archivo:
-            json.dump(estadios, archivo, indent=4, ensure_ascii= False)
+        Copia las listas que cambiaron desde el último guardado, para escribirlas sin detener a quien sigue vendiendo.
 
-    def guardar_partidos(self):
-        """
-        Guarda la lista de partidos en un archivo JSON.
+        Las listas se copian de forma superficial: las entradas, facturas, clientes y equipos no cambian después de
+        creados (salvo la asistencia, que se vuelve a aplicar sin efecto desde el diario), y los asientos vendidos nunca
+        se liberan, así que la ocupación de los partidos solo puede adelantarse a la copia. Los estadios sí se convierten
+        a diccionarios aquí, porque el stock de sus productos baja con cada factura.
 
-        Convierte cada partido en un diccionario y guarda la lista resultante en 'partidos.json'.
-        """
-        partidos = []
-        for partido in self.partidos:
-            partidos.append(partido.diccionario())
-        
-        with open('partidos.json', 'w', encoding="utf-8") as archivo:
-            json.dump(partidos, archivo, indent=4, ensure_ascii= False)
+        Con los archivos JSON Lines abiertos, las entradas y facturas ya están en disco; en su lugar se anota el largo de
+        sus archivos en "marcas", hasta donde los incluyen la ocupación y el stock copiados. Sin ellos, "marcas" queda en
+        None y se calcula al escribir, porque la memoria tiene todas las entradas y facturas.
 
-    def guardar_clientes(self):
-        """
-        Guarda la lista de clientes en un archivo JSON.
+        Args:
+            todo (bool): True para copiar todas las colecciones aunque no hayan cambiado.
 
-        Convierte cada cliente en un diccionario y guarda la lista resultante en 'clientes.json'.
+        Returns:
+            dict: La copia de cada colección, por nombre, y las marcas si se copian los partidos o los estadios.
         """
-        clientes = []
-        for cliente in self.clientes:
-            clientes.append(cliente.diccionario())
-        
-        with open('clientes.json', 'w', encoding="utf-8") as archivo:
-            json.dump(clientes, archivo, indent=4, ensure_ascii= False)
+        with self.candado_cambios:
+            pendientes = set(self.COLECCIONES) if todo else set(self.cambios)
+            if self.almacen_jsonl is not None:
+                pendientes -= set(self.COLECCIONES_JSONL)
 
-    def guardar_entradas(self):
-        """
-        Guarda la lista de entradas en un archivo JSON.
+            # Se desmarcan al copiarlas, para que un cambio hecho durante la escritura quede para el siguiente guardado
+            self.cambios -= pendientes
 
-        Convierte cada entrada en un diccionario y guarda la lista resultante en 'entradas.json'.
-        """
-        entradas = []
-        for entrada in self.entradas:
-            entradas.append(entrada.diccionario())
-        
-        with open('entradas.json', 'w', encoding="utf-8") as archivo:
-            json.dump(entradas, archivo, indent=4, ensure_ascii= False)
+            captura = {}
+            for nombre in pendientes:
+                if nombre == "estadios":
+                    captura[nombre] = [estadio.diccionario() for estadio in self.estadios]
+                else:
+                    captura[nombre] = list(getattr(self, nombre))
 
-    def guardar_facturas(self):
-        """
-        Guarda la lista de facturas en un archivo JSON.
+            if self.almacen_jsonl is not None:
+                self.cambios -= set(self.COLECCIONES_JSONL)
+                if pendientes & set(self.MARCAS_JSONL):
+                    marcas = dict(self.marcas)
+                    for nombre, coleccion in self.MARCAS_JSONL.items():
+                        if nombre in pendientes:
+                            marcas[nombre] = self.almacen_jsonl.largo(coleccion)
+                    captura["marcas"] = marcas
+            elif pendientes & (set(self.MARCAS_JSONL) | set(self.COLECCIONES_JSONL)):
+                captura["marcas"] = None
+            return captura
 
-        Convierte cada factura en un diccionario y guarda la lista resultante en 'facturas.json'.
+    def escribir_captura(self, captura):
         """
-        facturas = []
-        for factura in self.facturas:
-            facturas.append(factura.diccionario())
-        
-        with open('facturas.json', 'w', encoding="utf-8") as archivo:
-            json.dump(facturas, archivo, indent=4, ensure_ascii= False)
+        Escribe los archivos JSON de las colecciones copiadas con capturar_cambios, todos o ninguno.
+
+        Primero se escriben todos los archivos temporales, después se anota en ARCHIVO_GUARDADO_PENDIENTE cuáles son y
+        qué segmento del diario reemplazan, y recién entonces se renombran. Si el programa se cierra antes de la anotación
+        quedan los archivos anteriores con su diario completo; si se cierra después, completar_guardado termina el trabajo.
+        Así una factura nunca queda a la vez en facturas.json y en el diario que se reproduce.
 
-    def guardar_json(self):
+        Las entradas y facturas se escriben como archivos JSON Lines completos, con sus índices, y junto con partidos.json
+        o estadios.json se escribe ARCHIVO_MARCAS.
+
+        Args:
+            captura (dict): La copia de cada colección, por nombre, como la devuelve capturar_cambios.
+
+        Returns:
+            int: La cantidad de bytes escritos.
+        """
+        tamano = 0
+        rutas = []
+        almacen_jsonl = self.almacen_jsonl or AlmacenJSONL()
+        largos = {}
+        for nombre, datos in captura.items():
+            if nombre == "marcas":
+                continue
+            if nombre != "estadios":
+                datos = [elemento.diccionario() for elemento in datos]
+            if nombre in self.COLECCIONES_JSONL:
+                rutas_jsonl, largos[nombre] = almacen_jsonl.escribir_temporales(nombre, datos)
+                rutas.extend(rutas_jsonl)
+                tamano += largos[nombre]
+                continue
+            rutas.append(f"{nombre}.json")
+            tamano += self.escribir_temporal(rutas[-1], datos)
+
+        marcas = captura.get("marcas")
+        if "marcas" in captura:
+            if marcas is None:
+                # En memoria están todas las entradas y facturas, así que los archivos las incluyen completas
+                marcas = {nombre: largos[coleccion] if coleccion in largos else almacen_jsonl.largo(coleccion)
+                          for nombre, coleccion in self.MARCAS_JSONL.items()}
+            rutas.append(self.ARCHIVO_MARCAS)
+            tamano += self.escribir_temporal(self.ARCHIVO_MARCAS, marcas)
+
+        segmento = self.diario.ruta_anterior if self.diario is not None else None
+        self.escribir_temporal(self.ARCHIVO_GUARDADO_PENDIENTE, {"archivos": rutas, "diario": segmento})
+        os.replace(self.ARCHIVO_GUARDADO_PENDIENTE + ".tmp", self.ARCHIVO_GUARDADO_PENDIENTE)
+
+        self.completar_guardado()
+        if marcas is not None:
+            self.marcas = marcas
+        return tamano
+
+    def completar_guardado(self):
+        """
+        Termina un guardado que quedó anotado en ARCHIVO_GUARDADO_PENDIENTE: renombra los archivos temporales que falten
+        y borra el segmento del diario que esos archivos ya incluyen. No hace nada si no hay un guardado pendiente.
+        """
+        if not os.path.exists(self.ARCHIVO_GUARDADO_PENDIENTE):
+            return
+
+        with open(self.ARCHIVO_GUARDADO_PENDIENTE, 'r') as archivo:
+            pendiente = json.load(archivo)
+
+        for ruta in pendiente["archivos"]:
+            if os.path.exists(ruta + ".tmp"):
+                os.replace(ruta + ".tmp", ruta)
+        if pendiente["diario"] is not None and os.path.exists(pendiente["diario"]):
+            os.remove(pendiente["diario"])
+        os.remove(self.ARCHIVO_GUARDADO_PENDIENTE)
+
+    def guardar_cambios(self, todo=False):
+        """
+        Rota el diario, copia las colecciones que cambiaron y las escribe en sus archivos JSON.
+
+        Solo la rotación y la copia se hacen con el candado de cambios; la conversión a JSON y la escritura no detienen
+        las ventas.
+
+        Args:
+            todo (bool): True para reescribir todos los archivos aunque no hayan cambiado.
+
+        Returns:
+            dict: Las colecciones guardadas, la pausa en segundos durante la que se detuvieron los cambios y los bytes escritos.
+
+        Raises:
+            Exception: Si no se pudo convertir o escribir algún archivo, por ejemplo OSError; las colecciones quedan
+                marcadas para el próximo guardado.
         """
-        Guarda todas las listas de datos en archivos JSON.
+        with self.candado_guardado:
+            inicio = time.perf_counter()
+
+            # Rotar antes de copiar: un cambio que no alcanzó a entrar en la copia queda en el segmento nuevo del diario
+            with self.candado_cambios:
+                if self.diario is not None:
+                    self.diario.rotar()
+                captura = self.capturar_cambios(todo)
+            pausa = time.perf_counter() - inicio
 
-        Llama a las funciones para guardar equipos, estadios, partidos, clientes, entradas y facturas.
+            try:
+                tamano = self.escribir_captura(captura)
+            except Exception:
+                self.cambios.update(set(captura) & set(self.COLECCIONES))
+                raise
+
+            return {"colecciones": sorted(captura), "pausa": pausa, "bytes": tamano}
+
+    def guardar_json(self, todo=False):
         """
-        self.guardar_equipos()
-        self.guardar_estadios()
-        self.guardar_partidos()
-        self.guardar_clientes()
-        self.guardar_entradas()
-        self.guardar_facturas()
+        Guarda en archivos JSON las listas de datos que cambiaron desde el último guardado.
 
+        Los equipos, estadios y partidos casi nunca cambian después de cargarlos, así que normalmente solo se reescriben
+        las entradas, las facturas, los clientes y los archivos cuyo stock u ocupación se movió.
+
+        Args:
+            todo (bool): True para reescribir todos los archivos aunque no hayan cambiado.
+        """
+        self.guardar_cambios(todo)
         print("\nDatos guardados exitosamente\n")
 
 
@@ -2034,19 +2669,29 @@ class App:
         archivo_path = 'equipos.json'
         if os.path.exists(archivo_path):
             with open(archivo_path, 'r') as archivo:
-                equipos = json.load(archivo)
-                self.equipos = []
-                for equipo_data in equipos:
-                    id = equipo_data["id"]
-                    codigo = equipo_data["codigo"]
-                    nombre = equipo_data["nombre"]
-                    grupo = equipo_data["grupo"]
-                    equipo = Equipo(id, codigo, nombre, grupo)
-                    self.equipos.append(equipo)
+                self.cargar_equipos_datos(json.load(archivo))
+            self.cambios.discard("equipos")
             print("\nEquipos cargados exitosamente desde equipos.json\n")
         else:
             print("\nError: El archivo equipos.json no se encontró.\n")
 
+    def cargar_equipos_datos(self, equipos):
+        """
+        Crea los equipos a partir de sus diccionarios y los almacena en la aplicación.
+
+        Args:
+            equipos (iterable): Los datos de cada equipo, como los devuelve Equipo.diccionario, desde un archivo JSON o desde la base de datos.
+        """
+        self.equipos = []
+        self.entidades.reiniciar_equipos()
+        for equipo_data in equipos:
+            id = equipo_data["id"]
+            codigo = equipo_data["codigo"]
+            nombre = equipo_data["nombre"]
+            grupo = equipo_data["grupo"]
+            equipo = Equipo(id, codigo, nombre, grupo)
+            self.agregar_equipo(equipo)
+
     def cargar_estadios_json(self):
         """
         Carga la lista de estadios desde un archivo JSON y la almacena en la aplicación.
@@ -2056,49 +2701,63 @@ class App:
         archivo_path = 'estadios.json'
         if os.path.exists(archivo_path):
             with open(archivo_path, 'r') as archivo:
-                estadios = json.load(archivo)
-                self.estadios = []
-                for estadio_data in estadios:
-                    id = estadio_data["id"]
-                    nombre = estadio_data["nombre"]
-                    ciudad = estadio_data["ciudad"]
-                    mapaGnral = self.llenar_mapa(estadio_data["capacidad"][0])
-                    mapaVip = self.llenar_mapa(estadio_data["capacidad"][1])
-
-                    # Cargar restaurantes
-                    lista_restaurantes = []
-                    for rest_data in estadio_data["restaurantes"]:
-                        nombreRest = rest_data["nombre"]
-                        lista_productos = []
-
-                        for prod_data in rest_data["productos"]:
-                            nombreProd = prod_data["nombre"]
-                            cantidad = prod_data["cantidad"]
-                            precio = prod_data["precio"]
-                            stock = prod_data["stock"]
-
-                            if prod_data["adicional"] == "plate" or prod_data["adicional"] == "package":
-                                plato = False
-                                if prod_data["adicional"] == "plate":
-                                     plato = True
-                                producto = Alimento(nombreProd, cantidad, precio, stock, plato)
-                            else:
-                                alcoholica = False
-                                if prod_data["adicional"] == "alcoholic":
-                                     alcoholica = True
-                                producto = Bebida(nombreProd, cantidad, precio, stock, alcoholica)
-
-                            lista_productos.append(producto)
-
-                        restaurante = Restaurante(nombreRest, lista_productos)
-                        lista_restaurantes.append(restaurante)
-
-                    estadio = Estadio(id, nombre, ciudad, mapaGnral, mapaVip, lista_restaurantes)
-                    self.estadios.append(estadio)
+                self.cargar_estadios_datos(json.load(archivo))
+            self.cambios.discard("estadios")
             print("\nEstadios cargados exitosamente desde estadios.json\n")
         else:
             print("\nError: El archivo estadios.json no se encontró.\n")
 
+    def cargar_estadios_datos(self, estadios):
+        """
+        Crea los estadios, con sus restaurantes y productos, a partir de sus diccionarios y los almacena en la aplicación.
+
+        Args:
+            estadios (iterable): Los datos de cada estadio, como los devuelve Estadio.diccionario, desde un archivo JSON o desde la base de datos.
+        """
+        self.estadios = []
+        self.restaurantes = []
+        self.productos = []
+        self.entidades.reiniciar_estadios()
+        for estadio_data in estadios:
+            id = estadio_data["id"]
+            nombre = estadio_data["nombre"]
+            ciudad = estadio_data["ciudad"]
+            mapaGnral = self.llenar_mapa(estadio_data["capacidad"][0])
+            mapaVip = self.llenar_mapa(estadio_data["capacidad"][1])
+
+            # Cargar restaurantes
+            lista_restaurantes = []
+            for rest_data in estadio_data["restaurantes"]:
+                nombreRest = rest_data["nombre"]
+                lista_productos = []
+
+                for prod_data in rest_data["productos"]:
+                    nombreProd = prod_data["nombre"]
+                    cantidad = prod_data["cantidad"]
+                    precio = prod_data["precio"]
+                    stock = prod_data["stock"]
+
+                    if prod_data["adicional"] == "plate" or prod_data["adicional"] == "package":
+                        plato = False
+                        if prod_data["adicional"] == "plate":
+                             plato = True
+                        producto = Alimento(nombreProd, cantidad, precio, stock, plato)
+                    else:
+                        alcoholica = False
+                        if prod_data["adicional"] == "alcoholic":
+                             alcoholica = True
+                        producto = Bebida(nombreProd, cantidad, precio, stock, alcoholica)
+
+                    lista_productos.append(producto)
+                    self.productos.append(producto)
+
+                restaurante = Restaurante(nombreRest, lista_productos)
+                lista_restaurantes.append(restaurante)
+                self.restaurantes.append(restaurante)
+
+            estadio = Estadio(id, nombre, ciudad, mapaGnral, mapaVip, lista_restaurantes)
+            self.agregar_estadio(estadio)
+
     def cargar_partidos_json(self):
         """
         Carga la lista de partidos desde un archivo JSON y la almacena en la aplicación.
@@ -2108,23 +2767,36 @@ class App:
         archivo_path = 'partidos.json'
         if os.path.exists(archivo_path):
             with open(archivo_path, 'r') as archivo:
-                partidos = json.load(archivo)
-                self.partidos = []
-                for partido_data in partidos:
-                    id = partido_data["id"]
-                    numero = partido_data["numero"]
-                    fecha = partido_data["fecha"]
-                    grupo = partido_data["grupo"]
-                    equipo_local = self.buscar_equipo_id(partido_data["equipo_local"])
-                    equipo_visitante = self.buscar_equipo_id(partido_data["equipo_visitante"])
-                    estadio = self.buscar_estadio_id(partido_data["estadio"])
-
-                    partido = Partido(id, numero, equipo_local, equipo_visitante, fecha, grupo, estadio)
-                    self.partidos.append(partido)
+                self.cargar_partidos_datos(json.load(archivo))
+            self.cambios.discard("partidos")
             print("\nPartidos cargados exitosamente desde partidos.json\n")
         else:
             print("\nError: El archivo partidos.json no se encontró.\n")
 
+    def cargar_partidos_datos(self, partidos):
+        """
+        Crea los partidos a partir de sus diccionarios, con la ocupación guardada de sus asientos, y los almacena en la aplicación.
+
+        Args:
+            partidos (iterable): Los datos de cada partido, como los devuelve Partido.diccionario, desde un archivo JSON o desde la base de datos.
+        """
+        self.partidos = []
+        self.entidades.reiniciar_partidos()
+        for partido_data in partidos:
+            id = partido_data["id"]
+            numero = partido_data["numero"]
+            fecha = partido_data["fecha"]
+            grupo = partido_data["grupo"]
+            equipo_local = self.buscar_equipo_id(partido_data["equipo_local"])
+            equipo_visitante = self.buscar_equipo_id(partido_data["equipo_visitante"])
+            estadio = self.buscar_estadio_id(partido_data["estadio"])
+
+            partido = Partido(id, numero, equipo_local, equipo_visitante, fecha, grupo, estadio)
+
+            # Recupera los asientos vendidos (los archivos antiguos no los tienen)
+            partido.restaurar_ocupacion(partido_data.get("ocupacion", {}))
+            self.agregar_partido(partido)
+
     def cargar_clientes_json(self):
         """
         Carga la lista de clientes desde un archivo JSON y la almacena en la aplicación.
@@ -2134,76 +2806,271 @@ class App:
         archivo_path = 'clientes.json'
         if os.path.exists(archivo_path):
             with open(archivo_path, 'r') as archivo:
-                clientes = json.load(archivo)
-                self.clientes = []
-                for cliente_data in clientes:
-                    nombre = cliente_data["nombre"]
-                    cedula = cliente_data["cedula"]
-                    edad = cliente_data["edad"]
-                    cliente = Cliente(nombre, cedula, edad)
-                    self.clientes.append(cliente)
+                self.cargar_clientes_datos(json.load(archivo))
+            self.cambios.discard("clientes")
             print("\nClientes cargados exitosamente desde clientes.json\n")
         else:
             print("\nError: El archivo clientes.json no se encontró.\n")
 
+    def cargar_clientes_datos(self, clientes):
+        """
+        Crea los clientes a partir de sus diccionarios, los almacena en la aplicación y calcula los descuentos que no vengan en los datos.
+
+        Args:
+            clientes (iterable): Los datos de cada cliente, como los devuelve Cliente.diccionario, desde un archivo JSON o desde la base de datos.
+        """
+        self.clientes = []
+        self.clientes_ci = {}
+        for cliente_data in clientes:
+            self.cargar_cliente(cliente_data)
+
+        # Calcula los descuentos que no venían en el archivo
+        self.evaluar_descuentos_clientes(self.clientes)
+
+    def cargar_cliente(self, cliente_data):
+        """
+        Crea un cliente a partir de su diccionario y lo añade a la aplicación.
+
+        Args:
+            cliente_data (dict): Los datos del cliente, como los devuelve Cliente.diccionario.
+
+        Returns:
+            Cliente: El cliente creado.
+        """
+        cliente = Cliente(cliente_data["nombre"], cliente_data["cedula"], cliente_data["edad"])
+
+        # Recupera los descuentos guardados (los archivos antiguos no los tienen)
+        cliente.vampiro = cliente_data.get("vampiro")
+        cliente.perfecto = cliente_data.get("perfecto")
+        self.agregar_cliente(cliente)
+        return cliente
+
     def cargar_entradas_json(self):
         """
         Carga la lista de entradas desde un archivo JSON y la almacena en la aplicación.
 
         Lee el archivo 'entradas.json', convierte cada diccionario en una instancia de Entrada y la añade a la lista de entradas.
+        Solo se usa para convertir los archivos de versiones anteriores a JSON Lines, en abrir_jsonl.
         """
         archivo_path = 'entradas.json'
         if os.path.exists(archivo_path):
             with open(archivo_path, 'r') as archivo:
-                entradas = json.load(archivo)
-                self.entradas = []
-                for entrada_data in entradas:
-                    id = entrada_data["id"]
-                    cliente = self.buscar_ci(entrada_data["cliente"])
-                    partido = self.buscar_partido_id(entrada_data["partido"])
-                    asiento = [int(x) for x in entrada_data["asiento"].split(', ')]
-                    tipo_entrada = entrada_data["tipo_entrada"]
-                    subtotal = entrada_data["subtotal"]
-                    descuento = entrada_data["descuento"]
-                    total_descuento = entrada_data["total_descuento"]
-                    iva = entrada_data["iva"]
-                    total = entrada_data["total"]
-                    asistencia = entrada_data["asistencia"]
-                    entrada = Entrada(id, cliente, partido, tipo_entrada, asiento, subtotal, descuento, total_descuento, iva, total, asistencia)
-                    self.entradas.append(entrada)
+                self.cargar_entradas_datos(json.load(archivo))
+            self.cambios.discard("entradas")
             print("\nEntradas cargadas exitosamente desde entradas.json\n")
         else:
             print("\nError: El archivo entradas.json no se encontró.\n")
 
+    def cargar_entradas_datos(self, entradas):
+        """
+        Crea las entradas a partir de sus diccionarios, las almacena en la aplicación y marca sus asientos como ocupados.
+
+        Args:
+            entradas (iterable): Los datos de cada entrada, como los devuelve Entrada.diccionario, desde un archivo JSON o desde la base de datos.
+        """
+        self.entradas = []
+        self.registro_entradas = RegistroEntradas()
+        for entrada_data in entradas:
+            self.cargar_entrada(entrada_data)
+        self.motor_ventas.reiniciar_ids()
+
+    def cargar_entrada(self, entrada_data):
+        """
+        Crea una entrada a partir de su diccionario, la añade a la aplicación y marca su asiento como ocupado.
+
+        Args:
+            entrada_data (dict): Los datos de la entrada, como los devuelve Entrada.diccionario.
+
+        Returns:
+            Entrada: La entrada creada.
+        """
+        entrada = self.crear_entrada(entrada_data)
+        self.agregar_entrada(entrada)
+        self.ocupar_asiento_entrada(entrada)
+        return entrada
+
+    def crear_entrada(self, entrada_data):
+        """
+        Crea una entrada a partir de su diccionario, resolviendo su cliente y su partido.
+
+        Args:
+            entrada_data (dict): Los datos de la entrada, como los devuelve Entrada.diccionario.
+
+        Returns:
+            Entrada: La entrada creada.
+        """
+        id = entrada_data["id"]
+        cliente = self.buscar_ci(entrada_data["cliente"])
+        partido = self.buscar_partido_id(entrada_data["partido"])
+        asiento = [int(x) for x in entrada_data["asiento"].split(', ')]
+        tipo_entrada = entrada_data["tipo_entrada"]
+        subtotal = entrada_data["subtotal"]
+        descuento = entrada_data["descuento"]
+        total_descuento = entrada_data["total_descuento"]
+        iva = entrada_data["iva"]
+        total = entrada_data["total"]
+        asistencia = entrada_data["asistencia"]
+        return Entrada(id, cliente, partido, tipo_entrada, asiento, subtotal, descuento, total_descuento, iva, total, asistencia)
+
+    def ocupar_asiento_entrada(self, entrada):
+        """
+        Marca como ocupado el asiento de una entrada si partidos.json no traía la ocupación.
+
+        Args:
+            entrada (Entrada): La entrada.
+
+        Returns:
+            bool: True si el asiento no estaba marcado.
+        """
+        fila, asiento = entrada.asiento
+        if entrada.partido.asiento_ocupado(fila - 1, asiento - 1, entrada.tipo_entrada):
+            return False
+        entrada.partido.ocupar_asiento(fila - 1, asiento - 1, entrada.tipo_entrada)
+        return True
+
     def cargar_facturas_json(self):
         """
         Carga la lista de facturas desde un archivo JSON y la almacena en la aplicación.
 
         Lee el archivo 'facturas.json', convierte cada diccionario en una instancia de Factura y la añade a la lista de facturas.
+        Solo se usa para convertir los archivos de versiones anteriores a JSON Lines, en abrir_jsonl.
         """
         archivo_path = 'facturas.json'
         if os.path.exists(archivo_path):
             with open(archivo_path, 'r') as archivo:
-                facturas = json.load(archivo)
-                self.facturas = []
-                for factura_data in facturas:
-                    cliente = self.buscar_ci(factura_data["cliente"])
-                    partido = self.buscar_partido_id(factura_data["partido"])
-                    restaurant = self.buscar_restaurante_nombre(factura_data["restaurant"])
-                    detalles_productos = self.convertir_detalles_producto(factura_data["detalles_productos"])
-                    subtotal = factura_data["subtotal"]
-                    descuento = factura_data["descuento"]
-                    total = factura_data["total"]
-                    factura = Factura(cliente, partido, restaurant, detalles_productos, subtotal, descuento, total)
-                    self.facturas.append(factura)
+                self.cargar_facturas_datos(json.load(archivo))
+            self.cambios.discard("facturas")
             print("\nFacturas cargadas exitosamente desde facturas.json\n")
         else:
             print("\nError: El archivo facturas.json no se encontró.\n")
 
+    def cargar_facturas_datos(self, facturas):
+        """
+        Crea las facturas a partir de sus diccionarios y las almacena en la aplicación.
+
+        Args:
+            facturas (iterable): Los datos de cada factura, como los devuelve Factura.diccionario, desde un archivo JSON o desde la base de datos.
+        """
+        self.facturas = []
+        for factura_data in facturas:
+            self.cargar_factura(factura_data)
+
+    def cargar_factura(self, factura_data):
+        """
+        Crea una factura a partir de su diccionario y la añade a la lista de facturas.
+
+        Args:
+            factura_data (dict): Los datos de la factura, como los devuelve Factura.diccionario.
+
+        Returns:
+            Factura: La factura creada.
+        """
+        factura = self.crear_factura(factura_data)
+        self.agregar_factura(factura)
+        return factura
+
+    def crear_factura(self, factura_data):
+        """
+        Crea una factura a partir de su diccionario, resolviendo su cliente, su partido, su restaurante y sus productos.
+
+        Args:
+            factura_data (dict): Los datos de la factura, como los devuelve Factura.diccionario.
+
+        Returns:
+            Factura: La factura creada.
+        """
+        cliente = self.buscar_ci(factura_data["cliente"])
+        partido = self.buscar_partido_id(factura_data["partido"])
+        restaurant = self.buscar_restaurante_nombre(factura_data["restaurant"])
+        detalles_productos = self.convertir_detalles_producto(factura_data["detalles_productos"])
+        subtotal = factura_data["subtotal"]
+        descuento = factura_data["descuento"]
+        total = factura_data["total"]
+        return Factura(cliente, partido, restaurant, detalles_productos, subtotal, descuento, total, factura_data.get("id"))
+
+    def agregar_factura(self, factura):
+        """
+        Añade una factura a la lista de facturas y, si todavía no lo tiene, le asigna el número que sigue a la última.
+        Con las facturas en disco (ver almacen_ventas) no se guarda en memoria: la escribe persistir.
+
+        Args:
+            factura (Factura): La factura a añadir.
+        """
+        if factura.id is None:
+            factura.id = self.ultima_factura() + 1
+        if self.almacen_ventas() is None:
+            self.facturas.append(factura)
+
+    def almacen_ventas(self):
+        """
+        Devuelve de dónde se leen las entradas y facturas a medida que se consultan: los archivos JSON Lines o la base
+        de datos. Los dos responden las mismas consultas por id, por cédula y por partido.
+
+        Returns:
+            AlmacenJSONL o AlmacenSQLite: El almacén, o None si las entradas y facturas están en memoria.
+        """
+        if self.almacen_jsonl is not None:
+            return self.almacen_jsonl
+        return self.almacen
+
+    def ultima_factura(self):
+        """
+        Devuelve el número de la última factura. Las facturas se numeran en el orden en que se añaden, desde 1.
+
+        Returns:
+            int: El mayor número, o 0 si no hay facturas.
+        """
+        if self.almacen_ventas() is not None:
+            return self.almacen_ventas().ultima_factura()
+        return len(self.facturas)
+
+    def existe_factura(self, id):
+        """
+        Verifica si ya hay una factura con un número, para no añadirla dos veces al reproducir el diario.
+
+        Args:
+            id (int): El número de la factura, o None si es de un diario anterior a la numeración.
+
+        Returns:
+            bool: True si la factura existe, False de lo contrario.
+        """
+        if id is None:
+            return False
+        if self.almacen_ventas() is not None:
+            return self.almacen_ventas().existe_factura(id)
+        return 1 <= id <= len(self.facturas)
+
+    def facturas_cliente(self, cedula):
+        """
+        Busca las facturas de un cliente, con el índice por cédula si las facturas están en disco.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            list: Las facturas del cliente.
+        """
+        if self.almacen_ventas() is not None:
+            return [self.crear_factura(factura_data) for factura_data in self.almacen_ventas().recorrer_facturas(cedula)]
+        return [factura for factura in self.facturas if factura.cliente.cedula == cedula]
+
+    def recorrer_facturas(self):
+        """
+        Recorre todas las facturas, leyéndolas de a una si están en disco.
+
+        Yields:
+            Factura: Cada factura.
+        """
+        almacen = self.almacen_ventas()
+        if almacen is None:
+            yield from self.facturas
+            return
+        for factura_data in almacen.recorrer_facturas():
+            yield self.crear_factura(factura_data)
 
     def buscar_partido_id(self, id):
         """
-        Busca un partido por su ID en la lista de partidos.
+        Busca un partido por su ID en el índice de partidos.
 
         Args:
             id (int): El identificador del partido a buscar.
@@ -2211,14 +3078,11 @@ class App:
         Returns:
             Partido: El partido con el ID especificado, o None si no se encuentra.
         """
-        for partido in self.partidos:
-            if partido.id == id:
-                return partido
-        return None
+        return self.entidades.partidos.get(id)
 
     def buscar_restaurante_nombre(self, nombre):
         """
-        Busca un restaurante por su nombre en la lista de restaurantes.
+        Busca un restaurante por su nombre en el índice de restaurantes de los estadios.
 
         Args:
             nombre (str): El nombre del restaurante a buscar.
@@ -2226,10 +3090,7 @@ class App:
         Returns:
             Restaurante: El restaurante con el nombre especificado, o None si no se encuentra.
         """
-        for restaurante in self.restaurantes:
-            if restaurante.nombre == nombre:
-                return restaurante
-        return None
+        return self.entidades.restaurantes.get(nombre)
 
     def convertir_detalles_producto(self, detalles_productos):
         """
@@ -2250,28 +3111,289 @@ class App:
         return productos
     
     def buscar_producto_nombre(self, nombre):
-        for producto in self.productos:
-            if producto.nombre == nombre:
-                return producto
-        return None
+        """
+        Busca un producto por su nombre en los restaurantes de los estadios.
+
+        Args:
+            nombre (str): El nombre del producto a buscar.
+
+        Returns:
+            Producto: El primer producto con el nombre especificado, o None si no se encuentra.
+        """
+        return self.entidades.productos.get(nombre)
+
+
+    def persistir(self, evento, datos):
+        """
+        Registra un cambio en el diario, en los archivos JSON Lines o en la base de datos, según cuál esté activo, antes
+        de darlo por completado, y marca las colecciones que modifica para el próximo guardado.
+
+        Args:
+            evento (str): El tipo de cambio: "cliente", "clientes", "entrada", "entradas", "asistencia" o "factura".
+            datos (dict): Los datos del cambio, con el mismo formato que los archivos JSON.
+        """
+        self.cambios.update(self.CAMBIOS_EVENTO[evento])
+        if self.almacen_jsonl is not None and evento in AlmacenJSONL.EVENTOS:
+            # Los archivos JSON Lines sirven de diario para las entradas y facturas
+            self.almacen_jsonl.registrar(evento, datos)
+        elif self.diario is not None:
+            self.diario.registrar(evento, datos)
+        if self.guardado_periodico is not None:
+            self.guardado_periodico.anotar(len(datos) if evento in ("clientes", "entradas") else 1)
+        if self.almacen is not None:
+            self.almacen.registrar(evento, datos)
+
+    def abrir_diario(self, ruta='diario.jsonl'):
+        """
+        Reproduce los cambios del diario sobre los datos ya cargados y lo abre para registrar los nuevos.
+
+        Las entradas y facturas cuyo cliente, partido o restaurante no está entre los datos cargados (por ejemplo, un
+        cliente guardado en clientes.json cuando se cargó la API) se omiten y se informa cuántas fueron.
+
+        Args:
+            ruta (str): La ruta del archivo del diario.
+
+        Returns:
+            int: La cantidad de registros reproducidos.
+        """
+        self.completar_guardado()
+        self.diario = Diario(ruta)
+
+        reproducidos = 0
+        omitidos = 0
+        for evento, datos in self.diario.leer():
+            if evento == "cliente" or evento == "clientes":
+                for cliente_data in (datos if evento == "clientes" else [datos]):
+                    if self.buscar_ci(cliente_data["cedula"]) is None:
+                        self.cargar_cliente(cliente_data)
+            elif evento == "entrada" or evento == "entradas":
+                nuevas = []
+                for entrada_data in (datos if evento == "entradas" else [datos]):
+                    if self.existe_entrada(entrada_data["id"]):
+                        continue
+                    if not self.referencias_cargadas(entrada_data):
+                        omitidos += 1
+                        continue
+                    self.cargar_entrada(entrada_data)
+                    nuevas.append(entrada_data)
+                if self.almacen_jsonl is not None and len(nuevas) != 0:
+                    self.almacen_jsonl.registrar("entradas", nuevas)
+            elif evento == "asistencia":
+                if self.registro_entradas.confirmar_asistencia(datos["id"]) is not None and self.almacen_jsonl is not None:
+                    self.almacen_jsonl.registrar(evento, datos)
+            elif evento == "factura":
+                # Una factura que ya está guardada no se vuelve a añadir ni resta su stock otra vez
+                if not self.existe_factura(datos.get("id")):
+                    if not self.referencias_cargadas(datos):
+                        omitidos += 1
+                    else:
+                        self.restar_stock(self.cargar_factura(datos))
+                        if self.almacen_jsonl is not None:
+                            self.almacen_jsonl.registrar(evento, datos)
+            self.cambios.update(self.CAMBIOS_EVENTO[evento])
+            reproducidos += 1
+
+        if omitidos > 0:
+            print(f"\nSe omitieron {omitidos} entradas o facturas del diario porque su cliente, partido o restaurante no está cargado.\n")
+
+        self.evaluar_descuentos_clientes(self.clientes)
+        self.motor_ventas.reiniciar_ids()
+
+        # Las entradas y facturas del diario de una sesión sin archivos JSON Lines ya se añadieron a ellos; se guarda
+        # enseguida para borrar ese diario y no volver a añadirlas si el programa se cierra
+        if self.almacen_jsonl is not None and reproducidos > 0:
+            self.guardar_cambios()
+
+        self.diario.abrir()
+        return reproducidos
+
+    def referencias_cargadas(self, datos):
+        """
+        Indica si el cliente, el partido y, en las facturas, el restaurante de una entrada o factura están cargados.
+
+        Args:
+            datos (dict): Los datos de la entrada o factura, como los devuelven Entrada.diccionario o Factura.diccionario.
 
+        Returns:
+            bool: True si se pueden crear la entrada o la factura sin referencias vacías.
+        """
+        if self.buscar_ci(datos["cliente"]) is None or self.buscar_partido_id(datos["partido"]) is None:
+            return False
+        return "restaurant" not in datos or self.buscar_restaurante_nombre(datos["restaurant"]) is not None
+
+    def cargar_sqlite(self, ruta=None):
+        """
+        Abre la base de datos y carga sus datos; si todavía está vacía, la llena con los archivos JSON.
+
+        Las entradas y facturas no se cargan: se consultan en la base de datos con sus índices por id, por cédula y por
+        partido. Solo se leen las entradas vendidas después de la última ocupación guardada, para marcar sus asientos.
+        Mientras la base de datos esté abierta, cada venta, asistencia, factura o cliente nuevo se guarda en ella al momento.
+
+        Args:
+            ruta (str): La ruta del archivo de la base de datos, o None para usar RUTA_BASE_DATOS.
+        """
+        almacen = AlmacenSQLite(ruta or self.RUTA_BASE_DATOS)
+
+        if almacen.vacio():
+            # Importa los archivos JSON de versiones anteriores una sola vez
+            self.cargar_json()
+            self.cargar_jsonl_en_memoria()
+            almacen.guardar(self)
+            almacen.guardar_ocupacion(self.partidos, self.registro_entradas.ultimo_id())
+            print("\nLos archivos JSON se importaron a la base de datos\n")
+        else:
+            self.cargar_equipos_datos(almacen.equipos())
+            self.cargar_estadios_datos(almacen.estadios())
+            self.cargar_partidos_datos(almacen.partidos())
+            self.cargar_clientes_datos(almacen.clientes())
+            print("\nDatos cargados exitosamente desde la base de datos")
+
+        self.almacen = almacen
+        self.entradas = []
+        self.facturas = []
+        self.registro_entradas = RegistroEntradasJSONL(almacen, self.crear_entrada)
+
+        # La ocupación guardada incluye los asientos hasta la marca; los de las ventas posteriores se vuelven a marcar
+        for entrada_data in almacen.recorrer_entradas(almacen.marca("ocupacion")):
+            self.ocupar_asiento_entrada(self.crear_entrada(entrada_data))
+        self.motor_ventas.reiniciar_ids()
+
+    def leer_marcas(self):
+        """
+        Lee de ARCHIVO_MARCAS hasta qué byte de cada archivo JSON Lines incluyen partidos.json y estadios.json.
+
+        Returns:
+            dict: La marca de cada archivo JSON, por nombre; 0 si no hay marcas guardadas.
+        """
+        marcas = dict.fromkeys(self.MARCAS_JSONL, 0)
+        if os.path.exists(self.ARCHIVO_MARCAS):
+            with open(self.ARCHIVO_MARCAS, 'r') as archivo:
+                marcas.update(json.load(archivo))
+        return marcas
+
+    def abrir_jsonl(self):
+        """
+        Abre los archivos JSON Lines de entradas y facturas sin leerlas, de modo que el arranque no depende de cuántas
+        se han vendido. Se llama después de cargar los partidos, los estadios y los clientes.
+
+        Las entradas y facturas añadidas después del último guardado de partidos.json y estadios.json (después de sus
+        marcas) se leen para marcar sus asientos y restar su stock. Si los archivos JSON Lines todavía no existen, se
+        crean una sola vez a partir de entradas.json y facturas.json.
+
+        Returns:
+            int: La cantidad de entradas y facturas leídas después de las marcas.
+        """
+        if self.almacen_jsonl is not None:
+            self.almacen_jsonl.cerrar()
+            self.almacen_jsonl = None
+
+        almacen = AlmacenJSONL()
+        if not almacen.existe():
+            # Convierte los archivos de versiones anteriores, que se leen enteros por última vez
+            self.cargar_entradas_json()
+            self.cargar_facturas_json()
+            self.escribir_captura({"entradas": self.entradas, "facturas": self.facturas, "partidos": list(self.partidos), "marcas": None})
+            print("\nLas entradas y facturas se guardaron en archivos JSON Lines\n")
+
+        almacen.abrir()
+        self.almacen_jsonl = almacen
+        self.entradas = []
+        self.facturas = []
+        self.registro_entradas = RegistroEntradasJSONL(almacen, self.crear_entrada)
+        self.marcas = self.leer_marcas()
+
+        leidas = 0
+        for entrada_data in almacen.recorrer_entradas(self.marcas["partidos"]):
+            if self.ocupar_asiento_entrada(self.crear_entrada(entrada_data)):
+                self.cambios.add("partidos")
+            leidas += 1
+        for factura_data in almacen.recorrer_facturas(desde=self.marcas["estadios"]):
+            self.restar_stock(self.crear_factura(factura_data))
+            self.cambios.add("estadios")
+            leidas += 1
+
+        self.motor_ventas.reiniciar_ids()
+        return leidas
+
+    def cargar_jsonl_en_memoria(self):
+        """
+        Lee todas las entradas y facturas de los archivos JSON Lines, las deja en memoria y cierra los archivos.
+        """
+        almacen = self.almacen_jsonl
+        self.almacen_jsonl = None
+        self.cargar_entradas_datos(almacen.recorrer_entradas())
+        self.cargar_facturas_datos(almacen.recorrer_facturas())
+        almacen.cerrar()
+
+    def guardar_instantanea(self):
+        """
+        Guarda la instantánea binaria de los datos. Se llama justo después de guardar los archivos JSON, a los que equivale.
+
+        Returns:
+            int: El tamaño de la instantánea, en bytes.
+        """
+        with self.candado_cambios:
+            return self.instantanea.guardar({nombre: getattr(self, nombre) for nombre in self.ATRIBUTOS_INSTANTANEA})
+
+    def cargar_instantanea(self):
+        """
+        Carga los datos desde la instantánea binaria, o desde los archivos JSON si la instantánea no existe, no se puede
+        leer o los archivos cambiaron después de guardarla.
+
+        Returns:
+            bool: True si los datos se cargaron desde la instantánea, False si se cargaron desde los archivos JSON.
+        """
+        self.completar_guardado()
+
+        try:
+            datos = self.instantanea.cargar()
+        except (OSError, ValueError) as error:
+            print(f"\nNo se pudo leer la instantanea: {error}")
+            datos = None
+
+        if datos is None:
+            print("\nNo hay una instantanea vigente de los archivos guardados; se cargan los archivos JSON.\n")
+            self.cargar_json()
+            return False
+
+        for nombre, valor in datos.items():
+            setattr(self, nombre, valor)
+        self.cambios = set()  # La instantánea coincide con los archivos JSON
+        self.abrir_jsonl()
+
+        print("\nDatos cargados exitosamente desde la instantanea\n")
+        return True
 
     def cargar_json(self):
+        # Si el último guardado se interrumpió después de escribir todos sus archivos, se termina antes de leerlos
+        self.completar_guardado()
+
         self.cargar_equipos_json()
         self.cargar_estadios_json()
         self.cargar_partidos_json()
         self.cargar_clientes_json()
-        self.cargar_entradas_json()
-        self.cargar_facturas_json()
+        self.abrir_jsonl()
 
         print("\nArchivos cargados exitosamente")
         
 
+    def iniciar_diario(self):
+        """
+        Recupera los cambios que quedaron en el diario desde el último guardado, empieza a registrar los nuevos y
+        arranca el guardado en segundo plano.
+        """
+        reproducidos = self.abrir_diario()
+        if reproducidos > 0:
+            print(f"\nSe recuperaron {reproducidos} cambios del diario que no se habian guardado.\n")
+
+        self.guardado_periodico = GuardadoPeriodico(self, self.INTERVALO_GUARDADO, self.CAMBIOS_GUARDADO)
+        self.guardado_periodico.iniciar()
+
     def inicializar(self):
         """
-        Muestra el menú de inicialización de la aplicación y permite cargar datos desde una API o un archivo de texto.
+        Muestra el menú de inicialización de la aplicación y permite cargar datos desde una API, un archivo de texto, la instantánea binaria o la base de datos.
 
-        Muestra las opciones del menú de inicialización y permite al usuario elegir una opción para cargar datos desde una API, cargar datos desde un archivo de texto o salir de la aplicación.
+        Muestra las opciones del menú de inicialización y permite al usuario elegir una opción para cargar datos desde una API, cargar datos desde un archivo de texto, cargar la instantánea del último cierre, cargar datos desde la base de datos o salir de la aplicación.
         Después de cargar los datos, navega al menú principal de la aplicación.
         """
         while True:
@@ -2280,30 +3402,62 @@ class App:
             print("===========================")
 
             # Muestra las opciones del menú de inicialización
-            print("1. Cargar API\n2. Cargar TXT\n3. Salir\n")
+            print("1. Cargar API\n2. Cargar TXT\n3. Cargar Snapshot\n4. Cargar Base de Datos\n5. Salir\n")
             
             # Solicita al usuario que ingrese una opción del menú
             opcion = input("Ingrese una opcion: ")
             
             # Valida que la opción ingresada sea un número y esté dentro del rango permitido
-            while (not opcion.isnumeric()) or (not int(opcion) in range(1, 4)):
+            while (not opcion.isnumeric()) or (not int(opcion) in range(1, 6)):
                 print("Ingrese una opcion valida")
                 opcion = input("Ingrese una opcion: ")
 
             if int(opcion) == 1:
                 print("Espere...")
-                # Carga los datos desde la API
-                self.cargar_Equipos()
-                self.cargar_Estadios()
-                self.cargar_Partidos()
-                print("\n...Carga Exitosa!")
+                # Carga los datos desde la API, descargando los tres documentos a la vez
+                try:
+                    tiempos = self.cargar_api()
+                except (requests.RequestException, ValueError) as error:
+                    print(f"\nError al cargar la API: {error}")
+                    continue
+                print(f"\n...Carga Exitosa! ({tiempos['total']:.2f} s: {tiempos['descarga']:.2f} s de descarga y {tiempos['construccion']:.2f} s de construccion)")
+                self.iniciar_diario()
                 # Navega al menú principal de la aplicación
                 self.menu_principal()
             elif int(opcion) == 2:
                 # Carga los datos desde un archivo de texto
                 self.cargar_json()
+                self.iniciar_diario()
+                # Navega al menú principal de la aplicación
+                self.menu_principal()
+            elif int(opcion) == 3:
+                # Carga los datos desde la instantánea binaria del último cierre
+                self.cargar_instantanea()
+                self.iniciar_diario()
+                # Navega al menú principal de la aplicación
+                self.menu_principal()
+            elif int(opcion) == 4:
+                # Carga los datos desde la base de datos, que guarda cada cambio al momento y no necesita diario
+                self.cargar_sqlite()
                 # Navega al menú principal de la aplicación
                 self.menu_principal()
             else:
                 print("Gracias por usar la aplicacion")
-                break
\ No newline at end of file
+                break
+
+
+def evaluar_cedulas(cedulas):
+    """
+    Evalúa los descuentos de un bloque de cédulas en un proceso del grupo.
+
+    Args:
+        cedulas (list): Lista de cédulas en formato de cadena.
+
+    Returns:
+        list: Una lista de pares (vampiro, perfecto) en el mismo orden de las cédulas.
+    """
+    app = App()
+    resultados = []
+    for cedula in cedulas:
+        resultados.append((app.es_vampiro(cedula), app.es_perfecto(cedula)))
+    return resultados
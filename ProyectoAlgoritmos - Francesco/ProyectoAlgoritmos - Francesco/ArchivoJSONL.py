@@ -0,0 +1,474 @@
+from IndiceClaves import IndiceClaves
+import json
+import mmap
+import os
+import struct
+import threading
+
+
+class ArchivoJSONL:
+    """
+    Clase que representa un archivo JSON Lines (un objeto JSON por línea) al que solo se añaden registros, con índices
+    en disco para leer un registro sin recorrer el archivo.
+
+    El índice por identificador (archivo .id) es un arreglo de desplazamientos de ancho fijo: la posición id - 1 guarda
+    el byte donde empieza la línea del registro más uno, o 0 si no hay registro con ese id. Si los registros no tienen
+    identificador, se usa su número de línea. El arreglo se lee con mmap, así que buscar un registro no depende de
+    cuántos haya. Los índices por campo son IndiceClaves.
+
+    Solo el archivo de datos se fuerza al disco con cada registro. Los índices anotan al cerrarse hasta qué byte de los
+    datos llegan, y al abrir se completan con las líneas que falten, así que un cierre inesperado no los deja incompletos.
+
+    Atributos:
+        ruta (str): La ruta del archivo de datos.
+        ruta_ids (str): La ruta del índice por identificador.
+        campo_id (str): El campo con el identificador entero de cada registro, o None para usar el número de línea.
+        indices (dict): El IndiceClaves de cada campo indexado, por nombre del campo.
+        archivo (file): El archivo de datos abierto para leer y añadir, o None si está cerrado.
+        archivo_ids (file): El índice por identificador abierto, o None si está cerrado.
+        mapa_ids (mmap): El índice por identificador mapeado en memoria al abrirlo, o None si estaba vacío.
+        posiciones_mapa (int): La cantidad de posiciones del índice por identificador que cubre el mapa.
+        ids (dict): Los desplazamientos de los registros añadidos después de abrir el índice, por identificador.
+        largo (int): El largo del archivo de datos, en bytes.
+        cantidad (int): La cantidad de registros del archivo.
+        id_maximo (int): El mayor identificador registrado, o 0 si no hay registros.
+        candado (Lock): El candado que evita que dos hilos mezclen sus lecturas y escrituras.
+    """
+    CABECERA = struct.Struct("<QQ")
+    DESPLAZAMIENTO = struct.Struct("<Q")
+
+    def __init__(self, ruta, campo_id=None, campos=()):
+        """
+        Inicializa una instancia de la clase ArchivoJSONL sin abrir el archivo.
+
+        Args:
+            ruta (str): La ruta del archivo de datos.
+            campo_id (str): El campo con el identificador entero de cada registro, o None para usar el número de línea.
+            campos (tuple): Los campos por los que se indexan los registros.
+        """
+        self.ruta = ruta
+        self.ruta_ids = ruta + ".id"
+        self.campo_id = campo_id
+        self.indices = {campo: IndiceClaves(f"{ruta}.{campo}") for campo in campos}
+        self.archivo = None
+        self.archivo_ids = None
+        self.mapa_ids = None
+        self.posiciones_mapa = 0
+        self.ids = {}
+        self.largo = 0
+        self.cantidad = 0
+        self.id_maximo = 0
+        self.candado = threading.Lock()
+
+    def rutas(self):
+        """
+        Devuelve las rutas del archivo de datos y de sus índices.
+
+        Returns:
+            list: Las rutas de todos los archivos.
+        """
+        return [self.ruta, self.ruta_ids] + [indice.ruta for indice in self.indices.values()]
+
+    def existe(self):
+        """
+        Indica si el archivo de datos ya existe.
+
+        Returns:
+            bool: True si el archivo de datos existe.
+        """
+        return os.path.exists(self.ruta)
+
+    def tamano(self):
+        """
+        Devuelve el largo del archivo de datos, esté abierto o no.
+
+        Returns:
+            int: El largo del archivo de datos en bytes, sin contar una línea que se esté escribiendo, o 0 si no existe.
+        """
+        with self.candado:
+            if self.archivo is not None:
+                return self.largo
+        return os.path.getsize(self.ruta) if self.existe() else 0
+
+    def abrir(self):
+        """
+        Abre el archivo de datos y sus índices, recorta la última línea si quedó incompleta y añade a los índices las
+        líneas que se escribieron después de su último cierre.
+        """
+        with self.candado:
+            if self.archivo is not None:
+                return
+
+            if not os.path.exists(self.ruta):
+                open(self.ruta, "wb").close()
+            self.archivo = open(self.ruta, "rb+")
+            self.largo = self.recortar()
+
+            cubiertos = {campo: indice.abrir(self.largo) for campo, indice in self.indices.items()}
+            cubiertos[None] = self.abrir_ids()
+
+            desplazamiento = min(cubiertos.values())
+            self.archivo.seek(desplazamiento)
+            for linea in self.archivo:
+                self.indexar(json.loads(linea), desplazamiento, cubiertos)
+                desplazamiento += len(linea)
+            self.archivo_ids.flush()
+
+    def recortar(self):
+        """
+        Recorta el final del archivo de datos si la última línea quedó incompleta, buscando el último salto de línea
+        desde el final sin leer el archivo entero.
+
+        Returns:
+            int: El largo del archivo de datos después de recortarlo, en bytes.
+        """
+        self.archivo.seek(0, os.SEEK_END)
+        largo = self.archivo.tell()
+
+        fin = largo
+        while fin > 0:
+            inicio = max(0, fin - 65536)
+            self.archivo.seek(inicio)
+            posicion = self.archivo.read(fin - inicio).rfind(b"\n")
+            if posicion >= 0:
+                fin = inicio + posicion + 1
+                break
+            fin = inicio
+
+        if fin != largo:
+            self.archivo.truncate(fin)
+        return fin
+
+    def abrir_ids(self):
+        """
+        Abre el índice por identificador y lo mapea en memoria.
+
+        Returns:
+            int: El byte del archivo de datos hasta el que llega el índice.
+        """
+        cubierto, self.cantidad = 0, 0
+        if os.path.exists(self.ruta_ids):
+            with open(self.ruta_ids, "rb") as archivo:
+                cabecera = archivo.read(self.CABECERA.size)
+            if len(cabecera) == self.CABECERA.size:
+                cubierto, self.cantidad = self.CABECERA.unpack(cabecera)
+                if cubierto > self.largo:
+                    cubierto, self.cantidad = 0, 0
+        else:
+            open(self.ruta_ids, "wb").close()
+
+        self.archivo_ids = open(self.ruta_ids, "rb+")
+        if cubierto == 0:
+            self.cantidad = 0
+            self.archivo_ids.truncate(0)
+            self.archivo_ids.write(self.CABECERA.pack(0, 0))
+            self.archivo_ids.flush()
+
+        self.ids = {}
+        self.posiciones_mapa = (os.path.getsize(self.ruta_ids) - self.CABECERA.size) // self.DESPLAZAMIENTO.size
+        if self.posiciones_mapa > 0:
+            self.mapa_ids = mmap.mmap(self.archivo_ids.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # El mayor identificador es la última posición ocupada del arreglo
+        self.id_maximo = self.posiciones_mapa
+        while self.id_maximo > 0 and self.posicion(self.id_maximo) is None:
+            self.id_maximo -= 1
+        return cubierto
+
+    def posicion(self, id):
+        """
+        Busca el desplazamiento de la línea de un registro en el índice por identificador.
+
+        Args:
+            id (int): El identificador del registro.
+
+        Returns:
+            int: El byte donde empieza la línea del registro, o None si no existe.
+        """
+        if id in self.ids:
+            return self.ids[id]
+        if not isinstance(id, int) or not 1 <= id <= self.posiciones_mapa:
+            return None
+        valor = self.DESPLAZAMIENTO.unpack_from(self.mapa_ids, self.CABECERA.size + (id - 1) * self.DESPLAZAMIENTO.size)[0]
+        return valor - 1 if valor else None
+
+    def indexar(self, datos, desplazamiento, cubiertos=None):
+        """
+        Añade un registro a los índices que todavía no lo incluyen. Se llama con el candado tomado.
+
+        Args:
+            datos (dict): Los datos del registro.
+            desplazamiento (int): El byte donde empieza la línea del registro.
+            cubiertos (dict): El byte hasta el que llega cada índice (None para el índice por identificador), o None si
+                el registro es nuevo y se añade a todos.
+        """
+        if cubiertos is None or desplazamiento >= cubiertos[None]:
+            self.cantidad += 1
+            id = datos[self.campo_id] if self.campo_id is not None else self.cantidad
+            if not isinstance(id, int) or id < 1:
+                raise ValueError(f"El identificador {id!r} no es un entero positivo")
+            self.archivo_ids.seek(self.CABECERA.size + (id - 1) * self.DESPLAZAMIENTO.size)
+            self.archivo_ids.write(self.DESPLAZAMIENTO.pack(desplazamiento + 1))
+            self.ids[id] = desplazamiento
+            self.id_maximo = max(self.id_maximo, id)
+
+        for campo, indice in self.indices.items():
+            if cubiertos is None or desplazamiento >= cubiertos[campo]:
+                indice.agregar(datos[campo], desplazamiento)
+
+    def linea(self, datos):
+        """
+        Convierte un registro en su línea del archivo.
+
+        Args:
+            datos (dict): Los datos del registro.
+
+        Returns:
+            bytes: El registro en JSON, terminado en un salto de línea.
+        """
+        return json.dumps(datos, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    def agregar_lote(self, registros):
+        """
+        Añade registros al final del archivo con una sola escritura, la fuerza al disco y después los indexa.
+
+        Args:
+            registros (list): Los datos de cada registro.
+        """
+        lineas = [self.linea(datos) for datos in registros]
+
+        with self.candado:
+            self.archivo.seek(0, os.SEEK_END)
+            self.archivo.write(b"".join(lineas))
+            self.archivo.flush()
+            os.fsync(self.archivo.fileno())
+
+            for datos, linea in zip(registros, lineas):
+                self.indexar(datos, self.largo)
+                self.largo += len(linea)
+            self.archivo_ids.flush()
+
+    def agregar(self, datos):
+        """
+        Añade un registro al final del archivo y lo fuerza al disco.
+
+        Args:
+            datos (dict): Los datos del registro.
+        """
+        self.agregar_lote([datos])
+
+    def leer(self, desplazamiento):
+        """
+        Lee la línea que empieza en un byte del archivo. Se llama con el candado tomado.
+
+        Args:
+            desplazamiento (int): El byte donde empieza la línea.
+
+        Returns:
+            dict: Los datos del registro.
+        """
+        self.archivo.seek(desplazamiento)
+        return json.loads(self.archivo.readline())
+
+    def buscar(self, id):
+        """
+        Busca un registro por su identificador.
+
+        Args:
+            id (int): El identificador del registro (su número de línea si no tiene campo_id).
+
+        Returns:
+            dict: Los datos del registro, o None si no existe.
+        """
+        with self.candado:
+            desplazamiento = self.posicion(id)
+            return None if desplazamiento is None else self.leer(desplazamiento)
+
+    def existe_id(self, id):
+        """
+        Indica si hay un registro con un identificador, sin leerlo.
+
+        Args:
+            id (int): El identificador del registro.
+
+        Returns:
+            bool: True si el registro existe.
+        """
+        with self.candado:
+            return self.posicion(id) is not None
+
+    def ultimo_id(self):
+        """
+        Devuelve el mayor identificador registrado.
+
+        Returns:
+            int: El mayor identificador, o 0 si no hay registros.
+        """
+        with self.candado:
+            return self.id_maximo
+
+    def buscar_por(self, campo, valor):
+        """
+        Busca los registros con un valor en un campo indexado.
+
+        Args:
+            campo (str): El nombre del campo.
+            valor: El valor buscado.
+
+        Returns:
+            list: Los datos de cada registro con el valor, en el orden en que se añadieron.
+        """
+        registros = []
+        with self.candado:
+            for desplazamiento in self.indices[campo].buscar(valor):
+                datos = self.leer(desplazamiento)
+                # La clave del índice puede estar recortada, así que se compara el valor completo
+                if str(datos[campo]) == str(valor):
+                    registros.append(datos)
+        return registros
+
+    def contar_por(self, campo, valor):
+        """
+        Cuenta los registros con un valor en un campo indexado, sin leerlos si la clave no está recortada.
+
+        Args:
+            campo (str): El nombre del campo.
+            valor: El valor buscado.
+
+        Returns:
+            int: La cantidad de registros con el valor.
+        """
+        if not IndiceClaves.exacta(valor):
+            return len(self.buscar_por(campo, valor))
+        with self.candado:
+            return self.indices[campo].contar(valor)
+
+    def recorrer(self, desde=0):
+        """
+        Recorre los registros del archivo en orden, leyéndolos de a uno con un archivo aparte para no detener a quien
+        añade registros mientras tanto.
+
+        Args:
+            desde (int): El byte desde el que se empieza a leer.
+
+        Yields:
+            dict: Los datos de cada registro escrito hasta que empezó el recorrido.
+        """
+        fin = self.tamano()
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(desde)
+            posicion = desde
+            while posicion < fin:
+                linea = archivo.readline()
+                if not linea:
+                    break
+                posicion += len(linea)
+                yield json.loads(linea)
+
+    def actualizar(self, id, cambios):
+        """
+        Cambia campos de un registro reescribiendo su línea en el mismo lugar, y la fuerza al disco.
+
+        La línea nueva se completa con espacios hasta el largo de la anterior, así que solo se pueden hacer cambios que
+        no la alarguen, como pasar un campo de false a true.
+
+        Args:
+            id (int): El identificador del registro.
+            cambios (dict): Los campos que cambian, con sus valores nuevos.
+
+        Returns:
+            dict: Los datos del registro actualizado, o None si no existe.
+
+        Raises:
+            ValueError: Si la línea nueva es más larga que la anterior.
+        """
+        with self.candado:
+            desplazamiento = self.posicion(id)
+            if desplazamiento is None:
+                return None
+
+            self.archivo.seek(desplazamiento)
+            anterior = self.archivo.readline()
+            datos = json.loads(anterior)
+            datos.update(cambios)
+
+            nueva = self.linea(datos)
+            if len(nueva) > len(anterior):
+                raise ValueError(f"El registro {id} no se puede reescribir en el mismo lugar")
+
+            self.archivo.seek(desplazamiento)
+            self.archivo.write(nueva[:-1] + b" " * (len(anterior) - len(nueva)) + b"\n")
+            self.archivo.flush()
+            os.fsync(self.archivo.fileno())
+            return datos
+
+    def escribir_temporales(self, registros):
+        """
+        Escribe el archivo de datos y todos sus índices completos, con la extensión .tmp, y los fuerza al disco. Se usa
+        para reemplazar el archivo entero con registros que están en memoria; el archivo no debe estar abierto.
+
+        Args:
+            registros (iterable): Los datos de cada registro.
+
+        Returns:
+            tuple: Las rutas definitivas de los archivos escritos y el largo del archivo de datos, en bytes.
+        """
+        pares = {campo: [] for campo in self.indices}
+        posiciones = bytearray()
+        cantidad = 0
+        desplazamiento = 0
+
+        with open(self.ruta + ".tmp", "wb") as archivo:
+            for datos in registros:
+                linea = self.linea(datos)
+                archivo.write(linea)
+                cantidad += 1
+
+                id = datos[self.campo_id] if self.campo_id is not None else cantidad
+                inicio = (id - 1) * self.DESPLAZAMIENTO.size
+                if len(posiciones) < inicio + self.DESPLAZAMIENTO.size:
+                    posiciones.extend(bytes(inicio + self.DESPLAZAMIENTO.size - len(posiciones)))
+                self.DESPLAZAMIENTO.pack_into(posiciones, inicio, desplazamiento + 1)
+
+                for campo in pares:
+                    pares[campo].append((IndiceClaves.clave(datos[campo]), desplazamiento))
+                desplazamiento += len(linea)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+        with open(self.ruta_ids + ".tmp", "wb") as archivo:
+            archivo.write(self.CABECERA.pack(desplazamiento, cantidad))
+            archivo.write(posiciones)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+        for campo, indice in self.indices.items():
+            pares[campo].sort()
+            indice.escribir_temporal(pares[campo], desplazamiento)
+
+        return self.rutas(), desplazamiento
+
+    def cerrar(self):
+        """
+        Cierra el archivo de datos y sus índices, anotando en cada índice hasta dónde llega.
+        """
+        with self.candado:
+            if self.archivo is None:
+                return
+
+            for indice in self.indices.values():
+                indice.cerrar(self.largo)
+
+            self.archivo_ids.seek(0)
+            self.archivo_ids.write(self.CABECERA.pack(self.largo, self.cantidad))
+            self.archivo_ids.flush()
+            os.fsync(self.archivo_ids.fileno())
+            if self.mapa_ids is not None:
+                self.mapa_ids.close()
+                self.mapa_ids = None
+            self.archivo_ids.close()
+            self.archivo_ids = None
+            self.ids = {}
+
+            self.archivo.close()
+            self.archivo = None
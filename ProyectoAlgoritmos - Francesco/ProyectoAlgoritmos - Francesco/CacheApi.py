@@ -0,0 +1,196 @@
+import json
+import os
+import time
+
+import requests
+
+
+class CacheApi:
+    """
+    Clase que guarda en disco los documentos descargados de la API y los revalida con solicitudes condicionales.
+
+    Por cada documento se guarda el cuerpo tal como llegó y, aparte, su ETag, su Last-Modified y la hora de descarga.
+    Mientras el documento esté vigente se usa sin conectarse. Después se pide con If-None-Match / If-Modified-Since, y si
+    el servidor responde 304 se sigue usando la copia guardada. Si la red falla y hay copia, también se usa la copia.
+    Una copia que no se puede leer se trata como si no estuviera guardada.
+
+    Atributos:
+        directorio (str): El directorio donde se guardan los documentos.
+        vigencia (float): Los segundos durante los que un documento se usa sin revalidarlo.
+        origen (dict): De dónde salió la última lectura de cada documento: "red", "revalidado", "cache" o "sin conexion".
+    """
+    def __init__(self, directorio="cache_api", vigencia=3600):
+        """
+        Inicializa una instancia de la clase CacheApi.
+
+        Args:
+            directorio (str): El directorio donde se guardan los documentos.
+            vigencia (float): Los segundos durante los que un documento se usa sin revalidarlo.
+        """
+        self.directorio = directorio
+        self.vigencia = vigencia
+        self.origen = {}
+
+    def ruta(self, documento):
+        """
+        Devuelve la ruta del cuerpo guardado de un documento.
+
+        Args:
+            documento (str): El nombre del documento, por ejemplo "teams.json".
+
+        Returns:
+            str: La ruta del archivo.
+        """
+        return os.path.join(self.directorio, documento)
+
+    def leer_meta(self, documento):
+        """
+        Lee los datos de validación guardados de un documento.
+
+        Args:
+            documento (str): El nombre del documento.
+
+        Returns:
+            dict: El ETag, el Last-Modified y la hora de descarga, o None si el documento no está guardado.
+        """
+        if not os.path.exists(self.ruta(documento)) or not os.path.exists(self.ruta(documento) + ".meta"):
+            return None
+
+        try:
+            with open(self.ruta(documento) + ".meta", "r") as archivo:
+                return json.load(archivo)
+        except ValueError:
+            return None
+
+    def escribir(self, ruta, contenido, modo="w"):
+        """
+        Escribe un archivo de la caché en un archivo temporal y lo reemplaza de una vez, para no dejarlo a medias.
+
+        Args:
+            ruta (str): La ruta del archivo.
+            contenido (str o bytes): El contenido a escribir.
+            modo (str): "w" para texto o "wb" para bytes.
+        """
+        temporal = ruta + ".tmp"
+        with open(temporal, modo) as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, ruta)
+
+    def guardar(self, documento, cuerpo, etag, ultima_modificacion):
+        """
+        Guarda el cuerpo de un documento y sus datos de validación.
+
+        Args:
+            documento (str): El nombre del documento.
+            cuerpo (bytes): El cuerpo de la respuesta.
+            etag (str): La cabecera ETag de la respuesta, o None.
+            ultima_modificacion (str): La cabecera Last-Modified de la respuesta, o None.
+        """
+        os.makedirs(self.directorio, exist_ok=True)
+        self.escribir(self.ruta(documento), cuerpo, "wb")
+        self.guardar_meta(documento, etag, ultima_modificacion)
+
+    def guardar_meta(self, documento, etag, ultima_modificacion):
+        """
+        Guarda solo los datos de validación de un documento, con la hora actual como hora de descarga. Basta cuando el
+        servidor confirma que el cuerpo guardado no cambió.
+
+        Args:
+            documento (str): El nombre del documento.
+            etag (str): La cabecera ETag, o None.
+            ultima_modificacion (str): La cabecera Last-Modified, o None.
+        """
+        self.escribir(self.ruta(documento) + ".meta", json.dumps({"etag": etag, "last_modified": ultima_modificacion, "descargado": time.time()}))
+
+    def leer(self, documento):
+        """
+        Lee el cuerpo guardado de un documento.
+
+        Args:
+            documento (str): El nombre del documento.
+
+        Returns:
+            bytes: El cuerpo guardado, o None si no se puede leer.
+        """
+        try:
+            with open(self.ruta(documento), "rb") as archivo:
+                return archivo.read()
+        except OSError:
+            return None
+
+    def descartar(self, documento):
+        """
+        Borra la copia guardada de un documento, por ejemplo porque su contenido está dañado, para que se vuelva a
+        descargar completo.
+
+        Args:
+            documento (str): El nombre del documento.
+        """
+        for ruta in [self.ruta(documento) + ".meta", self.ruta(documento)]:
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+
+    def obtener(self, sesion, url_base, documento, timeout):
+        """
+        Devuelve el cuerpo de un documento, desde la caché si está vigente o el servidor confirma que no cambió.
+
+        Args:
+            sesion (requests.Session): La sesión con la que se hace la solicitud, o el módulo requests.
+            url_base (str): La URL base de la API.
+            documento (str): El nombre del documento.
+            timeout (tuple): Los tiempos máximos de conexión y de lectura de la solicitud.
+
+        Returns:
+            bytes: El cuerpo del documento.
+
+        Raises:
+            requests.RequestException: Si la descarga falla y el documento no está en la caché.
+        """
+        meta = self.leer_meta(documento)
+
+        if meta is not None and time.time() - meta["descargado"] < self.vigencia:
+            cuerpo = self.leer(documento)
+            if cuerpo is not None:
+                self.origen[documento] = "cache"
+                return cuerpo
+            meta = None  # La copia no se puede leer: se descarga completa
+
+        # Pide el documento solo si cambió desde la copia guardada
+        cabeceras = {}
+        if meta is not None:
+            if meta["etag"]:
+                cabeceras["If-None-Match"] = meta["etag"]
+            if meta["last_modified"]:
+                cabeceras["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            api = sesion.get(url_base + documento, headers=cabeceras, timeout=timeout)
+        except requests.RequestException:
+            cuerpo = self.leer(documento) if meta is not None else None
+            if cuerpo is None:
+                raise
+            self.origen[documento] = "sin conexion"
+            return cuerpo
+
+        if api.status_code == 304 and meta is not None:
+            cuerpo = self.leer(documento)
+            if cuerpo is None:
+                # La copia desapareció después de pedir la revalidación: se pide de nuevo sin condiciones
+                self.descartar(documento)
+                return self.obtener(sesion, url_base, documento, timeout)
+            self.guardar_meta(documento, meta["etag"], meta["last_modified"])
+            self.origen[documento] = "revalidado"
+            return cuerpo
+
+        if api.status_code >= 400 and meta is not None:
+            cuerpo = self.leer(documento)
+            if cuerpo is not None:
+                self.origen[documento] = "sin conexion"
+                return cuerpo
+
+        api.raise_for_status()
+        self.guardar(documento, api.content, api.headers.get("ETag"), api.headers.get("Last-Modified"))
+        self.origen[documento] = "red"
+        return api.content
@@ -6,6 +6,8 @@ class Cliente:
         nombre (str): El nombre del cliente.
         cedula (str): La cédula de identidad del cliente.
         edad (int): La edad del cliente.
+        vampiro (bool): Si la cédula es un número vampiro, o None si aún no se ha evaluado.
+        perfecto (bool): Si la cédula es un número perfecto, o None si aún no se ha evaluado.
     """
     def __init__(self, nombre, cedula, edad):
         """
@@ -19,6 +21,8 @@ class Cliente:
         self.nombre = nombre
         self.cedula = cedula
         self.edad = edad
+        self.vampiro = None
+        self.perfecto = None
 
     def mostrar_atributos(self):
         """
@@ -36,4 +40,4 @@ class Cliente:
         Returns:
             dict: Un diccionario con los atributos del cliente.
         """
-        return {"nombre": self.nombre, "cedula": self.cedula, "edad": self.edad}
+        return {"nombre": self.nombre, "cedula": self.cedula, "edad": self.edad, "vampiro": self.vampiro, "perfecto": self.perfecto}
@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+
+
+class Diario:
+    """
+    Clase que representa el diario de cambios de la aplicación: un archivo JSONL al que solo se añaden registros.
+
+    Cada registro se escribe y se fuerza al disco (fsync) antes de seguir, de modo que una venta confirmada no se pierde
+    aunque el programa termine de forma inesperada. Al arrancar se reproducen los registros sobre los últimos archivos
+    JSON guardados.
+
+    Al guardar, el diario se rota: los registros anteriores pasan a un segmento aparte, que se borra cuando los archivos
+    JSON ya los incluyen, mientras los nuevos se siguen añadiendo al archivo principal.
+
+    Atributos:
+        ruta (str): La ruta del archivo del diario.
+        ruta_anterior (str): La ruta del segmento con los registros anteriores a la última rotación.
+        archivo (file): El archivo abierto para añadir registros, o None si el diario está cerrado.
+        candado (Lock): El candado que evita que dos hilos mezclen sus registros.
+    """
+    def __init__(self, ruta):
+        """
+        Inicializa una instancia de la clase Diario.
+
+        Args:
+            ruta (str): La ruta del archivo del diario.
+        """
+        self.ruta = ruta
+        self.ruta_anterior = ruta + ".anterior"
+        self.archivo = None
+        self.candado = threading.Lock()
+
+    def abrir(self):
+        """
+        Abre el archivo del diario para añadir registros al final.
+
+        Si el último registro quedó incompleto, se recorta antes de abrirlo para que no se mezcle con los nuevos.
+        """
+        with self.candado:
+            if self.archivo is not None:
+                return
+
+            if os.path.exists(self.ruta):
+                with open(self.ruta, "rb+") as archivo:
+                    contenido = archivo.read()
+                    fin = contenido.rfind(b"\n") + 1
+                    if fin != len(contenido):
+                        archivo.truncate(fin)
+
+            self.archivo = open(self.ruta, "a", encoding="utf-8")
+
+    def registrar(self, evento, datos):
+        """
+        Añade un registro al diario y lo fuerza al disco.
+
+        Args:
+            evento (str): El tipo de cambio, por ejemplo "entrada" o "factura".
+            datos (dict): Los datos del cambio, con el mismo formato que los archivos JSON.
+        """
+        linea = json.dumps({"evento": evento, "datos": datos}, ensure_ascii=False) + "\n"
+
+        with self.candado:
+            self.archivo.write(linea)
+            self.archivo.flush()
+            os.fsync(self.archivo.fileno())
+
+    def leer(self):
+        """
+        Lee los registros del diario en el orden en que se escribieron, empezando por el segmento anterior si existe.
+
+        Si la última línea quedó incompleta porque el programa terminó mientras se escribía, se descarta.
+
+        Yields:
+            tuple: El evento y los datos de cada registro.
+        """
+        for ruta in [self.ruta_anterior, self.ruta]:
+            if not os.path.exists(ruta):
+                continue
+
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                for linea in archivo:
+                    try:
+                        registro = json.loads(linea)
+                    except ValueError:
+                        break
+                    yield registro["evento"], registro["datos"]
+
+    def rotar(self):
+        """
+        Pasa los registros actuales al segmento anterior y deja el archivo principal vacío para los nuevos.
+
+        Si el segmento anterior todavía existe porque el guardado que debía reemplazarlo falló, los registros se añaden
+        a su final para no perderlos.
+        """
+        with self.candado:
+            abierto = self.archivo is not None
+            if abierto:
+                self.archivo.close()
+
+            if os.path.exists(self.ruta):
+                if not os.path.exists(self.ruta_anterior):
+                    os.replace(self.ruta, self.ruta_anterior)
+                else:
+                    with open(self.ruta, "rb") as actual, open(self.ruta_anterior, "ab") as anterior:
+                        anterior.write(actual.read())
+                        anterior.flush()
+                        os.fsync(anterior.fileno())
+                    os.remove(self.ruta)
+
+            self.archivo = open(self.ruta, "a", encoding="utf-8") if abierto else None
+
+    def cerrar(self):
+        """
+        Cierra el archivo del diario.
+        """
+        with self.candado:
+            if self.archivo is not None:
+                self.archivo.close()
+                self.archivo = None
@@ -6,8 +6,8 @@ class Estadio:
         id (int): El identificador del estadio.
         nombre (str): El nombre del estadio.
         ciudad (str): La ciudad donde se encuentra el estadio.
-        mapaGnral (list): El mapa de asientos de la zona general.
-        mapaVip (list): El mapa de asientos de la zona VIP.
+        mapaGnral (MapaAsientos): El mapa de asientos de la zona general. Sirve de plantilla para los mapas de cada partido.
+        mapaVip (MapaAsientos): El mapa de asientos de la zona VIP. Sirve de plantilla para los mapas de cada partido.
         restaurantes (list): Una lista de restaurantes dentro del estadio.
     """
     def __init__(self, id, nombre, ciudad, mapaGnral, mapaVip, restaurantes):
@@ -18,8 +18,8 @@ class Estadio:
             id (int): El identificador del estadio.
             nombre (str): El nombre del estadio.
             ciudad (str): La ciudad donde se encuentra el estadio.
-            mapaGnral (list): El mapa de asientos de la zona general.
-            mapaVip (list): El mapa de asientos de la zona VIP.
+            mapaGnral (MapaAsientos): El mapa de asientos de la zona general.
+            mapaVip (MapaAsientos): El mapa de asientos de la zona VIP.
             restaurantes (list): Una lista de restaurantes dentro del estadio.
         """
         self.id = id
@@ -37,57 +37,46 @@ class Estadio:
         print("\n")
         self.mostrar_mapa_vip()
 
-    def mostrar_mapa_gnral(self):
+    def obtener_mapa(self, tipo_entrada):
+        """
+        Devuelve el mapa de asientos de una zona del estadio.
+
+        Args:
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+
+        Returns:
+            MapaAsientos: El mapa de asientos de la zona.
+        """
+        if tipo_entrada == "General":
+            return self.mapaGnral
+        else:
+            return self.mapaVip
+
+    def mostrar_mapa_gnral(self, desde=0, hasta=None):
         """
         Genera una representación en cadena del mapa de asientos de la zona general.
         
+        Args:
+            desde (int): La primera fila a mostrar (desde 0).
+            hasta (int): La fila donde termina el rango (excluida), o None para llegar hasta la última.
+
         Returns:
             str: Una cadena que representa el mapa de la zona general.
         """
-        mapa_gnral = "General\n"
-        for i in range(len(self.mapaGnral)):
-            if i < 10:
-                mapa_gnral += f"Fila 0{i+1}:\n"
-            else:
-                mapa_gnral += f"Fila {i+1}:\n"
-
-            for j in self.mapaGnral[i]:
-                if j != "XX":
-                    if int(j) < 10:
-                        mapa_gnral += f"0{j} "
-                    else:
-                        mapa_gnral += f"{j} "
-                else:
-                    mapa_gnral += f"{j} "
-            mapa_gnral += "\n"
-            
-        return mapa_gnral
+        return self.mapaGnral.dibujar("General", desde, hasta)
 
-    def mostrar_mapa_vip(self):
+    def mostrar_mapa_vip(self, desde=0, hasta=None):
         """
         Genera una representación en cadena del mapa de asientos de la zona VIP.
         
+        Args:
+            desde (int): La primera fila a mostrar (desde 0).
+            hasta (int): La fila donde termina el rango (excluida), o None para llegar hasta la última.
+
         Returns:
             str: Una cadena que representa el mapa de la zona VIP.
         """
-        mapa_vip = "VIP\n"
-        for i in range(len(self.mapaVip)):
-            if i < 10:
-                mapa_vip += f"Fila 0{i+1}:\n"
-            else:
-                mapa_vip += f"Fila {i+1}:\n"
-
-            for j in self.mapaVip[i]:
-                if j != "XX":
-                    if int(j) < 10:
-                        mapa_vip += f"0{j} "
-                    else:
-                        mapa_vip += f"{j} "
-                else:
-                    mapa_vip += f"{j} "
-            mapa_vip += "\n"
-
-        return mapa_vip
+        return self.mapaVip.dibujar("VIP", desde, hasta)
 
     def verificar_fila_llena(self, fila, tipo_entrada):
         """
@@ -100,24 +89,7 @@ class Estadio:
         Returns:
             bool: True si la fila está completamente ocupada, False de lo contrario.
         """
-        if tipo_entrada == "General":
-            count = 0
-            for i in self.mapaGnral[fila]:
-                if i == "XX":
-                    count += 1
-            if count == len(self.mapaGnral[fila]):
-                return True
-            else:
-                return False
-        else:
-            count = 0
-            for i in self.mapaVip[fila]:
-                if i == "XX":
-                    count += 1
-            if count == len(self.mapaVip[fila]):
-                return True
-            else:
-                return False
+        return self.obtener_mapa(tipo_entrada).fila_llena(fila)
     
     def asiento_ocupado(self, fila, asiento, tipo_entrada):
         """
@@ -131,16 +103,7 @@ class Estadio:
         Returns:
             bool: True si el asiento está ocupado, False de lo contrario.
         """
-        if tipo_entrada == "General":
-            if self.mapaGnral[fila][asiento] != "XX":
-                return False
-            else:
-                return True
-        else:
-            if self.mapaVip[fila][asiento] != "XX":
-                return False
-            else:
-                return True
+        return self.obtener_mapa(tipo_entrada).ocupado(fila, asiento)
             
     def ocupar_asiento(self, fila, asiento, tipo_entrada):
         """
@@ -151,10 +114,7 @@ class Estadio:
             asiento (int): El número del asiento.
             tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
         """
-        if tipo_entrada == "General":
-            self.mapaGnral[fila][asiento] = "XX"
-        else:
-            self.mapaVip[fila][asiento] = "XX"
+        self.obtener_mapa(tipo_entrada).ocupar(fila, asiento)
 
     def mostrar_restaurantes(self):
         """
@@ -190,18 +150,7 @@ class Estadio:
             return True
         
     def calcular_capacidad(self):
-        capacidad_general = 0
-        capacidad_vip = 0
-        
-        for i in range(len(self.mapaGnral)):
-            for j in range(len(self.mapaGnral[i])):
-                capacidad_general += 1
-        
-        for i in range(len(self.mapaVip)):
-            for j in range(len(self.mapaVip[i])):
-                capacidad_vip += 1
-
-        capacidad = [capacidad_general, capacidad_vip]
+        capacidad = [self.mapaGnral.capacidad, self.mapaVip.capacidad]
         
         return capacidad
     
@@ -10,8 +10,9 @@ class Factura:
         subtotal (float): El subtotal de la factura antes de descuentos.
         descuento (float): El descuento aplicado a la factura.
         total (float): El total a pagar después del descuento.
+        id (int): El número de la factura, que es su posición entre todas las facturas, o None hasta que se añade.
     """
-    def __init__(self, cliente, partido, restaurant, detalles_productos, subtotal, descuento, total):
+    def __init__(self, cliente, partido, restaurant, detalles_productos, subtotal, descuento, total, id=None):
         """
         Inicializa una instancia de la clase Factura.
         
@@ -23,6 +24,7 @@ class Factura:
             subtotal (float): El subtotal de la factura antes de descuentos.
             descuento (float): El descuento aplicado a la factura.
             total (float): El total a pagar después del descuento.
+            id (int): El número de la factura, o None para que se lo asigne la aplicación al añadirla.
         """
         self.cliente = cliente
         self.partido = partido
@@ -31,6 +33,7 @@ class Factura:
         self.subtotal = subtotal
         self.descuento = descuento
         self.total = total
+        self.id = id
 
     def producto_en_factura(self, producto):
         cantidad = 0
@@ -58,4 +61,5 @@ class Factura:
             'subtotal': self.subtotal,
             'descuento': self.descuento,
             'total': self.total,
+            'id': self.id,
         }
\ No newline at end of file
@@ -0,0 +1,190 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class GestorReservas:
+    """
+    Clase que mantiene las reservas temporales de los asientos elegidos mientras se completa el pago.
+
+    Cada reserva vence después de una duración fija. Los vencimientos se guardan en un montículo (heap) ordenado por
+    hora de vencimiento, y un hilo de barrido libera los asientos cuyas reservas vencieron sin confirmarse.
+
+    Cada reserva lleva un número propio que solo conoce quien la hizo. Confirmar o cancelar exige ese número, para que
+    quien vuelve tarde a una reserva vencida no se lleve ni libere el asiento que otra taquilla reservó después.
+
+    Atributos:
+        motor_ventas (MotorVentas): El motor con el que se liberan los asientos, usando el candado de cada zona.
+        duracion (float): Los segundos que dura una reserva.
+        intervalo (float): Los segundos entre dos barridos del hilo de barrido.
+        reservas (dict): El número, la hora de vencimiento y el partido de cada reserva activa, por (id del partido, tipo de entrada, fila, asiento).
+        vencimientos (list): El montículo de (hora de vencimiento, número de la reserva, clave de la reserva).
+        numeros (count): El contador que da el número de cada reserva.
+        candado (Lock): El candado que protege las reservas y el montículo.
+        hilo (Thread): El hilo de barrido, o None si todavía no se ha hecho ninguna reserva.
+        detenido (Event): El aviso para que el hilo de barrido termine.
+    """
+    def __init__(self, motor_ventas, duracion=300, intervalo=5):
+        """
+        Inicializa una instancia de la clase GestorReservas.
+
+        Args:
+            motor_ventas (MotorVentas): El motor con el que se liberan los asientos.
+            duracion (float): Los segundos que dura una reserva.
+            intervalo (float): Los segundos entre dos barridos del hilo de barrido.
+        """
+        self.motor_ventas = motor_ventas
+        self.duracion = duracion
+        self.intervalo = intervalo
+        self.reservas = {}
+        self.vencimientos = []
+        self.numeros = itertools.count(1)
+        self.candado = threading.Lock()
+        self.hilo = None
+        self.detenido = threading.Event()
+
+    def reservar(self, partido, fila, asiento, tipo_entrada):
+        """
+        Convierte un asiento ya reclamado con el motor de ventas en una reserva que vence.
+
+        Args:
+            partido (Partido): El partido.
+            fila (int): El número de fila del asiento (desde 0).
+            asiento (int): El número del asiento dentro de la fila (desde 0).
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+
+        Returns:
+            int: El número de la reserva, que hay que pasar a confirmar o liberar.
+        """
+        clave = (partido.id, tipo_entrada, fila, asiento)
+        vence = time.monotonic() + self.duracion
+
+        with self.motor_ventas.candado_zona(partido, tipo_entrada):
+            partido.reservar_asiento(fila, asiento, tipo_entrada)
+
+        with self.candado:
+            numero = next(self.numeros)
+            self.reservas[clave] = (numero, vence, partido)
+            heapq.heappush(self.vencimientos, (vence, numero, clave))
+
+        # El hilo de barrido arranca con la primera reserva
+        if self.hilo is None:
+            self.iniciar_barrido()
+
+        return numero
+
+    def confirmar(self, partido, fila, asiento, tipo_entrada, numero):
+        """
+        Convierte una reserva en una venta si todavía no ha vencido.
+
+        Args:
+            partido (Partido): El partido.
+            fila (int): El número de fila del asiento (desde 0).
+            asiento (int): El número del asiento dentro de la fila (desde 0).
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+            numero (int): El número que devolvió reservar.
+
+        Returns:
+            bool: True si el asiento quedó vendido, False si la reserva ya había vencido o el asiento tiene otra reserva.
+        """
+        clave = (partido.id, tipo_entrada, fila, asiento)
+
+        with self.candado:
+            reserva = self.reservas.get(clave)
+            if reserva is None or reserva[0] != numero:
+                return False
+
+            del self.reservas[clave]
+            if reserva[1] <= time.monotonic():
+                self.motor_ventas.liberar_asiento(partido, fila, asiento, tipo_entrada)
+                return False
+
+            with self.motor_ventas.candado_zona(partido, tipo_entrada):
+                partido.ocupar_asiento(fila, asiento, tipo_entrada)
+            return True
+
+    def liberar(self, partido, fila, asiento, tipo_entrada, numero):
+        """
+        Cancela una reserva y libera el asiento. No hace nada si la reserva ya no existe o el asiento tiene otra reserva.
+
+        Args:
+            partido (Partido): El partido.
+            fila (int): El número de fila del asiento (desde 0).
+            asiento (int): El número del asiento dentro de la fila (desde 0).
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+            numero (int): El número que devolvió reservar.
+        """
+        clave = (partido.id, tipo_entrada, fila, asiento)
+
+        with self.candado:
+            reserva = self.reservas.get(clave)
+            if reserva is not None and reserva[0] == numero:
+                del self.reservas[clave]
+                self.motor_ventas.liberar_asiento(partido, fila, asiento, tipo_entrada)
+
+    def barrer(self, ahora=None):
+        """
+        Libera los asientos de todas las reservas vencidas.
+
+        Las entradas del montículo de reservas ya confirmadas, canceladas o vueltas a reservar se descartan al salir.
+
+        Args:
+            ahora (float): La hora de referencia en segundos de time.monotonic, o None para usar la hora actual.
+
+        Returns:
+            int: La cantidad de asientos liberados.
+        """
+        if ahora is None:
+            ahora = time.monotonic()
+
+        liberados = 0
+        with self.candado:
+            while self.vencimientos and self.vencimientos[0][0] <= ahora:
+                vence, numero, clave = heapq.heappop(self.vencimientos)
+                reserva = self.reservas.get(clave)
+                if reserva is None or reserva[0] != numero:
+                    continue
+
+                del self.reservas[clave]
+                partido_id, tipo_entrada, fila, asiento = clave
+                self.motor_ventas.liberar_asiento(reserva[2], fila, asiento, tipo_entrada)
+                liberados += 1
+
+        return liberados
+
+    def iniciar_barrido(self):
+        """
+        Arranca el hilo que barre las reservas vencidas cada intervalo segundos.
+        """
+        with self.candado:
+            if self.hilo is not None:
+                return
+            self.detenido.clear()
+            self.hilo = threading.Thread(target=self.barrido_periodico, daemon=True)
+        self.hilo.start()
+
+    def barrido_periodico(self):
+        """
+        Barre las reservas vencidas hasta que se detenga el gestor.
+        """
+        while not self.detenido.wait(self.intervalo):
+            self.barrer()
+
+    def detener_barrido(self):
+        """
+        Detiene el hilo de barrido.
+        """
+        self.detenido.set()
+        if self.hilo is not None:
+            self.hilo.join()
+            self.hilo = None
+
+    def cantidad_reservas(self):
+        """
+        Devuelve la cantidad de reservas activas.
+
+        Returns:
+            int: La cantidad de asientos reservados sin confirmar.
+        """
+        return len(self.reservas)
@@ -0,0 +1,132 @@
+import threading
+import time
+
+
+class GuardadoPeriodico:
+    """
+    Clase que guarda los archivos JSON en segundo plano cada cierto tiempo o cada cierta cantidad de cambios, para que
+    un cierre inesperado solo obligue a reproducir el diario desde el último guardado.
+
+    Cada guardado usa App.guardar_cambios: rota el diario y copia las listas que cambiaron (copias superficiales, casi
+    instantáneas) con el candado de cambios de la aplicación; la conversión a JSON y la escritura se hacen después, en
+    el hilo de guardado, sin detener el menú. Cuando los archivos quedan en disco se borra el segmento rotado del diario.
+
+    Atributos:
+        app (App): La aplicación cuyos datos se guardan.
+        intervalo (float): Los segundos máximos entre dos guardados mientras haya cambios.
+        cambios_maximos (int): La cantidad de cambios registrados que adelanta el guardado.
+        cambios_pendientes (int): Los cambios registrados desde el último guardado.
+        historial (list): La duración, la pausa y el tamaño de cada guardado hecho.
+        errores (list): Los errores de los guardados que fallaron.
+        candado (Lock): El candado que protege el contador de cambios.
+        despertar (Event): El aviso para que el hilo de guardado no espere al final del intervalo.
+        detenido (Event): El aviso para que el hilo de guardado termine.
+        hilo (Thread): El hilo de guardado, o None si no se ha iniciado.
+    """
+    def __init__(self, app, intervalo=60, cambios_maximos=500):
+        """
+        Inicializa una instancia de la clase GuardadoPeriodico.
+
+        Args:
+            app (App): La aplicación cuyos datos se guardan.
+            intervalo (float): Los segundos máximos entre dos guardados mientras haya cambios.
+            cambios_maximos (int): La cantidad de cambios registrados que adelanta el guardado.
+        """
+        self.app = app
+        self.intervalo = intervalo
+        self.cambios_maximos = cambios_maximos
+        self.cambios_pendientes = 0
+        self.historial = []
+        self.errores = []
+        self.candado = threading.Lock()
+        self.despertar = threading.Event()
+        self.detenido = threading.Event()
+        self.hilo = None
+
+    def anotar(self, cantidad=1):
+        """
+        Cuenta cambios registrados en el diario y adelanta el guardado si ya se acumularon suficientes.
+
+        Args:
+            cantidad (int): La cantidad de cambios, por ejemplo las entradas de un lote.
+        """
+        with self.candado:
+            self.cambios_pendientes += cantidad
+            if self.cambios_pendientes >= self.cambios_maximos:
+                self.despertar.set()
+
+    def iniciar(self):
+        """
+        Arranca el hilo de guardado.
+        """
+        if self.hilo is not None:
+            return
+        self.detenido.clear()
+        self.hilo = threading.Thread(target=self.guardado_periodico, daemon=True)
+        self.hilo.start()
+
+    def guardado_periodico(self):
+        """
+        Guarda los cambios cada intervalo segundos, o antes si se acumularon suficientes, hasta que se detenga.
+        """
+        while True:
+            self.despertar.wait(self.intervalo)
+            self.despertar.clear()
+            if self.detenido.is_set():
+                return
+            if self.cambios_pendientes > 0:
+                self.guardar()
+
+    def guardar(self):
+        """
+        Guarda las colecciones que cambiaron y anota la duración, la pausa y el tamaño del guardado.
+
+        Returns:
+            dict: Las métricas del guardado, o None si falló; en ese caso se intenta de nuevo en el próximo.
+        """
+        inicio = time.perf_counter()
+        with self.candado:
+            cambios = self.cambios_pendientes
+            self.cambios_pendientes = 0
+
+        # Cualquier error se anota en vez de propagarse: si llegara a guardado_periodico terminaría el hilo sin aviso
+        try:
+            metrica = self.app.guardar_cambios()
+        except Exception as error:
+            with self.candado:
+                self.cambios_pendientes += cambios
+            self.errores.append(error)
+            print(f"\nError en el guardado automatico, se intentara de nuevo: {error!r}\n")
+            return None
+
+        metrica["duracion"] = time.perf_counter() - inicio
+        metrica["cambios"] = cambios
+        self.historial.append(metrica)
+        return metrica
+
+    def detener(self):
+        """
+        Detiene el hilo de guardado, esperando a que termine el guardado en curso.
+        """
+        self.detenido.set()
+        self.despertar.set()
+        if self.hilo is not None:
+            self.hilo.join()
+            self.hilo = None
+
+    def resumen(self):
+        """
+        Resume los guardados hechos en segundo plano.
+
+        Returns:
+            str: La cantidad de guardados, su duración y pausa promedio, el tamaño total escrito y los guardados fallidos.
+        """
+        fallidos = f", {len(self.errores)} fallidos" if self.errores else ""
+        if not self.historial:
+            return f"No se hicieron guardados automaticos{fallidos}."
+
+        duracion = sum(metrica["duracion"] for metrica in self.historial) / len(self.historial)
+        pausa = sum(metrica["pausa"] for metrica in self.historial) / len(self.historial)
+        tamano = sum(metrica["bytes"] for metrica in self.historial)
+        return (f"Guardados automaticos: {len(self.historial)} (promedio {duracion * 1000:.1f} ms, "
+                f"pausa {pausa * 1000:.2f} ms, {tamano / 1024:.1f} KB escritos{fallidos})")
@@ -0,0 +1,263 @@
+import heapq
+import mmap
+import os
+import struct
+
+
+class IndiceClaves:
+    """
+    Clase que representa un índice en disco de los registros de un archivo JSON Lines por el valor de un campo, por
+    ejemplo la cédula del cliente.
+
+    El archivo empieza con una cabecera (hasta qué byte del archivo de datos llega el índice, cuántos pares están
+    ordenados y cuántos hay en total) y sigue con pares de ancho fijo (clave, desplazamiento de la línea). Los primeros
+    pares están ordenados por clave y se buscan por bisección sobre el archivo mapeado con mmap, sin cargarlos en
+    memoria; los añadidos después forman una cola, que se guarda también en un diccionario y se ordena junto con el
+    resto al cerrar cuando ya es grande.
+
+    Las claves más largas que ANCHO_CLAVE se recortan, así que una búsqueda puede devolver desplazamientos de otras
+    claves con el mismo comienzo; quien lee los registros debe comparar el valor completo.
+
+    Atributos:
+        ruta (str): La ruta del archivo del índice.
+        archivo (file): El archivo del índice abierto para añadir pares, o None si está cerrado.
+        mapa (mmap): El archivo del índice mapeado en memoria al abrirlo, o None si no tenía pares.
+        ordenados (int): La cantidad de pares ordenados al principio del archivo.
+        cantidad (int): La cantidad total de pares del archivo.
+        cola (dict): Los desplazamientos de los pares que no están en la parte ordenada, por clave.
+    """
+    CABECERA = struct.Struct("<QQQ")
+    ANCHO_CLAVE = 24
+    PAR = struct.Struct(f"<{ANCHO_CLAVE}sQ")
+
+    # Cantidad mínima de pares en la cola para ordenarlos al cerrar; también se ordenan si la cola supera 1/16 del índice
+    COLA_MINIMA = 4096
+
+    def __init__(self, ruta):
+        """
+        Inicializa una instancia de la clase IndiceClaves.
+
+        Args:
+            ruta (str): La ruta del archivo del índice.
+        """
+        self.ruta = ruta
+        self.archivo = None
+        self.mapa = None
+        self.ordenados = 0
+        self.cantidad = 0
+        self.cola = {}
+
+    @classmethod
+    def clave(cls, valor):
+        """
+        Convierte el valor de un campo en la clave de ancho fijo que se guarda en el índice.
+
+        Args:
+            valor: El valor del campo.
+
+        Returns:
+            bytes: La clave, recortada o completada con ceros hasta ANCHO_CLAVE bytes.
+        """
+        return str(valor).encode("utf-8")[:cls.ANCHO_CLAVE].ljust(cls.ANCHO_CLAVE, b"\0")
+
+    @classmethod
+    def exacta(cls, valor):
+        """
+        Indica si la clave de un valor lo representa completo, es decir, si no hubo que recortarlo.
+
+        Args:
+            valor: El valor del campo.
+
+        Returns:
+            bool: True si el valor cabe en ANCHO_CLAVE bytes.
+        """
+        return len(str(valor).encode("utf-8")) <= cls.ANCHO_CLAVE
+
+    def abrir(self, largo_datos):
+        """
+        Abre el índice y descarta los pares que se añadieron después del último cierre, porque pueden estar incompletos.
+
+        Args:
+            largo_datos (int): El largo actual del archivo de datos, en bytes.
+
+        Returns:
+            int: El byte del archivo de datos hasta el que llega el índice; las líneas siguientes se deben volver a añadir.
+        """
+        cubierto, self.ordenados, self.cantidad = 0, 0, 0
+        if os.path.exists(self.ruta):
+            with open(self.ruta, "rb") as archivo:
+                cabecera = archivo.read(self.CABECERA.size)
+            if len(cabecera) == self.CABECERA.size:
+                cubierto, ordenados, cantidad = self.CABECERA.unpack(cabecera)
+                tamano = os.path.getsize(self.ruta)
+                if cubierto <= largo_datos and ordenados <= cantidad and self.CABECERA.size + cantidad * self.PAR.size <= tamano:
+                    self.ordenados, self.cantidad = ordenados, cantidad
+                else:
+                    cubierto = 0
+
+        if not os.path.exists(self.ruta):
+            open(self.ruta, "wb").close()
+        self.archivo = open(self.ruta, "rb+")
+        self.archivo.truncate(self.CABECERA.size + self.cantidad * self.PAR.size)
+        if self.cantidad == 0:
+            cubierto = 0
+            self.archivo.seek(0)
+            self.archivo.write(self.CABECERA.pack(0, 0, 0))
+            self.archivo.flush()
+        else:
+            self.mapa = mmap.mmap(self.archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Los pares de la cola se guardan en memoria; la parte ordenada se lee del mapa
+        self.cola = {}
+        for i in range(self.ordenados, self.cantidad):
+            clave, desplazamiento = self.PAR.unpack_from(self.mapa, self.CABECERA.size + i * self.PAR.size)
+            self.cola.setdefault(clave, []).append(desplazamiento)
+
+        self.archivo.seek(0, os.SEEK_END)
+        return cubierto
+
+    def agregar(self, valor, desplazamiento):
+        """
+        Añade un par al final del índice y a la cola.
+
+        Args:
+            valor: El valor del campo del registro.
+            desplazamiento (int): El byte donde empieza la línea del registro en el archivo de datos.
+        """
+        clave = self.clave(valor)
+        self.archivo.write(self.PAR.pack(clave, desplazamiento))
+        self.cola.setdefault(clave, []).append(desplazamiento)
+        self.cantidad += 1
+
+    def rango(self, clave):
+        """
+        Busca por bisección los pares de una clave en la parte ordenada.
+
+        Args:
+            clave (bytes): La clave de ancho fijo.
+
+        Returns:
+            tuple: Las posiciones del primer par con la clave y del primero después de ellos.
+        """
+        inicio = 0
+        fin = self.ordenados
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            posicion = self.CABECERA.size + medio * self.PAR.size
+            if self.mapa[posicion:posicion + self.ANCHO_CLAVE] < clave:
+                inicio = medio + 1
+            else:
+                fin = medio
+
+        final = inicio
+        fin = self.ordenados
+        while final < fin:
+            medio = (final + fin) // 2
+            posicion = self.CABECERA.size + medio * self.PAR.size
+            if self.mapa[posicion:posicion + self.ANCHO_CLAVE] <= clave:
+                final = medio + 1
+            else:
+                fin = medio
+        return inicio, final
+
+    def buscar(self, valor):
+        """
+        Busca los desplazamientos de los registros con un valor.
+
+        Args:
+            valor: El valor del campo.
+
+        Returns:
+            list: Los desplazamientos de las líneas, en el orden en que se añadieron.
+        """
+        clave = self.clave(valor)
+        inicio, fin = self.rango(clave)
+
+        desplazamientos = []
+        for i in range(inicio, fin):
+            desplazamientos.append(self.PAR.unpack_from(self.mapa, self.CABECERA.size + i * self.PAR.size)[1])
+        desplazamientos.extend(self.cola.get(clave, []))
+        return desplazamientos
+
+    def contar(self, valor):
+        """
+        Cuenta los pares de un valor sin leer sus desplazamientos.
+
+        Args:
+            valor: El valor del campo.
+
+        Returns:
+            int: La cantidad de pares con la clave del valor.
+        """
+        clave = self.clave(valor)
+        inicio, fin = self.rango(clave)
+        return fin - inicio + len(self.cola.get(clave, []))
+
+    def pares_ordenados(self):
+        """
+        Recorre los pares de la parte ordenada.
+
+        Yields:
+            tuple: La clave y el desplazamiento de cada par.
+        """
+        for i in range(self.ordenados):
+            yield self.PAR.unpack_from(self.mapa, self.CABECERA.size + i * self.PAR.size)
+
+    def escribir_temporal(self, pares, cubierto, ruta=None):
+        """
+        Escribe un índice con todos sus pares ordenados en un archivo con la extensión .tmp y lo fuerza al disco.
+
+        Args:
+            pares (iterable): Los pares (clave, desplazamiento), ya ordenados.
+            cubierto (int): El byte del archivo de datos hasta el que llega el índice.
+            ruta (str): La ruta del índice definitivo, o None para usar la de este índice.
+
+        Returns:
+            int: La cantidad de pares escritos.
+        """
+        cantidad = 0
+        with open((ruta or self.ruta) + ".tmp", "wb") as archivo:
+            archivo.write(self.CABECERA.pack(0, 0, 0))
+            for par in pares:
+                archivo.write(self.PAR.pack(*par))
+                cantidad += 1
+            archivo.seek(0)
+            archivo.write(self.CABECERA.pack(cubierto, cantidad, cantidad))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        return cantidad
+
+    def cerrar(self, cubierto):
+        """
+        Cierra el índice anotando hasta dónde llega. Si la cola ya es grande, antes la ordena junto con el resto.
+
+        Args:
+            cubierto (int): El byte del archivo de datos hasta el que llega el índice.
+        """
+        if self.archivo is None:
+            return
+
+        cola = self.cantidad - self.ordenados
+        if cola >= max(self.COLA_MINIMA, self.ordenados // 16):
+            pares = sorted((clave, desplazamiento) for clave, desplazamientos in self.cola.items() for desplazamiento in desplazamientos)
+            self.escribir_temporal(heapq.merge(self.pares_ordenados(), pares), cubierto)
+            self.cerrar_archivo()
+            os.replace(self.ruta + ".tmp", self.ruta)
+            return
+
+        self.archivo.seek(0)
+        self.archivo.write(self.CABECERA.pack(cubierto, self.ordenados, self.cantidad))
+        self.archivo.flush()
+        os.fsync(self.archivo.fileno())
+        self.cerrar_archivo()
+
+    def cerrar_archivo(self):
+        """
+        Libera el mapa y el archivo del índice sin escribir nada.
+        """
+        if self.mapa is not None:
+            self.mapa.close()
+            self.mapa = None
+        self.archivo.close()
+        self.archivo = None
+        self.cola = {}
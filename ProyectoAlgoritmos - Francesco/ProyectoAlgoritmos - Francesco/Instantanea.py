@@ -0,0 +1,131 @@
+import gc
+import json
+import os
+import pickle
+import struct
+
+
+class Instantanea:
+    """
+    Clase que guarda y carga una instantánea binaria de los datos de la aplicación, para arrancar sin volver a leer
+    los archivos JSON ni reconstruir cada objeto desde su diccionario. Las entradas y facturas no forman parte de ella:
+    están en sus archivos JSON Lines, que se abren sin leerlas.
+
+    El archivo empieza con una cabecera de tamaño fijo (firma MAGIA, VERSION, cantidad de búferes y largos), sigue la
+    firma de los archivos JSON a los que equivale, después el flujo de pickle (protocolo 5) con los objetos e índices,
+    y al final los búferes fuera de banda con los asientos de cada mapa, cada uno precedido por su largo.
+
+    La instantánea es una copia de los archivos JSON: si alguno cambió después de guardarla, ya no se usa. Como usa
+    pickle, solo se deben cargar instantáneas escritas por la propia aplicación.
+
+    Atributos:
+        ruta (str): La ruta del archivo de la instantánea.
+        archivos (tuple): Las rutas de los archivos JSON a los que equivale la instantánea.
+    """
+    MAGIA = b"EUROSNAP"
+    VERSION = 2
+    CABECERA = struct.Struct("<8sIIQQ")
+    LARGO = struct.Struct("<Q")
+
+    def __init__(self, ruta="instantanea.bin", archivos=()):
+        """
+        Inicializa una instancia de la clase Instantanea.
+
+        Args:
+            ruta (str): La ruta del archivo de la instantánea.
+            archivos (tuple): Las rutas de los archivos JSON a los que equivale la instantánea.
+        """
+        self.ruta = ruta
+        self.archivos = archivos
+
+    def firma(self):
+        """
+        Calcula la firma de los archivos JSON: el tamaño y la fecha de modificación de cada uno.
+
+        Returns:
+            list: El [ruta, tamaño, fecha en nanosegundos] de cada archivo, o [ruta, None, None] si no existe.
+        """
+        firma = []
+        for ruta in self.archivos:
+            if os.path.exists(ruta):
+                estado = os.stat(ruta)
+                firma.append([ruta, estado.st_size, estado.st_mtime_ns])
+            else:
+                firma.append([ruta, None, None])
+        return firma
+
+    def guardar(self, datos):
+        """
+        Escribe la instantánea en un archivo temporal y lo reemplaza de una vez.
+
+        Args:
+            datos (dict): Los objetos a guardar, por nombre del atributo de la aplicación.
+
+        Returns:
+            int: El tamaño del archivo escrito, en bytes.
+        """
+        buferes = []
+        flujo = pickle.dumps(datos, protocol=5, buffer_callback=buferes.append)
+        firma = json.dumps(self.firma()).encode("utf-8")
+
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(self.CABECERA.pack(self.MAGIA, self.VERSION, len(buferes), len(firma), len(flujo)))
+            archivo.write(firma)
+            archivo.write(flujo)
+            for bufer in buferes:
+                memoria = bufer.raw()
+                archivo.write(self.LARGO.pack(memoria.nbytes))
+                archivo.write(memoria)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+            tamano = archivo.tell()
+        os.replace(temporal, self.ruta)
+        return tamano
+
+    def cargar(self):
+        """
+        Lee la instantánea si existe y sigue coincidiendo con los archivos JSON.
+
+        Returns:
+            dict: Los objetos guardados, por nombre del atributo de la aplicación, o None si no hay instantánea o los
+            archivos JSON cambiaron después de guardarla.
+
+        Raises:
+            ValueError: Si el archivo no es una instantánea o es de otra versión.
+        """
+        if not os.path.exists(self.ruta):
+            return None
+
+        with open(self.ruta, "rb") as archivo:
+            cabecera = archivo.read(self.CABECERA.size)
+            if len(cabecera) != self.CABECERA.size:
+                raise ValueError("El archivo de la instantanea esta incompleto")
+
+            magia, version, cantidad_buferes, largo_firma, largo_flujo = self.CABECERA.unpack(cabecera)
+            if magia != self.MAGIA:
+                raise ValueError("El archivo no es una instantanea de la aplicacion")
+            if version != self.VERSION:
+                raise ValueError(f"La instantanea es de la version {version} y se esperaba la {self.VERSION}")
+
+            # La firma se compara antes de leer el resto, para no deserializar una instantánea vieja
+            if json.loads(archivo.read(largo_firma)) != self.firma():
+                return None
+
+            flujo = archivo.read(largo_flujo)
+
+            # Cada búfer se lee directamente en el bytearray que usará el mapa de asientos
+            buferes = []
+            for i in range(cantidad_buferes):
+                bufer = bytearray(self.LARGO.unpack(archivo.read(self.LARGO.size))[0])
+                archivo.readinto(bufer)
+                buferes.append(bufer)
+
+        # Se crean millones de objetos sin ciclos nuevos; el recolector de ciclos solo retrasaría la carga
+        recolector = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(flujo, buffers=buferes)
+        finally:
+            if recolector:
+                gc.enable()
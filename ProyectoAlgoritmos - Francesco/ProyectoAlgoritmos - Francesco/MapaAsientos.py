@@ -0,0 +1,426 @@
+from array import array
+import base64
+import bisect
+import pickle
+
+
+class MapaAsientos:
+    """
+    Clase que representa el mapa de asientos de una zona, guardado como un bytearray con un byte por asiento.
+
+    Los asientos se direccionan por fila y asiento (ambos desde 0). Cada fila tiene asientos_por_fila asientos,
+    salvo la última, que tiene los que resten para completar la capacidad.
+
+    Atributos:
+        capacidad (int): La cantidad total de asientos de la zona.
+        asientos_por_fila (int): La cantidad de asientos de cada fila completa.
+        asientos (bytearray): El estado de cada asiento, LIBRE, OCUPADO o RESERVADO (tomado por una compra en curso).
+        libres_fila (array): La cantidad de asientos libres de cada fila.
+        libres (int): La cantidad de asientos libres de la zona.
+        tramos (dict): Los tramos libres [inicio, fin) de cada fila, calculados solo para las filas consultadas o modificadas.
+        tramo_maximo (array): El largo del tramo libre más largo de cada fila.
+        filas_dibujadas (dict): El texto ya generado de cada fila, que se descarta cuando cambia algún asiento de la fila.
+    """
+    LIBRE = 0
+    OCUPADO = 1
+    RESERVADO = 2
+
+    # Tablas para pasar de un byte por asiento a los caracteres "0"/"1" y de vuelta; los reservados se guardan libres
+    A_BITS = bytes([ord("0"), ord("1")] + [ord("0")] * 254)
+    DESDE_BITS = bytes.maketrans(b"01", bytes([LIBRE, OCUPADO]))
+
+    # Tabla para copiar los asientos con las reservas liberadas
+    SIN_RESERVAS = bytes.maketrans(bytes([RESERVADO]), bytes([LIBRE]))
+
+    def __init__(self, capacidad, asientos_por_fila=10, asientos=None):
+        """
+        Inicializa una instancia de la clase MapaAsientos.
+
+        Args:
+            capacidad (int): La cantidad total de asientos de la zona.
+            asientos_por_fila (int): La cantidad de asientos de cada fila completa.
+            asientos (bytearray): El estado inicial de los asientos, o None para empezar con todos libres.
+        """
+        self.capacidad = capacidad
+        self.asientos_por_fila = asientos_por_fila
+        if asientos is None:
+            asientos = bytearray(capacidad)
+        self.asientos = asientos
+
+        # Cuenta los asientos libres por fila una sola vez; luego se actualizan al ocupar y liberar
+        self.libres_fila = array("I")
+        for fila in range(self.cantidad_filas()):
+            inicio = self.posicion(fila, 0)
+            self.libres_fila.append(asientos.count(self.LIBRE, inicio, inicio + self.largo_fila(fila)))
+        self.libres = sum(self.libres_fila)
+
+        self.filas_dibujadas = {}
+
+        # Las filas completamente libres u ocupadas no necesitan calcular sus tramos
+        self.tramos = {}
+        self.tramo_maximo = array("I")
+        for fila in range(self.cantidad_filas()):
+            if self.libres_fila[fila] == self.largo_fila(fila) or self.libres_fila[fila] == 0:
+                self.tramo_maximo.append(self.libres_fila[fila])
+            else:
+                self.tramo_maximo.append(self.calcular_tramo_maximo(fila))
+
+    def cantidad_filas(self):
+        """
+        Calcula la cantidad de filas del mapa.
+
+        Returns:
+            int: La cantidad de filas.
+        """
+        return -(-self.capacidad // self.asientos_por_fila)
+
+    def largo_fila(self, fila):
+        """
+        Calcula la cantidad de asientos de una fila.
+
+        Args:
+            fila (int): El número de fila.
+
+        Returns:
+            int: La cantidad de asientos de la fila.
+        """
+        return min(self.asientos_por_fila, self.capacidad - fila * self.asientos_por_fila)
+
+    def posicion(self, fila, asiento):
+        """
+        Calcula la posición de un asiento dentro del bytearray.
+
+        Args:
+            fila (int): El número de fila del asiento.
+            asiento (int): El número del asiento dentro de la fila.
+
+        Returns:
+            int: La posición del asiento.
+        """
+        return fila * self.asientos_por_fila + asiento
+
+    def ocupado(self, fila, asiento):
+        """
+        Verifica si un asiento está ocupado.
+
+        Args:
+            fila (int): El número de fila del asiento.
+            asiento (int): El número del asiento dentro de la fila.
+
+        Returns:
+            bool: True si el asiento está ocupado, False de lo contrario.
+        """
+        return self.asientos[self.posicion(fila, asiento)] != self.LIBRE
+
+    def ocupar(self, fila, asiento):
+        """
+        Marca un asiento como ocupado.
+
+        Args:
+            fila (int): El número de fila del asiento.
+            asiento (int): El número del asiento dentro de la fila.
+        """
+        posicion = self.posicion(fila, asiento)
+        if self.asientos[posicion] == self.LIBRE:
+            self.libres_fila[fila] -= 1
+            self.libres -= 1
+
+            # Parte el tramo libre que contiene al asiento
+            tramos = self.tramos_fila(fila)
+            i = bisect.bisect_right(tramos, asiento, key=lambda tramo: tramo[0]) - 1
+            inicio, fin = tramos[i]
+            partes = []
+            if inicio < asiento:
+                partes.append([inicio, asiento])
+            if asiento + 1 < fin:
+                partes.append([asiento + 1, fin])
+            tramos[i:i + 1] = partes
+            self.tramo_maximo[fila] = self.calcular_tramo_maximo(fila)
+            self.filas_dibujadas.pop(fila, None)
+        self.asientos[posicion] = self.OCUPADO
+
+    def reservar(self, fila, asiento):
+        """
+        Marca un asiento como reservado. Cuenta como ocupado, pero no se guarda al codificar el mapa.
+
+        Args:
+            fila (int): El número de fila del asiento.
+            asiento (int): El número del asiento dentro de la fila.
+        """
+        self.ocupar(fila, asiento)
+        self.asientos[self.posicion(fila, asiento)] = self.RESERVADO
+
+    def liberar(self, fila, asiento):
+        """
+        Marca un asiento como libre.
+
+        Args:
+            fila (int): El número de fila del asiento.
+            asiento (int): El número del asiento dentro de la fila.
+        """
+        posicion = self.posicion(fila, asiento)
+        if self.asientos[posicion] != self.LIBRE:
+            self.libres_fila[fila] += 1
+            self.libres += 1
+
+            # Inserta el asiento como tramo libre y lo une con los tramos vecinos
+            tramos = self.tramos_fila(fila)
+            i = bisect.bisect_right(tramos, asiento, key=lambda tramo: tramo[0])
+            nuevo = [asiento, asiento + 1]
+            if i > 0 and tramos[i - 1][1] == asiento:
+                i -= 1
+                nuevo[0] = tramos.pop(i)[0]
+            if i < len(tramos) and tramos[i][0] == asiento + 1:
+                nuevo[1] = tramos.pop(i)[1]
+            tramos.insert(i, nuevo)
+            self.tramo_maximo[fila] = self.calcular_tramo_maximo(fila)
+            self.filas_dibujadas.pop(fila, None)
+        self.asientos[posicion] = self.LIBRE
+
+    def tramos_fila(self, fila):
+        """
+        Devuelve los tramos de asientos libres consecutivos de una fila, calculándolos la primera vez.
+
+        Args:
+            fila (int): El número de fila.
+
+        Returns:
+            list: Una lista ordenada de tramos [inicio, fin), con fin excluido.
+        """
+        if fila not in self.tramos:
+            inicio_fila = self.posicion(fila, 0)
+            tramos = []
+            inicio = None
+            for asiento in range(self.largo_fila(fila)):
+                if self.asientos[inicio_fila + asiento] == self.LIBRE:
+                    if inicio is None:
+                        inicio = asiento
+                elif inicio is not None:
+                    tramos.append([inicio, asiento])
+                    inicio = None
+            if inicio is not None:
+                tramos.append([inicio, self.largo_fila(fila)])
+            self.tramos[fila] = tramos
+
+        return self.tramos[fila]
+
+    def calcular_tramo_maximo(self, fila):
+        """
+        Calcula el largo del tramo libre más largo de una fila.
+
+        Args:
+            fila (int): El número de fila.
+
+        Returns:
+            int: La cantidad de asientos libres consecutivos del tramo más largo.
+        """
+        maximo = 0
+        for inicio, fin in self.tramos_fila(fila):
+            maximo = max(maximo, fin - inicio)
+        return maximo
+
+    def buscar_contiguos(self, cantidad, filas=None):
+        """
+        Busca una cantidad de asientos libres consecutivos en una misma fila, sin ocuparlos.
+
+        Las filas se recorren en el orden de preferencia dado y se descartan con el largo de su tramo libre
+        más largo, sin revisar sus asientos.
+
+        Args:
+            cantidad (int): La cantidad de asientos consecutivos buscados.
+            filas (list): Los números de fila en orden de preferencia, o None para ir de la primera a la última.
+
+        Returns:
+            list: Una lista de [fila, asiento] (ambos desde 1), o None si no hay espacio.
+        """
+        if cantidad <= 0 or cantidad > self.libres:
+            return None
+
+        if filas is None:
+            filas = range(self.cantidad_filas())
+
+        for fila in filas:
+            if self.tramo_maximo[fila] >= cantidad:
+                for inicio, fin in self.tramos_fila(fila):
+                    if fin - inicio >= cantidad:
+                        asientos = []
+                        for asiento in range(inicio, inicio + cantidad):
+                            asientos.append([fila + 1, asiento + 1])
+                        return asientos
+
+        return None
+
+    def buscar_libres(self, cantidad, filas=None):
+        """
+        Busca una cantidad de asientos libres, llenando las filas en orden de preferencia, sin ocuparlos.
+
+        Las filas llenas se descartan con su contador de asientos libres y las demás se recorren por sus tramos libres.
+
+        Args:
+            cantidad (int): La cantidad de asientos buscados.
+            filas (list): Los números de fila en orden de preferencia, o None para ir de la primera a la última.
+
+        Returns:
+            list: Una lista de [fila, asiento] (ambos desde 1), o None si no quedan suficientes asientos libres.
+        """
+        if cantidad <= 0 or cantidad > self.libres:
+            return None
+
+        if filas is None:
+            filas = range(self.cantidad_filas())
+
+        asientos = []
+        for fila in filas:
+            if self.libres_fila[fila] > 0:
+                for inicio, fin in self.tramos_fila(fila):
+                    for asiento in range(inicio, min(fin, inicio + cantidad - len(asientos))):
+                        asientos.append([fila + 1, asiento + 1])
+                    if len(asientos) == cantidad:
+                        return asientos
+
+        return None
+
+    def mejor_disponible(self, filas=None):
+        """
+        Busca el primer asiento libre según un orden de preferencia de filas, sin ocuparlo.
+
+        Args:
+            filas (list): Los números de fila en orden de preferencia, o None para ir de la primera a la última.
+
+        Returns:
+            list: El asiento como [fila, asiento] (ambos desde 1), o None si la zona está agotada.
+        """
+        asientos = self.buscar_contiguos(1, filas)
+        if asientos is None:
+            return None
+        return asientos[0]
+
+    def fila_llena(self, fila):
+        """
+        Verifica si todos los asientos de una fila están ocupados.
+
+        Args:
+            fila (int): El número de fila.
+
+        Returns:
+            bool: True si la fila está completamente ocupada, False de lo contrario.
+        """
+        return self.libres_fila[fila] == 0
+
+    def zona_agotada(self):
+        """
+        Verifica si todos los asientos de la zona están ocupados.
+
+        Returns:
+            bool: True si no queda ningún asiento libre, False de lo contrario.
+        """
+        return self.libres == 0
+
+    def asientos_libres(self):
+        """
+        Devuelve la cantidad de asientos libres de la zona.
+
+        Returns:
+            int: La cantidad de asientos libres.
+        """
+        return self.libres
+
+    def copiar(self):
+        """
+        Crea una copia independiente del mapa.
+
+        Returns:
+            MapaAsientos: Un mapa con la misma capacidad y el mismo estado de asientos.
+        """
+        return MapaAsientos(self.capacidad, self.asientos_por_fila, bytearray(self.asientos))
+
+    def __reduce_ex__(self, protocolo):
+        """
+        Indica a pickle cómo guardar el mapa: solo la capacidad, el largo de las filas y los asientos, sin las reservas.
+
+        Con el protocolo 5 los asientos se entregan como un búfer aparte (fuera de banda), que se escribe y se lee
+        tal cual sin copiarlo dentro del flujo de pickle. Los contadores y tramos se recalculan al reconstruir el mapa.
+
+        Args:
+            protocolo (int): El protocolo de pickle en uso.
+
+        Returns:
+            tuple: La clase y los argumentos con los que se reconstruye el mapa.
+        """
+        asientos = self.asientos.translate(self.SIN_RESERVAS)
+        if protocolo >= 5:
+            asientos = pickle.PickleBuffer(asientos)
+        return (MapaAsientos, (self.capacidad, self.asientos_por_fila, asientos))
+
+    def codificar(self):
+        """
+        Codifica la ocupación del mapa como un conjunto de bits en base64, un bit por asiento.
+
+        Los asientos reservados se codifican como libres, porque la reserva no sobrevive a un reinicio.
+
+        Returns:
+            str: La ocupación codificada, con el bit i en 1 si el asiento en la posición i está vendido.
+        """
+        if self.capacidad == 0:
+            return ""
+
+        # El primer asiento queda en el bit menos significativo
+        bits = int(self.asientos.translate(self.A_BITS)[::-1], 2)
+        return base64.b64encode(bits.to_bytes((self.capacidad + 7) // 8, "little")).decode("ascii")
+
+    def restaurar(self, texto):
+        """
+        Crea un mapa con la misma capacidad y la ocupación guardada con codificar.
+
+        Args:
+            texto (str): La ocupación codificada en base64.
+
+        Returns:
+            MapaAsientos: Un mapa nuevo con los asientos ocupados marcados.
+        """
+        bits = int.from_bytes(base64.b64decode(texto), "little")
+        asientos = bytearray(format(bits, f"0{self.capacidad}b")[::-1][:self.capacidad], "ascii")
+        return MapaAsientos(self.capacidad, self.asientos_por_fila, asientos.translate(self.DESDE_BITS))
+
+    def dibujar_fila(self, fila):
+        """
+        Genera el texto de una fila, marcando con XX los asientos ocupados. El texto se guarda hasta que cambie la fila.
+
+        Args:
+            fila (int): El número de fila.
+
+        Returns:
+            str: Una cadena con el encabezado y los asientos de la fila.
+        """
+        if fila not in self.filas_dibujadas:
+            inicio_fila = self.posicion(fila, 0)
+            asientos = []
+            for j in range(self.largo_fila(fila)):
+                if self.asientos[inicio_fila + j] != self.LIBRE:
+                    asientos.append("XX ")
+                else:
+                    asientos.append(f"{j+1:02d} ")
+            self.filas_dibujadas[fila] = f"Fila {fila+1:02d}:\n{''.join(asientos)}\n"
+
+        return self.filas_dibujadas[fila]
+
+    def dibujar(self, titulo, desde=0, hasta=None):
+        """
+        Genera una representación en cadena del mapa, o de un rango de filas, marcando con XX los asientos ocupados.
+
+        Args:
+            titulo (str): El título de la zona, por ejemplo "General" o "VIP".
+            desde (int): La primera fila a mostrar.
+            hasta (int): La fila donde termina el rango (excluida), o None para llegar hasta la última.
+
+        Returns:
+            str: Una cadena que representa el mapa.
+        """
+        if hasta is None:
+            hasta = self.cantidad_filas()
+
+        filas = [f"{titulo}\n"]
+        for fila in range(desde, min(hasta, self.cantidad_filas())):
+            filas.append(self.dibujar_fila(fila))
+
+        return "".join(filas)
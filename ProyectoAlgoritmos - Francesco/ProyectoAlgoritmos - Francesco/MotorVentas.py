@@ -0,0 +1,207 @@
+import threading
+
+
+class MotorVentas:
+    """
+    Clase que coordina la venta de entradas para que varias taquillas (hilos) puedan vender sobre los mismos partidos.
+
+    Cada zona de cada partido tiene su propio candado, de modo que las ventas de zonas o partidos distintos no se bloquean
+    entre sí. La verificación y la ocupación de un asiento se hacen dentro del mismo candado, como una sola operación.
+
+    Atributos:
+        app (App): La aplicación cuyas entradas se registran.
+        candados (dict): El candado de cada zona, por (id del partido, tipo de entrada).
+        candado_candados (Lock): El candado que protege la creación de candados de zona.
+        candado_entradas (Lock): El candado que protege los identificadores y el registro de entradas.
+        siguiente_id (int): El identificador que recibirá la próxima entrada vendida.
+    """
+    def __init__(self, app):
+        """
+        Inicializa una instancia de la clase MotorVentas.
+
+        Args:
+            app (App): La aplicación cuyas entradas se registran.
+        """
+        self.app = app
+        self.candados = {}
+        self.candado_candados = threading.Lock()
+        self.candado_entradas = threading.Lock()
+        self.siguiente_id = 1
+        self.reiniciar_ids()
+
+    def reiniciar_ids(self):
+        """
+        Ajusta el próximo identificador al mayor identificador de las entradas registradas. Se usa después de cargar o eliminar entradas.
+        """
+        with self.candado_entradas:
+            self.siguiente_id = self.app.registro_entradas.ultimo_id() + 1
+
+    def nuevo_id(self):
+        """
+        Reserva el identificador de una nueva entrada.
+
+        Returns:
+            int: Un identificador que no se ha entregado a ninguna otra entrada.
+        """
+        with self.candado_entradas:
+            id = self.siguiente_id
+            self.siguiente_id += 1
+        return id
+
+    def nuevos_ids(self, cantidad):
+        """
+        Reserva los identificadores de un lote de entradas en una sola operación.
+
+        Args:
+            cantidad (int): La cantidad de entradas del lote.
+
+        Returns:
+            range: Los identificadores consecutivos reservados para el lote.
+        """
+        with self.candado_entradas:
+            ids = range(self.siguiente_id, self.siguiente_id + cantidad)
+            self.siguiente_id += cantidad
+        return ids
+
+    def candado_zona(self, partido, tipo_entrada):
+        """
+        Devuelve el candado de una zona de un partido, creándolo la primera vez.
+
+        Args:
+            partido (Partido): El partido.
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+
+        Returns:
+            Lock: El candado de la zona.
+        """
+        clave = (partido.id, tipo_entrada)
+        candado = self.candados.get(clave)
+        if candado is None:
+            with self.candado_candados:
+                candado = self.candados.setdefault(clave, threading.Lock())
+        return candado
+
+    def reclamar_asiento(self, partido, fila, asiento, tipo_entrada):
+        """
+        Ocupa un asiento solo si sigue libre, en una sola operación (comparar y asignar).
+
+        Args:
+            partido (Partido): El partido.
+            fila (int): El número de fila del asiento (desde 0).
+            asiento (int): El número del asiento dentro de la fila (desde 0).
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+
+        Returns:
+            bool: True si el asiento quedó ocupado por esta llamada, False si ya estaba ocupado.
+        """
+        with self.candado_zona(partido, tipo_entrada):
+            if partido.asiento_ocupado(fila, asiento, tipo_entrada):
+                return False
+            partido.ocupar_asiento(fila, asiento, tipo_entrada)
+            return True
+
+    def reclamar_mejor_asiento(self, partido, tipo_entrada, filas=None):
+        """
+        Busca y ocupa el mejor asiento libre de una zona sin que otra taquilla pueda tomarlo en medio.
+
+        Args:
+            partido (Partido): El partido.
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+            filas (list): Los números de fila (desde 0) en orden de preferencia, o None para ir de la primera a la última.
+
+        Returns:
+            list: El asiento como [fila, asiento] (ambos desde 1), o None si la zona está agotada.
+        """
+        with self.candado_zona(partido, tipo_entrada):
+            return partido.asignar_mejor_asiento(tipo_entrada, filas)
+
+    def reclamar_contiguos(self, partido, tipo_entrada, cantidad, filas=None):
+        """
+        Busca y ocupa una cantidad de asientos consecutivos sin que otra taquilla pueda tomarlos en medio.
+
+        Args:
+            partido (Partido): El partido.
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+            cantidad (int): La cantidad de asientos consecutivos.
+            filas (list): Los números de fila (desde 0) en orden de preferencia, o None para ir de la primera a la última.
+
+        Returns:
+            list: Una lista de [fila, asiento] (ambos desde 1), o None si no hay espacio.
+        """
+        with self.candado_zona(partido, tipo_entrada):
+            return partido.asignar_asientos(tipo_entrada, cantidad, filas)
+
+    def reclamar_lote(self, partido, tipo_entrada, cantidad=None, asientos=None):
+        """
+        Ocupa todos los asientos de un lote o ninguno, sin que otra taquilla pueda tomarlos en medio.
+
+        Args:
+            partido (Partido): El partido.
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+            cantidad (int): La cantidad de asientos a asignar automáticamente, o None si se dan los asientos.
+            asientos (list): Los asientos pedidos como [fila, asiento] (ambos desde 1), o None si se da la cantidad.
+
+        Returns:
+            list: Los asientos ocupados como [fila, asiento] (ambos desde 1).
+
+        Raises:
+            ValueError: Si no quedan suficientes asientos libres o algún asiento pedido no existe o está ocupado.
+        """
+        with self.candado_zona(partido, tipo_entrada):
+            if asientos is None:
+                asignados = partido.asignar_libres(tipo_entrada, cantidad)
+                if asignados is None:
+                    raise ValueError(f"No quedan {cantidad} asientos libres en la zona {tipo_entrada}")
+                return asignados
+
+            # Valida el lote completo antes de ocupar cualquier asiento
+            mapa = partido.obtener_mapa(tipo_entrada)
+            pedidos = set()
+            for fila, asiento in asientos:
+                if not 1 <= fila <= mapa.cantidad_filas() or not 1 <= asiento <= mapa.largo_fila(fila - 1):
+                    raise ValueError(f"El asiento {fila}, {asiento} no existe en la zona {tipo_entrada}")
+                if (fila, asiento) in pedidos or mapa.ocupado(fila - 1, asiento - 1):
+                    raise ValueError(f"El asiento {fila}, {asiento} no esta disponible")
+                pedidos.add((fila, asiento))
+
+            asignados = []
+            for fila, asiento in asientos:
+                partido.ocupar_asiento(fila - 1, asiento - 1, tipo_entrada)
+                asignados.append([fila, asiento])
+            return asignados
+
+    def liberar_asiento(self, partido, fila, asiento, tipo_entrada):
+        """
+        Libera un asiento reclamado cuya compra no se completó.
+
+        Args:
+            partido (Partido): El partido.
+            fila (int): El número de fila del asiento (desde 0).
+            asiento (int): El número del asiento dentro de la fila (desde 0).
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+        """
+        with self.candado_zona(partido, tipo_entrada):
+            partido.liberar_asiento(fila, asiento, tipo_entrada)
+
+    def registrar_entrada(self, entrada):
+        """
+        Añade una entrada vendida a la lista de entradas de la aplicación y a sus índices, y la registra en el diario.
+
+        Args:
+            entrada (Entrada): La entrada vendida.
+        """
+        with self.candado_entradas:
+            self.app.agregar_entrada(entrada)
+        self.app.persistir("entrada", entrada.diccionario())
+
+    def registrar_entradas(self, entradas):
+        """
+        Añade un lote de entradas vendidas a la lista de entradas de la aplicación y a sus índices, tomando el candado una sola vez,
+        y las registra en el diario con un solo registro.
+
+        Args:
+            entradas (list): Las entradas vendidas.
+        """
+        with self.candado_entradas:
+            self.app.agregar_entradas(entradas)
+        self.app.persistir("entradas", [entrada.diccionario() for entrada in entradas])
@@ -10,6 +10,8 @@ class Partido:
         fecha (str): La fecha en la que se juega el partido.
         grupo (str): El grupo al que pertenece el partido.
         estadio (Estadio): El estadio donde se juega el partido.
+        mapaGnral (MapaAsientos): El mapa de asientos de la zona general propio del partido, o None si aún no se ha vendido ninguno.
+        mapaVip (MapaAsientos): El mapa de asientos de la zona VIP propio del partido, o None si aún no se ha vendido ninguno.
     """
     def __init__(self, id, numero, equipoLocal, equipoVisitante, fecha, grupo, estadio):
         """
@@ -31,6 +33,246 @@ class Partido:
         self.fecha = fecha
         self.grupo = grupo
         self.estadio = estadio
+        self.mapaGnral = None
+        self.mapaVip = None
+
+    def obtener_mapa(self, tipo_entrada):
+        """
+        Devuelve el mapa de asientos de una zona para consultarlo.
+
+        Mientras el partido no haya vendido asientos en la zona se usa la plantilla del estadio, sin copiarla.
+
+        Args:
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+
+        Returns:
+            MapaAsientos: El mapa de asientos de la zona.
+        """
+        if tipo_entrada == "General":
+            if self.mapaGnral is not None:
+                return self.mapaGnral
+        else:
+            if self.mapaVip is not None:
+                return self.mapaVip
+        return self.estadio.obtener_mapa(tipo_entrada)
+
+    def materializar_mapa(self, tipo_entrada):
+        """
+        Devuelve el mapa de asientos propio del partido para modificarlo, copiándolo de la plantilla del estadio la primera vez.
+
+        Args:
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+
+        Returns:
+            MapaAsientos: El mapa de asientos propio del partido para la zona.
+        """
+        if tipo_entrada == "General":
+            if self.mapaGnral is None:
+                self.mapaGnral = self.estadio.mapaGnral.copiar()
+            return self.mapaGnral
+        else:
+            if self.mapaVip is None:
+                self.mapaVip = self.estadio.mapaVip.copiar()
+            return self.mapaVip
+
+    def ocupacion(self):
+        """
+        Codifica la ocupación de las zonas en las que el partido ya vendió asientos.
+
+        Returns:
+            dict: La ocupación codificada en base64 de cada zona con mapa propio, por tipo de entrada.
+        """
+        ocupacion = {}
+        if self.mapaGnral is not None:
+            ocupacion["General"] = self.mapaGnral.codificar()
+        if self.mapaVip is not None:
+            ocupacion["VIP"] = self.mapaVip.codificar()
+        return ocupacion
+
+    def restaurar_ocupacion(self, ocupacion):
+        """
+        Reconstruye los mapas propios del partido a partir de la ocupación guardada.
+
+        Args:
+            ocupacion (dict): La ocupación codificada de cada zona, como la devuelve el método ocupacion.
+        """
+        if "General" in ocupacion:
+            self.mapaGnral = self.estadio.mapaGnral.restaurar(ocupacion["General"])
+        if "VIP" in ocupacion:
+            self.mapaVip = self.estadio.mapaVip.restaurar(ocupacion["VIP"])
+
+    def mostrar_mapa(self, tipo_entrada, desde=0, hasta=None):
+        """
+        Genera una representación en cadena del mapa de asientos de una zona para este partido.
+
+        Args:
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+            desde (int): La primera fila a mostrar (desde 0).
+            hasta (int): La fila donde termina el rango (excluida), o None para llegar hasta la última.
+
+        Returns:
+            str: Una cadena que representa el mapa de la zona o del rango de filas.
+        """
+        return self.obtener_mapa(tipo_entrada).dibujar(tipo_entrada, desde, hasta)
+
+    def verificar_fila_llena(self, fila, tipo_entrada):
+        """
+        Verifica si una fila específica está completamente ocupada en este partido.
+
+        Args:
+            fila (int): El número de fila a verificar.
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+
+        Returns:
+            bool: True si la fila está completamente ocupada, False de lo contrario.
+        """
+        return self.obtener_mapa(tipo_entrada).fila_llena(fila)
+
+    def zona_agotada(self, tipo_entrada):
+        """
+        Verifica si todos los asientos de una zona están vendidos para este partido.
+
+        Args:
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+
+        Returns:
+            bool: True si la zona está agotada, False de lo contrario.
+        """
+        return self.obtener_mapa(tipo_entrada).zona_agotada()
+
+    def asientos_libres(self, tipo_entrada=None):
+        """
+        Devuelve la cantidad de asientos libres del partido, en una zona o en ambas.
+
+        Args:
+            tipo_entrada (str): El tipo de entrada, "General" o "VIP", o None para sumar ambas zonas.
+
+        Returns:
+            int: La cantidad de asientos libres.
+        """
+        if tipo_entrada is not None:
+            return self.obtener_mapa(tipo_entrada).asientos_libres()
+        return self.obtener_mapa("General").asientos_libres() + self.obtener_mapa("VIP").asientos_libres()
+
+    def agotado(self):
+        """
+        Verifica si el partido no tiene asientos libres en ninguna zona.
+
+        Returns:
+            bool: True si el partido está agotado, False de lo contrario.
+        """
+        return self.asientos_libres() == 0
+
+    def asignar_asientos(self, tipo_entrada, cantidad, filas=None):
+        """
+        Busca y ocupa una cantidad de asientos consecutivos en una misma fila de una zona.
+
+        Args:
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+            cantidad (int): La cantidad de asientos consecutivos.
+            filas (list): Los números de fila (desde 0) en orden de preferencia, o None para ir de la primera a la última.
+
+        Returns:
+            list: Una lista de [fila, asiento] (ambos desde 1) como los guarda Entrada, o None si no hay espacio.
+        """
+        asientos = self.obtener_mapa(tipo_entrada).buscar_contiguos(cantidad, filas)
+        if asientos is None:
+            return None
+
+        for fila, asiento in asientos:
+            self.ocupar_asiento(fila - 1, asiento - 1, tipo_entrada)
+
+        return asientos
+
+    def asignar_libres(self, tipo_entrada, cantidad, filas=None):
+        """
+        Busca y ocupa una cantidad de asientos libres de una zona, juntos en lo posible y llenando las filas en orden.
+
+        Args:
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+            cantidad (int): La cantidad de asientos.
+            filas (list): Los números de fila (desde 0) en orden de preferencia, o None para ir de la primera a la última.
+
+        Returns:
+            list: Una lista de [fila, asiento] (ambos desde 1) como los guarda Entrada, o None si no hay suficientes asientos libres.
+        """
+        asientos = self.asignar_asientos(tipo_entrada, cantidad, filas)
+        if asientos is not None:
+            return asientos
+
+        asientos = self.obtener_mapa(tipo_entrada).buscar_libres(cantidad, filas)
+        if asientos is None:
+            return None
+
+        for fila, asiento in asientos:
+            self.ocupar_asiento(fila - 1, asiento - 1, tipo_entrada)
+
+        return asientos
+
+    def asignar_mejor_asiento(self, tipo_entrada, filas=None):
+        """
+        Busca y ocupa el mejor asiento libre de una zona según un orden de preferencia de filas.
+
+        Args:
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+            filas (list): Los números de fila (desde 0) en orden de preferencia, o None para ir de la primera a la última.
+
+        Returns:
+            list: El asiento como [fila, asiento] (ambos desde 1), o None si la zona está agotada.
+        """
+        asiento = self.obtener_mapa(tipo_entrada).mejor_disponible(filas)
+        if asiento is None:
+            return None
+
+        self.ocupar_asiento(asiento[0] - 1, asiento[1] - 1, tipo_entrada)
+        return asiento
+
+    def asiento_ocupado(self, fila, asiento, tipo_entrada):
+        """
+        Verifica si un asiento específico está ocupado en este partido.
+
+        Args:
+            fila (int): El número de fila del asiento.
+            asiento (int): El número del asiento.
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+
+        Returns:
+            bool: True si el asiento está ocupado, False de lo contrario.
+        """
+        return self.obtener_mapa(tipo_entrada).ocupado(fila, asiento)
+
+    def ocupar_asiento(self, fila, asiento, tipo_entrada):
+        """
+        Marca un asiento específico como ocupado en este partido.
+
+        Args:
+            fila (int): El número de fila del asiento.
+            asiento (int): El número del asiento.
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+        """
+        self.materializar_mapa(tipo_entrada).ocupar(fila, asiento)
+
+    def reservar_asiento(self, fila, asiento, tipo_entrada):
+        """
+        Marca un asiento específico como reservado en este partido mientras se completa su compra.
+
+        Args:
+            fila (int): El número de fila del asiento.
+            asiento (int): El número del asiento.
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+        """
+        self.materializar_mapa(tipo_entrada).reservar(fila, asiento)
+
+    def liberar_asiento(self, fila, asiento, tipo_entrada):
+        """
+        Marca un asiento específico como libre en este partido.
+
+        Args:
+            fila (int): El número de fila del asiento.
+            asiento (int): El número del asiento.
+            tipo_entrada (str): El tipo de entrada, puede ser "General" o "VIP".
+        """
+        self.materializar_mapa(tipo_entrada).liberar(fila, asiento)
     
     def mostrar_atributo(self):
         """
@@ -69,7 +311,8 @@ class Partido:
             'equipo_visitante': self.equipoVisitante.id,
             'fecha': self.fecha,
             'grupo': self.grupo,
-            'estadio': self.estadio.id
+            'estadio': self.estadio.id,
+            'ocupacion': self.ocupacion()
         }
     
 
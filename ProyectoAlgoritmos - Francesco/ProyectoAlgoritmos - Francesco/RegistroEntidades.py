@@ -0,0 +1,74 @@
+class RegistroEntidades:
+    """
+    Clase que mantiene índices por id o por nombre de los equipos, estadios, partidos, restaurantes y productos,
+    para resolver las referencias entre entidades al cargar los datos sin recorrer las listas.
+
+    Si dos entidades comparten id o nombre se conserva la primera, igual que al buscarlas recorriendo la lista.
+
+    Atributos:
+        equipos (dict): Los equipos por id.
+        estadios (dict): Los estadios por id.
+        partidos (dict): Los partidos por id.
+        restaurantes (dict): Los restaurantes de todos los estadios por nombre.
+        productos (dict): Los productos de todos los restaurantes por nombre.
+    """
+    def __init__(self):
+        """
+        Inicializa una instancia de la clase RegistroEntidades con los índices vacíos.
+        """
+        self.equipos = {}
+        self.estadios = {}
+        self.partidos = {}
+        self.restaurantes = {}
+        self.productos = {}
+
+    def agregar_equipo(self, equipo):
+        """
+        Añade un equipo al índice por id.
+
+        Args:
+            equipo (Equipo): El equipo cargado.
+        """
+        self.equipos.setdefault(equipo.id, equipo)
+
+    def agregar_estadio(self, estadio):
+        """
+        Añade un estadio al índice por id, y sus restaurantes y productos a los índices por nombre.
+
+        Args:
+            estadio (Estadio): El estadio cargado.
+        """
+        self.estadios.setdefault(estadio.id, estadio)
+        for restaurante in estadio.restaurantes:
+            self.restaurantes.setdefault(restaurante.nombre, restaurante)
+            for producto in restaurante.productos:
+                self.productos.setdefault(producto.nombre, producto)
+
+    def agregar_partido(self, partido):
+        """
+        Añade un partido al índice por id.
+
+        Args:
+            partido (Partido): El partido cargado.
+        """
+        self.partidos.setdefault(partido.id, partido)
+
+    def reiniciar_equipos(self):
+        """
+        Vacía el índice de equipos antes de volver a cargarlos.
+        """
+        self.equipos = {}
+
+    def reiniciar_estadios(self):
+        """
+        Vacía los índices de estadios, restaurantes y productos antes de volver a cargarlos.
+        """
+        self.estadios = {}
+        self.restaurantes = {}
+        self.productos = {}
+
+    def reiniciar_partidos(self):
+        """
+        Vacía el índice de partidos antes de volver a cargarlos.
+        """
+        self.partidos = {}
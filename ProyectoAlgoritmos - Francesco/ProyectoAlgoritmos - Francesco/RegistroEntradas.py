@@ -0,0 +1,184 @@
+class RegistroEntradas:
+    """
+    Clase que mantiene índices secundarios sobre las entradas vendidas para consultarlas sin recorrer toda la lista.
+
+    Atributos:
+        por_id (dict): Las entradas por su identificador.
+        por_cliente (dict): Las listas de entradas de cada cliente, por cédula.
+        por_partido (dict): Las listas de entradas de cada partido, por id del partido.
+        pendientes (dict): Las entradas sin asistencia de cada cliente, por cédula y luego por id.
+        asistidas (dict): Las listas de entradas con asistencia confirmada de cada cliente, por cédula.
+        asistencias (dict): La cantidad de asistencias confirmadas de cada partido, por id del partido.
+    """
+    def __init__(self):
+        """
+        Inicializa una instancia de la clase RegistroEntradas con los índices vacíos.
+        """
+        self.por_id = {}
+        self.por_cliente = {}
+        self.por_partido = {}
+        self.pendientes = {}
+        self.asistidas = {}
+        self.asistencias = {}
+
+    def agregar(self, entrada):
+        """
+        Añade una entrada a todos los índices.
+
+        Args:
+            entrada (Entrada): La entrada vendida o cargada.
+        """
+        cedula = entrada.cliente.cedula
+        partido_id = entrada.partido.id
+
+        self.por_id[entrada.id] = entrada
+        self.por_cliente.setdefault(cedula, []).append(entrada)
+        self.por_partido.setdefault(partido_id, []).append(entrada)
+
+        if entrada.asistencia:
+            self.asistidas.setdefault(cedula, []).append(entrada)
+            self.asistencias[partido_id] = self.asistencias.get(partido_id, 0) + 1
+        else:
+            self.pendientes.setdefault(cedula, {})[entrada.id] = entrada
+
+    def buscar(self, id):
+        """
+        Busca una entrada por su identificador.
+
+        Args:
+            id (int): El identificador de la entrada.
+
+        Returns:
+            Entrada: La entrada con el ID especificado, o None si no se encuentra.
+        """
+        return self.por_id.get(id)
+
+    def existe(self, id):
+        """
+        Indica si hay una entrada con un identificador.
+
+        Args:
+            id (int): El identificador de la entrada.
+
+        Returns:
+            bool: True si la entrada existe.
+        """
+        return id in self.por_id
+
+    def ultimo_id(self):
+        """
+        Devuelve el mayor identificador de las entradas.
+
+        Returns:
+            int: El mayor identificador, o 0 si no hay entradas.
+        """
+        return max(self.por_id, default=0)
+
+    def confirmar_asistencia(self, id):
+        """
+        Marca una entrada como usada y la mueve del grupo de pendientes al de asistidas.
+
+        Args:
+            id (int): El identificador de la entrada.
+
+        Returns:
+            Entrada: La entrada confirmada, o None si no se encuentra.
+        """
+        entrada = self.por_id.get(id)
+        if entrada is None:
+            return None
+
+        if not entrada.asistencia:
+            cedula = entrada.cliente.cedula
+            partido_id = entrada.partido.id
+
+            entrada.asistencia = True
+            self.pendientes[cedula].pop(id, None)
+            self.asistidas.setdefault(cedula, []).append(entrada)
+            self.asistencias[partido_id] = self.asistencias.get(partido_id, 0) + 1
+
+        return entrada
+
+    def entradas_cliente(self, cedula):
+        """
+        Devuelve todas las entradas de un cliente.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            list: Las entradas del cliente.
+        """
+        return self.por_cliente.get(cedula, [])
+
+    def pendientes_cliente(self, cedula):
+        """
+        Devuelve las entradas de un cliente que aún no han sido usadas.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            list: Las entradas sin asistencia del cliente.
+        """
+        return list(self.pendientes.get(cedula, {}).values())
+
+    def asistidas_cliente(self, cedula):
+        """
+        Devuelve las entradas de un cliente con asistencia confirmada.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            list: Las entradas asistidas del cliente.
+        """
+        return self.asistidas.get(cedula, [])
+
+    def entradas_partido(self, partido_id):
+        """
+        Devuelve todas las entradas vendidas para un partido.
+
+        Args:
+            partido_id (str): El id del partido.
+
+        Returns:
+            list: Las entradas del partido.
+        """
+        return self.por_partido.get(partido_id, [])
+
+    def cantidad_cliente(self, cedula):
+        """
+        Cuenta las entradas de un cliente.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            int: La cantidad de entradas del cliente.
+        """
+        return len(self.por_cliente.get(cedula, []))
+
+    def cantidad_partido(self, partido_id):
+        """
+        Cuenta las entradas de un partido.
+
+        Args:
+            partido_id (str): El id del partido.
+
+        Returns:
+            int: La cantidad de entradas del partido.
+        """
+        return len(self.por_partido.get(partido_id, []))
+
+    def asistencias_partido(self, partido_id):
+        """
+        Devuelve la cantidad de asistencias confirmadas de un partido.
+
+        Args:
+            partido_id (str): El id del partido.
+
+        Returns:
+            int: La cantidad de entradas usadas del partido.
+        """
+        return self.asistencias.get(partido_id, 0)
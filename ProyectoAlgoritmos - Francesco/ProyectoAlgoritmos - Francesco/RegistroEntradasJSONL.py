@@ -0,0 +1,208 @@
+class RegistroEntradasJSONL:
+    """
+    Clase que ofrece las mismas consultas que RegistroEntradas, pero leyendo las entradas de los archivos JSON Lines
+    o de la base de datos a medida que se piden, en lugar de tenerlas todas en memoria.
+
+    Cada entrada leída o vendida se guarda en por_id, para que una misma entrada sea siempre el mismo objeto y una
+    asistencia confirmada se vea aunque todavía no se haya guardado. Las entradas nuevas y las asistencias se guardan
+    con App.persistir, como con RegistroEntradas.
+
+    Atributos:
+        almacen (AlmacenJSONL o AlmacenSQLite): Donde están guardadas las entradas.
+        crear_entrada (function): La función que crea una Entrada a partir de su diccionario.
+        por_id (dict): Las entradas ya leídas o vendidas, por su identificador.
+        asistencias (dict): La cantidad de asistencias confirmadas de cada partido ya contado, por id del partido.
+    """
+    def __init__(self, almacen, crear_entrada):
+        """
+        Inicializa una instancia de la clase RegistroEntradasJSONL.
+
+        Args:
+            almacen (AlmacenJSONL o AlmacenSQLite): Donde están guardadas las entradas, ya abierto.
+            crear_entrada (function): La función que crea una Entrada a partir de su diccionario.
+        """
+        self.almacen = almacen
+        self.crear_entrada = crear_entrada
+        self.por_id = {}
+        self.asistencias = {}
+
+    def entrada(self, entrada_data):
+        """
+        Devuelve la entrada de un diccionario leído, creándola la primera vez.
+
+        Args:
+            entrada_data (dict): Los datos de la entrada, como los devuelve Entrada.diccionario.
+
+        Returns:
+            Entrada: La entrada.
+        """
+        entrada = self.por_id.get(entrada_data["id"])
+        if entrada is None:
+            entrada = self.crear_entrada(entrada_data)
+            self.por_id[entrada.id] = entrada
+        return entrada
+
+    def agregar(self, entrada):
+        """
+        Añade una entrada vendida o recuperada del diario; su línea la escribe App.persistir.
+
+        Args:
+            entrada (Entrada): La entrada.
+        """
+        self.por_id[entrada.id] = entrada
+
+        partido_id = entrada.partido.id
+        if entrada.asistencia and partido_id in self.asistencias:
+            self.asistencias[partido_id] += 1
+
+    def buscar(self, id):
+        """
+        Busca una entrada por su identificador.
+
+        Args:
+            id (int): El identificador de la entrada.
+
+        Returns:
+            Entrada: La entrada con el ID especificado, o None si no se encuentra.
+        """
+        entrada = self.por_id.get(id)
+        if entrada is None:
+            entrada_data = self.almacen.buscar_entrada(id)
+            if entrada_data is not None:
+                entrada = self.entrada(entrada_data)
+        return entrada
+
+    def existe(self, id):
+        """
+        Indica si hay una entrada con un identificador, sin leerla.
+
+        Args:
+            id (int): El identificador de la entrada.
+
+        Returns:
+            bool: True si la entrada existe.
+        """
+        return id in self.por_id or self.almacen.existe_entrada(id)
+
+    def ultimo_id(self):
+        """
+        Devuelve el mayor identificador de las entradas.
+
+        Returns:
+            int: El mayor identificador, o 0 si no hay entradas.
+        """
+        return max(self.almacen.ultimo_id(), max(self.por_id, default=0))
+
+    def confirmar_asistencia(self, id):
+        """
+        Marca una entrada como usada.
+
+        Args:
+            id (int): El identificador de la entrada.
+
+        Returns:
+            Entrada: La entrada confirmada, o None si no se encuentra.
+        """
+        entrada = self.buscar(id)
+        if entrada is None:
+            return None
+
+        if not entrada.asistencia:
+            entrada.asistencia = True
+            partido_id = entrada.partido.id
+            if partido_id in self.asistencias:
+                self.asistencias[partido_id] += 1
+
+        return entrada
+
+    def entradas_cliente(self, cedula):
+        """
+        Devuelve todas las entradas de un cliente.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            list: Las entradas del cliente.
+        """
+        return [self.entrada(entrada_data) for entrada_data in self.almacen.entradas_cliente(cedula)]
+
+    def pendientes_cliente(self, cedula):
+        """
+        Devuelve las entradas de un cliente que aún no han sido usadas.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            list: Las entradas sin asistencia del cliente.
+        """
+        return [entrada for entrada in self.entradas_cliente(cedula) if not entrada.asistencia]
+
+    def asistidas_cliente(self, cedula):
+        """
+        Devuelve las entradas de un cliente con asistencia confirmada.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            list: Las entradas asistidas del cliente.
+        """
+        return [entrada for entrada in self.entradas_cliente(cedula) if entrada.asistencia]
+
+    def entradas_partido(self, partido_id):
+        """
+        Devuelve todas las entradas vendidas para un partido.
+
+        Args:
+            partido_id (str): El id del partido.
+
+        Returns:
+            list: Las entradas del partido.
+        """
+        return [self.entrada(entrada_data) for entrada_data in self.almacen.entradas_partido(partido_id)]
+
+    def cantidad_cliente(self, cedula):
+        """
+        Cuenta las entradas de un cliente sin leerlas.
+
+        Args:
+            cedula (str): La cédula del cliente.
+
+        Returns:
+            int: La cantidad de entradas del cliente.
+        """
+        return self.almacen.contar_entradas_cliente(cedula)
+
+    def cantidad_partido(self, partido_id):
+        """
+        Cuenta las entradas de un partido sin leerlas.
+
+        Args:
+            partido_id (str): El id del partido.
+
+        Returns:
+            int: La cantidad de entradas del partido.
+        """
+        return self.almacen.contar_entradas_partido(partido_id)
+
+    def asistencias_partido(self, partido_id):
+        """
+        Devuelve la cantidad de asistencias confirmadas de un partido. La primera vez se cuentan leyendo sus entradas,
+        sin crear los objetos.
+
+        Args:
+            partido_id (str): El id del partido.
+
+        Returns:
+            int: La cantidad de entradas usadas del partido.
+        """
+        if partido_id not in self.asistencias:
+            asistencias = 0
+            for entrada_data in self.almacen.entradas_partido(partido_id):
+                entrada = self.por_id.get(entrada_data["id"])
+                if entrada.asistencia if entrada is not None else entrada_data["asistencia"]:
+                    asistencias += 1
+            self.asistencias[partido_id] = asistencias
+        return self.asistencias[partido_id]
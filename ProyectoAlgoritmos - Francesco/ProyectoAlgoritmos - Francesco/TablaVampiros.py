@@ -0,0 +1,192 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import bisect
+import mmap
+import os
+import struct
+
+# Encabezado del archivo: firma, versión, dígitos mínimos, dígitos máximos y cantidad de números
+ENCABEZADO = struct.Struct("<4sBBBxQ")
+FIRMA = b"VAMP"
+VERSION = 1
+
+
+def vampiros_rango(digitos, inicio, fin):
+    """
+    Enumera los números vampiro de una longitud dada cuyo primer colmillo está en un rango.
+
+    Recorre los pares de colmillos (colmillo1 <= colmillo2) con la mitad de los dígitos. Para cada colmillo1
+    solo se prueban los colmillo2 que dan un producto con la cantidad de dígitos correcta y que cumplen
+    colmillo1 + colmillo2 = producto (módulo 9), condición necesaria para que los dígitos coincidan.
+
+    Args:
+        digitos (int): La cantidad de dígitos de los números vampiro (par).
+        inicio (int): El primer valor de colmillo1 a probar.
+        fin (int): El valor de colmillo1 donde termina el recorrido (excluido).
+
+    Returns:
+        list: Una lista con los números vampiro encontrados, con posibles repetidos.
+    """
+    len_colmillos = digitos // 2
+    max_colmillo = 10**len_colmillos - 1
+    minimo = 10**(digitos - 1)
+    vampiros = []
+
+    for colmillo1 in range(inicio, fin):
+        # Restos módulo 9 de colmillo2 que cumplen colmillo1 * colmillo2 = colmillo1 + colmillo2 (mod 9)
+        restos = [r for r in range(9) if (colmillo1 * r - colmillo1 - r) % 9 == 0]
+        desde = max(colmillo1, -(-minimo // colmillo1))
+        digitos_colmillo1 = str(colmillo1)
+
+        for resto in restos:
+            primero = desde + (resto - desde) % 9
+            for colmillo2 in range(primero, max_colmillo + 1, 9):
+                # Evita colmillos con ceros finales
+                if colmillo1 % 10 == 0 and colmillo2 % 10 == 0:
+                    continue
+
+                numero = colmillo1 * colmillo2
+                if sorted(digitos_colmillo1 + str(colmillo2)) == sorted(str(numero)):
+                    vampiros.append(numero)
+
+    return vampiros
+
+
+def generar_vampiros(min_digitos=6, max_digitos=10, procesos=None):
+    """
+    Genera todos los números vampiro entre min_digitos y max_digitos dígitos, en orden ascendente.
+
+    Los recorridos de colmillos de cada longitud se reparten en bloques entre un grupo de procesos.
+
+    Args:
+        min_digitos (int): La menor cantidad de dígitos a generar.
+        max_digitos (int): La mayor cantidad de dígitos a generar.
+        procesos (int): La cantidad de procesos a usar, o None para usar todos los núcleos.
+
+    Yields:
+        int: Cada número vampiro, sin repetidos y en orden ascendente.
+    """
+    with ProcessPoolExecutor(procesos) as pool:
+        for digitos in range(min_digitos, max_digitos + 1):
+            # Los números con cantidad impar de dígitos no pueden ser vampiro
+            if digitos % 2 != 0:
+                continue
+
+            len_colmillos = digitos // 2
+            min_colmillo = 10**(len_colmillos - 1)
+            max_colmillo = 10**len_colmillos
+
+            tamano_bloque = max(1, (max_colmillo - min_colmillo) // 64)
+            rangos = []
+            for inicio in range(min_colmillo, max_colmillo, tamano_bloque):
+                rangos.append((digitos, inicio, min(inicio + tamano_bloque, max_colmillo)))
+
+            encontrados = set()
+            for vampiros in pool.map(vampiros_rango, *zip(*rangos)):
+                encontrados.update(vampiros)
+
+            for numero in sorted(encontrados):
+                yield numero
+
+
+def escribir_tabla(ruta, min_digitos=6, max_digitos=10, procesos=None):
+    """
+    Genera los números vampiro y los escribe en un archivo binario ordenado.
+
+    El archivo tiene un encabezado seguido de los números como enteros sin signo de 64 bits.
+
+    Args:
+        ruta (str): La ruta del archivo a escribir.
+        min_digitos (int): La menor cantidad de dígitos a generar.
+        max_digitos (int): La mayor cantidad de dígitos a generar.
+        procesos (int): La cantidad de procesos a usar, o None para usar todos los núcleos.
+
+    Returns:
+        int: La cantidad de números vampiro escritos.
+    """
+    numeros = array("Q", generar_vampiros(min_digitos, max_digitos, procesos))
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(ENCABEZADO.pack(FIRMA, VERSION, min_digitos, max_digitos, len(numeros)))
+        numeros.tofile(archivo)
+
+    return len(numeros)
+
+
+class TablaVampiros:
+    """
+    Clase que representa la tabla precalculada de números vampiro, mapeada en memoria desde un archivo binario.
+
+    Atributos:
+        min_digitos (int): La menor cantidad de dígitos cubierta por la tabla.
+        max_digitos (int): La mayor cantidad de dígitos cubierta por la tabla.
+        numeros (memoryview): Los números vampiro ordenados, como enteros sin signo de 64 bits.
+    """
+    def __init__(self, ruta):
+        """
+        Abre y mapea en memoria el archivo de la tabla.
+
+        Args:
+            ruta (str): La ruta del archivo generado con escribir_tabla.
+
+        Raises:
+            ValueError: Si el archivo no es una tabla de vampiros válida.
+        """
+        with open(ruta, "rb") as archivo:
+            self.mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.mapa) < ENCABEZADO.size:
+            raise ValueError(f"El archivo {ruta} no es una tabla de vampiros valida")
+
+        firma, version, self.min_digitos, self.max_digitos, cantidad = ENCABEZADO.unpack_from(self.mapa, 0)
+        if firma != FIRMA or version != VERSION or len(self.mapa) != ENCABEZADO.size + cantidad * 8:
+            self.mapa.close()
+            raise ValueError(f"El archivo {ruta} no es una tabla de vampiros valida")
+
+        self.numeros = memoryview(self.mapa)[ENCABEZADO.size:].cast("Q")
+
+    def contiene(self, numero_str):
+        """
+        Busca una cédula en la tabla con búsqueda binaria.
+
+        Args:
+            numero_str (str): La cédula en formato de cadena.
+
+        Returns:
+            bool: True si la cédula es un número vampiro, False si no lo es, o None si la tabla no cubre esa cédula.
+        """
+        # Las cédulas con ceros a la izquierda o fuera del rango de dígitos no están cubiertas
+        if numero_str[0] == "0" or not self.min_digitos <= len(numero_str) <= self.max_digitos:
+            return None
+
+        numero = int(numero_str)
+        posicion = bisect.bisect_left(self.numeros, numero)
+
+        return posicion < len(self.numeros) and self.numeros[posicion] == numero
+
+    def __len__(self):
+        return len(self.numeros)
+
+
+def abrir_tabla(ruta):
+    """
+    Abre la tabla de números vampiro si el archivo existe.
+
+    Args:
+        ruta (str): La ruta del archivo de la tabla.
+
+    Returns:
+        TablaVampiros: La tabla mapeada en memoria, o None si el archivo no existe o no es válido.
+    """
+    if not os.path.exists(ruta):
+        return None
+
+    try:
+        return TablaVampiros(ruta)
+    except ValueError:
+        return None
+
+
+if __name__ == "__main__":
+    print("Generando vampiros.bin (puede tardar varios minutos)...")
+    print(f"{escribir_tabla('vampiros.bin')} numeros vampiro escritos")
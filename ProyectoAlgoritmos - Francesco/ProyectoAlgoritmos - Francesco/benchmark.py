@@ -0,0 +1,809 @@
+from App import App
+from CacheApi import CacheApi
+from Cliente import Cliente
+from Entrada import Entrada
+from Equipo import Equipo
+from Factura import Factura
+from GestorReservas import GestorReservas
+from GuardadoPeriodico import GuardadoPeriodico
+from Estadio import Estadio
+from MapaAsientos import MapaAsientos
+from Partido import Partido
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import contextlib
+import functools
+import io
+import itertools
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+
+
+def medir(funcion, repeticiones):
+    """
+    Mide el tiempo promedio de ejecución de una función.
+
+    Args:
+        funcion (function): La función sin argumentos que se va a medir.
+        repeticiones (int): La cantidad de veces que se ejecuta la función.
+
+    Returns:
+        float: El tiempo promedio por ejecución en milisegundos.
+    """
+    inicio = time.perf_counter()
+    for i in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) * 1000 / repeticiones
+
+
+def benchmark_descuento_entrada(muestras=200):
+    """
+    Mide la latencia por venta de descuento_entrada para cédulas de 6 a 10 dígitos.
+
+    Para cada longitud se mide la primera evaluación de cada cédula (sin memoria) y la
+    evaluación repetida de la misma cédula (resuelta por la memoria de es_vampiro).
+
+    Args:
+        muestras (int): La cantidad de cédulas aleatorias a evaluar por longitud.
+    """
+    print("\n==========================================")
+    print("    BENCHMARK DESCUENTO DE ENTRADA")
+    print("==========================================")
+    print("Digitos | Primera venta (ms) | Venta repetida (ms)")
+
+    for digitos in range(6, 11):
+        app = App()
+        clientes = []
+        for i in range(muestras):
+            cedula = str(random.randint(10**(digitos - 1), 10**digitos - 1))
+            clientes.append(Cliente("Cliente", cedula, 30))
+
+        indice = iter(clientes)
+        primera = medir(lambda: app.descuento_entrada(next(indice), 35), len(clientes))
+        repetida = medir(lambda: app.descuento_entrada(clientes[0], 35), muestras)
+
+        print(f"{digitos:>7} | {primera:>18.4f} | {repetida:>19.4f}")
+
+
+def mapa_lista(capacidad):
+    """
+    Construye un mapa de asientos con la representación anterior: una lista de filas con un str por asiento.
+
+    Args:
+        capacidad (int): La capacidad del mapa de asientos.
+
+    Returns:
+        list: Una lista de listas de cadenas.
+    """
+    mapa = []
+    for inicio in range(0, capacidad, 10):
+        mapa.append([str(i + 1) for i in range(min(10, capacidad - inicio))])
+    return mapa
+
+
+def memoria(constructor, capacidad):
+    """
+    Mide la memoria reservada al construir un mapa de asientos.
+
+    Args:
+        constructor (function): La función que construye el mapa a partir de la capacidad.
+        capacidad (int): La capacidad del mapa.
+
+    Returns:
+        int: La cantidad de bytes reservados por el mapa.
+    """
+    tracemalloc.start()
+    mapa = constructor(capacidad)
+    actual = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del mapa
+    return actual
+
+
+def benchmark_memoria_mapas():
+    """
+    Compara la memoria de la lista de cadenas y de MapaAsientos para las capacidades de stadiums.json.
+    """
+    app = App()
+    app.cargar_Estadios()
+
+    print("\n==========================================")
+    print("    BENCHMARK MEMORIA DE MAPAS DE ASIENTOS")
+    print("==========================================")
+    print("Estadio | Zona | Capacidad | Lista de str (KB) | MapaAsientos (KB)")
+
+    for estadio in app.estadios:
+        for zona, capacidad in zip(["General", "VIP"], estadio.calcular_capacidad()):
+            lista = memoria(mapa_lista, capacidad) / 1024
+            compacto = memoria(MapaAsientos, capacidad) / 1024
+            print(f"{estadio.nombre} | {zona} | {capacidad} | {lista:.1f} | {compacto:.1f}")
+
+
+def estadio_prueba(app, capacidad_general, capacidad_vip):
+    """
+    Crea un partido de prueba en un estadio con las capacidades dadas y lo añade a la aplicación.
+
+    Args:
+        app (App): La aplicación donde se añaden el estadio y el partido.
+        capacidad_general (int): La capacidad de la zona general.
+        capacidad_vip (int): La capacidad de la zona VIP.
+
+    Returns:
+        Partido: El partido creado, sin asientos vendidos.
+    """
+    local = Equipo("L", "LOC", "Local", "A")
+    visitante = Equipo("V", "VIS", "Visitante", "A")
+    estadio = Estadio("E", "Estadio de Prueba", "Ciudad", app.llenar_mapa(capacidad_general), app.llenar_mapa(capacidad_vip), [])
+    partido = Partido("P", 1, local, visitante, "2024-06-14", "A", estadio)
+
+    app.agregar_equipo(local)
+    app.agregar_equipo(visitante)
+    app.agregar_estadio(estadio)
+    app.agregar_partido(partido)
+    return partido
+
+
+def stress_ventas(hilos=32, capacidad_general=20000, capacidad_vip=2000):
+    """
+    Vende un estadio completo desde varios hilos a la vez con MotorVentas y verifica que no haya asientos vendidos dos veces.
+
+    Cada hilo intenta reclamar asientos al azar y, cuando falla, pide el mejor asiento disponible, hasta que la zona se agota.
+
+    Args:
+        hilos (int): La cantidad de taquillas vendiendo al mismo tiempo.
+        capacidad_general (int): La capacidad de la zona general.
+        capacidad_vip (int): La capacidad de la zona VIP.
+    """
+    app = App()
+    partido = estadio_prueba(app, capacidad_general, capacidad_vip)
+    motor = app.motor_ventas
+    cliente = Cliente("Cliente", "123456", 30)
+    app.agregar_cliente(cliente)
+    inicio_barrera = threading.Barrier(hilos)
+
+    def taquilla(semilla):
+        azar = random.Random(semilla)
+        inicio_barrera.wait()
+        for tipo_entrada in ["General", "VIP"]:
+            mapa = partido.obtener_mapa(tipo_entrada)
+            while True:
+                fila = azar.randrange(mapa.cantidad_filas())
+                asiento = azar.randrange(mapa.largo_fila(fila))
+                if motor.reclamar_asiento(partido, fila, asiento, tipo_entrada):
+                    asiento_elegido = [fila + 1, asiento + 1]
+                else:
+                    asiento_elegido = motor.reclamar_mejor_asiento(partido, tipo_entrada)
+                    if asiento_elegido is None:
+                        break
+
+                entrada = Entrada(motor.nuevo_id(), cliente, partido, tipo_entrada, asiento_elegido, 35, 0, 35, 5.6, 40.6, False)
+                motor.registrar_entrada(entrada)
+
+    inicio = time.perf_counter()
+    taquillas = [threading.Thread(target=taquilla, args=(i,)) for i in range(hilos)]
+    for hilo in taquillas:
+        hilo.start()
+    for hilo in taquillas:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    capacidad = capacidad_general + capacidad_vip
+    asientos = {(entrada.tipo_entrada, entrada.asiento[0], entrada.asiento[1]) for entrada in app.entradas}
+    ids = {entrada.id for entrada in app.entradas}
+    dobles = len(app.entradas) - len(asientos)
+
+    print("\n==========================================")
+    print("    STRESS TEST DE VENTAS CONCURRENTES")
+    print("==========================================")
+    print(f"Hilos: {hilos} | Capacidad: {capacidad} | Vendidas: {len(app.entradas)} | Tiempo: {duracion:.2f} s")
+    print(f"Asientos vendidos dos veces: {dobles} | Ids repetidos: {len(app.entradas) - len(ids)} | Libres: {partido.asientos_libres()}")
+
+    assert dobles == 0
+    assert len(app.entradas) == capacidad and ids == set(range(1, capacidad + 1))
+    assert partido.agotado()
+
+
+def verificar_reservas(duracion=60):
+    """
+    Verifica que una taquilla que vuelve tarde a su reserva vencida no confirme ni libere la reserva que otra taquilla hizo después sobre el mismo asiento.
+
+    Args:
+        duracion (float): Los segundos que dura una reserva.
+    """
+    app = App()
+    partido = estadio_prueba(app, 100, 10)
+    motor = app.motor_ventas
+    gestor = GestorReservas(motor, duracion, intervalo=duracion * 10)
+
+    # La taquilla A reserva el asiento y deja vencer la reserva
+    assert motor.reclamar_asiento(partido, 0, 0, "General")
+    reserva_a = gestor.reservar(partido, 0, 0, "General")
+    liberados = gestor.barrer(time.monotonic() + duracion + 1)
+    assert liberados == 1 and not partido.asiento_ocupado(0, 0, "General")
+
+    # La taquilla B vuelve a reservar el mismo asiento
+    assert motor.reclamar_asiento(partido, 0, 0, "General")
+    reserva_b = gestor.reservar(partido, 0, 0, "General")
+
+    # A vuelve tarde: ni cancelar ni confirmar tocan la reserva de B
+    gestor.liberar(partido, 0, 0, "General", reserva_a)
+    cancelar_tarde = gestor.cantidad_reservas() == 1 and partido.asiento_ocupado(0, 0, "General")
+    confirmar_tarde = gestor.confirmar(partido, 0, 0, "General", reserva_a)
+    confirmar_b = gestor.confirmar(partido, 0, 0, "General", reserva_b)
+    gestor.detener_barrido()
+
+    print("\n==========================================")
+    print("    VERIFICACION DE RESERVAS VENCIDAS")
+    print("==========================================")
+    print(f"Liberados al vencer: {liberados} | Cancelar tarde respeta la otra reserva: {cancelar_tarde}")
+    print(f"Confirmar tarde: {confirmar_tarde} | Confirmar la reserva vigente: {confirmar_b} | Reservas activas: {gestor.cantidad_reservas()}")
+
+    assert cancelar_tarde and not confirmar_tarde and confirmar_b
+    assert gestor.cantidad_reservas() == 0 and partido.asiento_ocupado(0, 0, "General")
+
+
+def benchmark_compra_lote(cantidad=10000):
+    """
+    Mide la compra de un lote de entradas con comprar_entradas, comparada con comprar las mismas entradas de una en una.
+
+    Args:
+        cantidad (int): La cantidad de entradas del lote.
+    """
+    print("\n==========================================")
+    print("    BENCHMARK COMPRA DE ENTRADAS EN LOTE")
+    print("==========================================")
+    print("Modo | Entradas | Tiempo (ms) | Por entrada (us)")
+
+    for modo in ["Lote", "Una a una"]:
+        app = App()
+        partido = estadio_prueba(app, cantidad, 0)
+        app.agregar_cliente(Cliente("Empresa", "1260", 30))
+
+        inicio = time.perf_counter()
+        if modo == "Lote":
+            app.comprar_entradas("1260", partido.id, "General", cantidad=cantidad)
+        else:
+            for i in range(cantidad):
+                app.comprar_entradas("1260", partido.id, "General", cantidad=1)
+        duracion = time.perf_counter() - inicio
+
+        assert len(app.entradas) == cantidad and partido.zona_agotada("General")
+        print(f"{modo} | {cantidad} | {duracion * 1000:.1f} | {duracion * 1e6 / cantidad:.2f}")
+
+
+def datos_api(equipos=24, estadios=10, partidos=36, capacidad=(50000, 5000)):
+    """
+    Genera documentos de prueba con el mismo formato que teams.json, stadiums.json y matches.json de la API.
+
+    Args:
+        equipos (int): La cantidad de equipos.
+        estadios (int): La cantidad de estadios.
+        partidos (int): La cantidad de partidos.
+        capacidad (tuple): La capacidad de las zonas general y VIP de cada estadio.
+
+    Returns:
+        dict: Los datos de cada documento, por nombre de archivo.
+    """
+    lista_equipos = []
+    for i in range(equipos):
+        lista_equipos.append({"id": f"e{i}", "code": f"E{i:02d}", "name": f"Equipo {i}", "group": "ABCDEF"[i % 6]})
+
+    lista_estadios = []
+    for i in range(estadios):
+        productos = []
+        for j, adicional in enumerate(["plate", "package", "alcoholic", "non-alcoholic"]):
+            productos.append({"name": f"Producto {j}", "quantity": 1, "price": 10 + j, "stock": 100, "adicional": adicional})
+        lista_estadios.append({"id": f"s{i}", "name": f"Estadio {i}", "city": f"Ciudad {i}", "capacity": list(capacidad), "restaurants": [{"name": f"Restaurante {i}", "products": productos}]})
+
+    lista_partidos = []
+    for i in range(partidos):
+        lista_partidos.append({"id": f"p{i}", "number": i + 1, "home": {"id": f"e{(2 * i) % equipos}"}, "away": {"id": f"e{(2 * i + 1) % equipos}"}, "date": "2024-06-14", "group": "A", "stadium_id": f"s{i % estadios}"})
+
+    return {"teams.json": lista_equipos, "stadiums.json": lista_estadios, "matches.json": lista_partidos}
+
+
+class ManejadorLento(SimpleHTTPRequestHandler):
+    """
+    Manejador HTTP que sirve archivos de un directorio con una demora fija, para simular la latencia de la API.
+    """
+    def __init__(self, *args, latencia=0.2, **kwargs):
+        self.latencia = latencia
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        time.sleep(self.latencia)
+        super().do_GET()
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def servidor_api(directorio, latencia):
+    """
+    Levanta un servidor HTTP local en un hilo que sirve los documentos de prueba de la API.
+
+    Args:
+        directorio (str): El directorio con los archivos JSON.
+        latencia (float): Los segundos de demora de cada respuesta.
+
+    Returns:
+        ThreadingHTTPServer: El servidor en ejecución. Se detiene con shutdown().
+    """
+    manejador = functools.partial(ManejadorLento, directory=directorio, latencia=latencia)
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), manejador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def benchmark_carga_api(latencia=0.2):
+    """
+    Compara la carga inicial desde un servidor local de prueba descargando los documentos uno tras otro y a la vez.
+
+    Args:
+        latencia (float): Los segundos de demora de cada respuesta del servidor.
+    """
+    print("\n==========================================")
+    print("    BENCHMARK CARGA INICIAL DESDE LA API")
+    print("==========================================")
+    print(f"Latencia simulada por documento: {latencia:.2f} s")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        for nombre, datos in datos_api().items():
+            with open(os.path.join(directorio, nombre), "w") as archivo:
+                json.dump(datos, archivo)
+
+        servidor = servidor_api(directorio, latencia)
+        url = f"http://127.0.0.1:{servidor.server_address[1]}/"
+        cache = os.path.join(directorio, "cache")
+
+        def nueva_app(vigencia):
+            app = App()
+            app.url_api = url
+            app.cache_api = CacheApi(cache, vigencia)
+            return app
+
+        try:
+            app = nueva_app(0)
+            inicio = time.perf_counter()
+            app.cargar_Equipos()
+            app.cargar_Estadios()
+            app.cargar_Partidos()
+            secuencial = time.perf_counter() - inicio
+            shutil.rmtree(cache)
+
+            resultados = []
+            for modo, vigencia in [("A la vez, sin cache", 0), ("Cache revalidada (304)", 0), ("Cache vigente", 3600)]:
+                app = nueva_app(vigencia)
+                resultados.append((modo, app.cargar_api(), dict(app.cache_api.origen)))
+                assert len(app.partidos) == 36 and all(partido.estadio is not None for partido in app.partidos)
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+        # Sin servidor la carga sale de la copia guardada
+        app = nueva_app(0)
+        resultados.append(("Sin conexion", app.cargar_api(), dict(app.cache_api.origen)))
+        assert len(app.partidos) == 36
+
+    print(f"Uno tras otro, sin cache: {secuencial:.3f} s")
+    for modo, tiempos, origen in resultados:
+        print(f"{modo}: {tiempos['total']:.3f} s (descarga {tiempos['descarga']:.3f} s, construccion {tiempos['construccion']:.3f} s) - {origen['teams.json']}")
+
+
+class AppLineal(App):
+    """
+    Aplicación que resuelve las referencias recorriendo las listas, como antes de RegistroEntidades, para comparar la carga.
+    """
+    def buscar_equipo_id(self, id):
+        for equipo in self.equipos:
+            if equipo.id == id:
+                return equipo
+        return None
+
+    def buscar_estadio_id(self, id):
+        for estadio in self.estadios:
+            if estadio.id == id:
+                return estadio
+        return None
+
+    def buscar_partido_id(self, id):
+        for partido in self.partidos:
+            if partido.id == id:
+                return partido
+        return None
+
+    def buscar_restaurante_nombre(self, nombre):
+        for estadio in self.estadios:
+            for restaurante in estadio.restaurantes:
+                if restaurante.nombre == nombre:
+                    return restaurante
+        return None
+
+    def buscar_producto_nombre(self, nombre):
+        for estadio in self.estadios:
+            for restaurante in estadio.restaurantes:
+                for producto in restaurante.productos:
+                    if producto.nombre == nombre:
+                        return producto
+        return None
+
+
+def generar_archivos_json(factor):
+    """
+    Genera los archivos de datos de la aplicación en el directorio actual, con factor veces el tamaño de los datos base.
+
+    Los datos base son 24 equipos, 10 estadios, 36 partidos, 200 clientes, 1000 entradas y 300 facturas.
+
+    Args:
+        factor (int): El multiplicador de la cantidad de registros.
+    """
+    app = App()
+    datos = datos_api(24 * factor, 10 * factor, 36 * factor, capacidad=(2000, 200))
+    app.cargar_Equipos(datos["teams.json"])
+    app.cargar_Estadios(datos["stadiums.json"])
+    app.cargar_Partidos(datos["matches.json"])
+
+    for i in range(200 * factor):
+        app.agregar_cliente(Cliente("Cliente", str(1000000 + i), 30))
+    app.evaluar_descuentos_clientes(app.clientes)
+
+    for i in range(100 * factor):
+        cliente = app.clientes[i % len(app.clientes)]
+        partido = app.partidos[i % len(app.partidos)]
+        app.comprar_entradas(cliente.cedula, partido.id, "General", cantidad=10)
+
+    for i in range(300 * factor):
+        partido = app.partidos[i % len(app.partidos)]
+        restaurante = partido.estadio.restaurantes[0]
+        producto = restaurante.productos[i % len(restaurante.productos)]
+        app.facturas.append(Factura(app.clientes[i % len(app.clientes)], partido, restaurante, [[producto, 2]], 20, 0, 20))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.guardar_json()
+
+
+def benchmark_carga_json(factores=(1, 10, 100), factor_lineal=10):
+    """
+    Mide la carga de los archivos JSON resolviendo las referencias con RegistroEntidades y recorriendo listas.
+
+    Args:
+        factores (tuple): Los multiplicadores del tamaño de los datos base a medir.
+        factor_lineal (int): El mayor multiplicador con el que se mide también la búsqueda lineal, que crece cuadráticamente.
+    """
+    print("\n==========================================")
+    print("    BENCHMARK CARGA DE ARCHIVOS JSON")
+    print("==========================================")
+    print("Factor | Partidos | Entradas | Facturas | Indices (s) | Busqueda lineal (s)")
+
+    directorio_original = os.getcwd()
+    for factor in factores:
+        with tempfile.TemporaryDirectory() as directorio:
+            os.chdir(directorio)
+            try:
+                generar_archivos_json(factor)
+
+                tiempos = []
+                for clase in [App, AppLineal]:
+                    if clase is AppLineal and factor > factor_lineal:
+                        tiempos.append(None)
+                        continue
+
+                    app = clase()
+                    inicio = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        app.cargar_json()
+                    tiempos.append(time.perf_counter() - inicio)
+                    assert all(factura.restaurant is not None for factura in app.recorrer_facturas())
+                    partidos = len(app.partidos)
+                    entradas = app.registro_entradas.ultimo_id()
+                    facturas = app.almacen_jsonl.facturas.cantidad
+                    app.eliminar()
+            finally:
+                os.chdir(directorio_original)
+
+        lineal = "-" if tiempos[1] is None else f"{tiempos[1]:.3f}"
+        print(f"{factor} | {partidos} | {entradas} | {facturas} | {tiempos[0]:.3f} | {lineal}")
+
+
+def benchmark_diario(ventas=200, factores=(1, 10)):
+    """
+    Mide cuánto cuesta dejar una venta en disco añadiéndola al archivo de entradas, comparado con guardar solo los
+    archivos JSON que cambiaron y con guardar todos.
+
+    Args:
+        ventas (int): La cantidad de ventas guardadas antes de medir los guardados.
+        factores (tuple): Los multiplicadores del tamaño de los datos sobre los que se mide el guardado completo.
+    """
+    print("\n==========================================")
+    print("    BENCHMARK DIARIO DE VENTAS")
+    print("==========================================")
+    print("Factor | Entradas | Venta en disco (ms) | Guardado de los cambios (ms) | Guardado completo (ms)")
+
+    directorio_original = os.getcwd()
+    for factor in factores:
+        with tempfile.TemporaryDirectory() as directorio:
+            os.chdir(directorio)
+            try:
+                generar_archivos_json(factor)
+                app = App()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    app.cargar_json()
+                app.abrir_diario()
+
+                partido = app.partidos[0]
+                cedula = app.clientes[0].cedula
+                venta = medir(lambda: app.comprar_entradas(cedula, partido.id, "General", cantidad=1), ventas)
+
+                # Una aplicación que arranca sin el último guardado recupera las ventas y sus asientos desde el
+                # archivo de entradas, sin nada que reproducir del diario
+                recuperada = App()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    recuperada.cargar_json()
+                assert recuperada.abrir_diario() == 0
+                assert recuperada.registro_entradas.ultimo_id() == app.registro_entradas.ultimo_id()
+                assert recuperada.partidos[0].asientos_libres() == partido.asientos_libres()
+                recuperada.eliminar()
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    incremental = medir(app.guardar_json, 1)
+                    guardado = medir(lambda: app.guardar_json(todo=True), 3)
+                entradas = app.registro_entradas.ultimo_id()
+                app.eliminar()
+                assert os.path.getsize("diario.jsonl") == 0
+            finally:
+                os.chdir(directorio_original)
+
+        print(f"{factor} | {entradas} | {venta:.3f} | {incremental:.1f} | {guardado:.1f}")
+
+
+def benchmark_sqlite(ventas=200, factores=(1, 10, 100)):
+    """
+    Mide la base de datos SQLite: la carga comparada con los archivos JSON, el costo de guardar una venta y una
+    consulta por cédula con el índice.
+
+    Args:
+        ventas (int): La cantidad de ventas guardadas en la base de datos.
+        factores (tuple): Los multiplicadores del tamaño de los datos base a medir.
+    """
+    print("\n==========================================")
+    print("    BENCHMARK BASE DE DATOS SQLITE")
+    print("==========================================")
+    print("Factor | Entradas | Carga JSON (s) | Carga SQLite (s) | Venta (ms) | Entradas de un cliente (ms)")
+
+    directorio_original = os.getcwd()
+    for factor in factores:
+        with tempfile.TemporaryDirectory() as directorio:
+            os.chdir(directorio)
+            try:
+                generar_archivos_json(factor)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    App().cargar_sqlite()
+
+                    app = App()
+                    inicio = time.perf_counter()
+                    app.cargar_json()
+                    carga_json = time.perf_counter() - inicio
+                    app.eliminar()
+
+                    app = App()
+                    inicio = time.perf_counter()
+                    app.cargar_sqlite()
+                    carga_sqlite = time.perf_counter() - inicio
+
+                partido = app.partidos[0]
+                cedula = app.clientes[0].cedula
+                venta = medir(lambda: app.comprar_entradas(cedula, partido.id, "General", cantidad=1), ventas)
+                consulta = medir(lambda: app.registro_entradas.entradas_cliente(cedula), 100)
+
+                # El arranque no carga las entradas: se consultan en la base de datos
+                assert len(app.entradas) == 0 and app.registro_entradas.cantidad_cliente(cedula) == len(app.registro_entradas.entradas_cliente(cedula))
+                entradas = app.registro_entradas.ultimo_id()
+                app.eliminar()
+            finally:
+                os.chdir(directorio_original)
+
+        print(f"{factor} | {entradas} | {carga_json:.3f} | {carga_sqlite:.3f} | {venta:.3f} | {consulta:.3f}")
+
+
+def benchmark_guardado_periodico(ventas=5000, factores=(10, 100), cambios_maximos=1000):
+    """
+    Mide el guardado en segundo plano mientras se vende: la pausa que impone a las ventas, lo que dura cada guardado
+    y cuánto escribe.
+
+    Args:
+        ventas (int): La cantidad de ventas de una entrada que se hacen mientras corre el guardado.
+        factores (tuple): Los multiplicadores del tamaño de los datos base a medir.
+        cambios_maximos (int): La cantidad de cambios que dispara cada guardado.
+    """
+    print("\n==========================================")
+    print("    BENCHMARK GUARDADO EN SEGUNDO PLANO")
+    print("==========================================")
+    print("Factor | Guardados | Duracion promedio (ms) | Pausa promedio (ms) | Tamano promedio (KB) | Venta mas lenta (ms)")
+
+    directorio_original = os.getcwd()
+    for factor in factores:
+        with tempfile.TemporaryDirectory() as directorio:
+            os.chdir(directorio)
+            try:
+                generar_archivos_json(factor)
+                app = App()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    app.cargar_json()
+                app.abrir_diario()
+                app.guardado_periodico = GuardadoPeriodico(app, 3600, cambios_maximos)
+                app.guardado_periodico.iniciar()
+
+                cedula = app.clientes[0].cedula
+                mas_lenta = 0
+                for i in range(ventas):
+                    partido = app.partidos[i % len(app.partidos)]
+                    inicio = time.perf_counter()
+                    app.comprar_entradas(cedula, partido.id, "General", cantidad=1)
+                    mas_lenta = max(mas_lenta, time.perf_counter() - inicio)
+
+                app.guardado_periodico.detener()
+                historial = app.guardado_periodico.historial
+                app.eliminar()
+            finally:
+                os.chdir(directorio_original)
+
+        duracion = sum(metrica["duracion"] for metrica in historial) / len(historial)
+        pausa = sum(metrica["pausa"] for metrica in historial) / len(historial)
+        tamano = sum(metrica["bytes"] for metrica in historial) / len(historial)
+        print(f"{factor} | {len(historial)} | {duracion * 1000:.1f} | {pausa * 1000:.2f} | {tamano / 1024:.0f} | {mas_lenta * 1000:.1f}")
+
+
+def generar_ventas(cantidad):
+    """
+    Crea una aplicación en memoria con cantidad entradas vendidas y una factura por cada diez entradas.
+
+    Los datos son 100 partidos con asientos suficientes para todas las entradas, vendidas en lotes de 100, y 10000
+    clientes.
+
+    Args:
+        cantidad (int): La cantidad de entradas vendidas.
+
+    Returns:
+        App: La aplicación con los datos.
+    """
+    app = App()
+    datos = datos_api(24, 10, 100, capacidad=(cantidad // 100 + 100, 100))
+    app.cargar_Equipos(datos["teams.json"])
+    app.cargar_Estadios(datos["stadiums.json"])
+    app.cargar_Partidos(datos["matches.json"])
+    for i in range(10000):
+        app.agregar_cliente(Cliente("Cliente", str(1000000 + i), 30))
+    app.evaluar_descuentos_clientes(app.clientes)
+    for i in range(cantidad // 100):
+        app.comprar_entradas(app.clientes[i % len(app.clientes)].cedula, app.partidos[i % len(app.partidos)].id, "General", cantidad=100)
+    for i in range(cantidad // 10):
+        partido = app.partidos[i % len(app.partidos)]
+        restaurante = partido.estadio.restaurantes[0]
+        app.facturas.append(Factura(app.clientes[i % len(app.clientes)], partido, restaurante, [[restaurante.productos[0], 2]], 20, 0, 20))
+    return app
+
+
+def benchmark_instantanea(cantidades=(100000, 1000000)):
+    """
+    Mide el arranque desde la instantánea binaria comparado con los archivos JSON, con cientos de miles de entradas.
+
+    Args:
+        cantidades (tuple): Las cantidades de entradas vendidas a medir.
+    """
+    print("\n==========================================")
+    print("    BENCHMARK INSTANTANEA BINARIA")
+    print("==========================================")
+    print("Entradas | JSON (MB) | Instantanea (MB) | Carga JSON (s) | Carga instantanea (s) | Guardado instantanea (s)")
+
+    directorio_original = os.getcwd()
+    for cantidad in cantidades:
+        with tempfile.TemporaryDirectory() as directorio:
+            os.chdir(directorio)
+            try:
+                app = generar_ventas(cantidad)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    app.guardar_json(todo=True)
+                inicio = time.perf_counter()
+                app.guardar_instantanea()
+                guardado = time.perf_counter() - inicio
+                tamano_json = sum(os.path.getsize(ruta) for ruta in app.instantanea.archivos)
+                del app
+
+                tamano_instantanea = os.path.getsize("instantanea.bin")
+
+                tiempos = []
+                for metodo in ["cargar_json", "cargar_instantanea"]:
+                    app = App()
+                    inicio = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        getattr(app, metodo)()
+                    tiempos.append(time.perf_counter() - inicio)
+                    assert app.registro_entradas.ultimo_id() == cantidad
+                    app.eliminar()
+            finally:
+                os.chdir(directorio_original)
+
+        print(f"{cantidad} | {tamano_json / 2 ** 20:.1f} | {tamano_instantanea / 2 ** 20:.1f} | {tiempos[0]:.2f} | {tiempos[1]:.2f} | {guardado:.2f}")
+
+
+def benchmark_jsonl(cantidades=(100000, 1000000), consultas=1000, ventas=200):
+    """
+    Mide los archivos JSON Lines de entradas: el arranque sin leerlas comparado con leer el mismo arreglo JSON entero,
+    las búsquedas por id y por cédula con los índices mapeados y el costo de guardar una venta.
+
+    Args:
+        cantidades (tuple): Las cantidades de entradas vendidas a medir.
+        consultas (int): La cantidad de búsquedas por id y por cédula que se promedian.
+        ventas (int): La cantidad de ventas de una entrada que se promedian.
+    """
+    print("\n==========================================")
+    print("    BENCHMARK ENTRADAS EN JSON LINES")
+    print("==========================================")
+    print("Entradas | Arreglo JSON (s) | Arranque JSON Lines (s) | Por id (ms) | Por cedula (ms) | Venta (ms) | Indices (MB)")
+
+    directorio_original = os.getcwd()
+    for cantidad in cantidades:
+        with tempfile.TemporaryDirectory() as directorio:
+            os.chdir(directorio)
+            try:
+                app = generar_ventas(cantidad)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    app.guardar_json(todo=True)
+                with open("entradas.json", "w") as archivo:
+                    json.dump([entrada.diccionario() for entrada in app.entradas], archivo)
+                del app
+
+                # Lo mínimo que había que hacer antes para arrancar: leer el arreglo entero, sin crear las entradas
+                inicio = time.perf_counter()
+                with open("entradas.json") as archivo:
+                    json.load(archivo)
+                arreglo = time.perf_counter() - inicio
+
+                app = App()
+                inicio = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    app.cargar_json()
+                arranque = time.perf_counter() - inicio
+                assert app.registro_entradas.ultimo_id() == cantidad
+
+                almacen = app.almacen_jsonl
+                ids = [random.randint(1, cantidad) for _ in range(consultas)]
+                cedulas = [app.clientes[random.randrange(len(app.clientes))].cedula for _ in range(consultas)]
+                por_id = medir(lambda: almacen.buscar_entrada(ids.pop()), consultas)
+                por_cedula = medir(lambda: almacen.entradas_cliente(cedulas.pop()), consultas)
+                assert len(almacen.entradas_cliente(app.clientes[0].cedula)) == almacen.contar_entradas_cliente(app.clientes[0].cedula) == 100
+
+                # Cada partido tiene 100 asientos libres; las ventas se reparten entre ellos
+                partidos = itertools.cycle(app.partidos)
+                cedula = app.clientes[0].cedula
+                venta = medir(lambda: app.comprar_entradas(cedula, next(partidos).id, "General", cantidad=1), ventas)
+                indices = sum(os.path.getsize(ruta) for ruta in almacen.entradas.rutas()[1:])
+                app.eliminar()
+            finally:
+                os.chdir(directorio_original)
+
+        print(f"{cantidad} | {arreglo:.2f} | {arranque:.3f} | {por_id:.3f} | {por_cedula:.3f} | {venta:.3f} | {indices / 2 ** 20:.1f}")
+
+
+def main():
+    benchmark_descuento_entrada()
+    benchmark_memoria_mapas()
+    stress_ventas()
+    verificar_reservas()
+    benchmark_compra_lote()
+    benchmark_carga_api()
+    benchmark_carga_json()
+    benchmark_diario()
+    benchmark_sqlite()
+    benchmark_guardado_periodico()
+    benchmark_instantanea()
+    benchmark_jsonl()
+
+
+if __name__ == "__main__":
+    main()
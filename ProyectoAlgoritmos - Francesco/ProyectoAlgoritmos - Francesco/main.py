@@ -4,4 +4,5 @@ def main():
     app = App()
     app.inicializar()
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file